@@ -0,0 +1,121 @@
+"""Lox scripts sharing one asyncio event loop through `interpret_async`.
+
+Throughput: each script waits on an async `fetch` native, a stub for a network
+call, between bits of CPU work. Compares running a few scripts one after another
+with running many at once. Pass the number of concurrent scripts as an
+argument, 500 by default.
+
+Latency: the worst delay of a heartbeat task on the loop while one CPU-bound
+script runs, with the blocking `interpret` and with several `yield_every`.
+"""
+
+import asyncio
+import sys
+import time
+from collections.abc import Sequence
+
+from lox.ast import Expr, Stmt
+from lox.ffi import lox_native
+from lox.interpret import Interpreter
+from lox.output import CaptureOutput
+from lox.parser import Parser
+from lox.runtime_error import LoxRuntimeErr
+from lox.scanner import Scanner, Token
+
+LATENCY = 0.01
+SEQUENTIAL = 20
+FETCHES = """
+fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+var total = 0;
+for (var i = 0; i < 10; i = i + 1) {
+  total = total + fetch(i) + fib(5);
+}
+print total;
+"""
+CPU_BOUND = """
+fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+print fib(20);
+"""
+
+
+class Reporter:
+    def error(self, line: int, message: str) -> None:
+        raise SystemExit(f"[line {line}] {message}")
+
+    def parser_error(self, token: Token, message: str) -> None:
+        raise SystemExit(f"[line {token.line}] {message}")
+
+    def runtime_error(self, err: LoxRuntimeErr) -> None:
+        raise SystemExit(f"[line {err.token.line}] {err.message}")
+
+
+@lox_native(arity=1)
+async def fetch(key: float) -> object:
+    await asyncio.sleep(LATENCY)
+    return key
+
+
+def _parse(source: str) -> Sequence[Expr | Stmt]:
+    reporter = Reporter()
+    statements = Parser(reporter, Scanner(reporter, source).scan_tokens()).parse()
+    assert statements is not None
+    return statements
+
+
+async def _script(statements: Sequence[Expr | Stmt]) -> None:
+    interpreter = Interpreter(CaptureOutput())
+    interpreter.define("fetch", fetch)
+    await interpreter.interpret_async(Reporter(), statements)
+
+
+async def _throughput(scripts: int, concurrent: bool) -> float:
+    statements = _parse(FETCHES)
+    start = time.perf_counter()
+    if concurrent:
+        await asyncio.gather(*(_script(statements) for _ in range(scripts)))
+    else:
+        for _ in range(scripts):
+            await _script(statements)
+    return time.perf_counter() - start
+
+
+async def _heartbeat(delays: list[float]) -> None:
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(0)
+        delays.append(time.perf_counter() - start)
+
+
+async def _latency(yield_every: int | None) -> float:
+    statements = _parse(CPU_BOUND)
+    delays: list[float] = []
+    heartbeat = asyncio.create_task(_heartbeat(delays))
+    await asyncio.sleep(0)
+    interpreter = Interpreter(CaptureOutput())
+    if yield_every is None:
+        interpreter.interpret(Reporter(), statements)
+        await asyncio.sleep(0)
+    else:
+        await interpreter.interpret_async(Reporter(), statements, yield_every)
+    heartbeat.cancel()
+    return max(delays)
+
+
+def main() -> None:
+    scripts = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    print(f"{scripts} scripts with 10 fetches of {LATENCY * 1000:.0f} ms")
+    for name, count, concurrent in (
+        ("sequential", SEQUENTIAL, False),
+        ("concurrent", scripts, True),
+    ):
+        elapsed = asyncio.run(_throughput(count, concurrent))
+        print(f"  {name:<12} {count / elapsed:>8.0f} scripts/s")
+    print("worst loop delay during fib(20)")
+    for yield_every in (None, 10000, 1000, 100):
+        delay = asyncio.run(_latency(yield_every))
+        name = "interpret" if yield_every is None else f"N={yield_every}"
+        print(f"  {name:<12} {delay * 1000:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
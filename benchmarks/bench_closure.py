@@ -0,0 +1,92 @@
+"""Creating many short-lived closures, see `lox.closure`.
+
+Each call of `make` declares a map it never shares and a closure over one
+number. Creates a million closures and calls each once, reporting the time per
+closure and the peak memory, which stays flat because every closure and its
+cell die right away. Then keeps 10k of them alive and reports the memory each
+one retains: its cell, not the map of the call that created it. Pass the number
+of closures as an argument.
+"""
+
+import sys
+import time
+import tracemalloc
+
+from lox.interpret import Interpreter
+from lox.output import CaptureOutput
+from lox.parser import Parser
+from lox.runtime_error import LoxRuntimeErr
+from lox.scanner import Scanner, Token
+
+SCRIPT = """
+fun make(i) {{
+  var unused = map();
+  set(unused, i, i);
+  var n = i;
+  fun get() {{ return n; }}
+  return get;
+}}
+var kept = map();
+var total = 0;
+for (var i = 0; i < {closures}; i = i + 1) {{
+  var f = make(i);
+  total = total + f();
+  if ({keep}) set(kept, i, f);
+}}
+print total;
+"""
+KEPT = 10_000
+
+
+class Reporter:
+    def error(self, line: int, message: str) -> None:
+        raise SystemExit(f"[line {line}] {message}")
+
+    def parser_error(self, token: Token, message: str) -> None:
+        raise SystemExit(f"[line {token.line}] {message}")
+
+    def runtime_error(self, err: LoxRuntimeErr) -> None:
+        raise SystemExit(f"[line {err.token.line}] {err.message}")
+
+
+def _run(closures: int, keep: bool) -> Interpreter:
+    reporter = Reporter()
+    source = SCRIPT.format(closures=closures, keep="true" if keep else "false")
+    statements = Parser(reporter, Scanner(reporter, source).scan_tokens()).parse()
+    assert statements is not None
+    output = CaptureOutput()
+    interpreter = Interpreter(output)
+    interpreter.interpret(reporter, statements)
+    assert output.text == f"{closures * (closures - 1) // 2}\n"
+    return interpreter
+
+
+def _memory(closures: int, keep: bool) -> tuple[int, int]:
+    tracemalloc.start()
+    interpreter = _run(closures, keep)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del interpreter
+    return current, peak
+
+
+def main() -> None:
+    closures = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    start = time.perf_counter()
+    _run(closures, keep=False)
+    elapsed = time.perf_counter() - start
+    print(f"{closures} short-lived closures")
+    print(f"  total          {elapsed:>8.2f} s")
+    print(f"  per closure    {elapsed / closures * 1e6:>8.2f} us")
+    # tracemalloc slows everything down, so measure memory on smaller runs.
+    _, small = _memory(KEPT, keep=False)
+    _, large = _memory(KEPT * 10, keep=False)
+    print(f"  peak memory    {small / 1024:>8.0f} KB for {KEPT}")
+    print(f"                 {large / 1024:>8.0f} KB for {KEPT * 10}")
+    retained, _ = _memory(KEPT, keep=True)
+    dropped, _ = _memory(KEPT, keep=False)
+    print(f"  kept alive     {(retained - dropped) / KEPT:>8.0f} bytes per closure")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Runs per second of a small rule script through the embedding API.
+
+Compares parsing the source on every evaluation, as `Lox._run` does, with
+running a program compiled once, with fresh and with shared globals.
+"""
+
+import time
+from collections.abc import Callable
+
+import lox
+from lox.main import Lox
+
+RULE = """
+fun discount(total, member) {
+  if (member and total > 100) return 0.1;
+  if (total > 500) return 0.05;
+  return 0;
+}
+var rate = discount(total, member);
+var approved = total < limit and rate < 0.2;
+"""
+MIN_SECONDS = 1.0
+
+
+def _runs_per_second(function: Callable[[], None]) -> float:
+    runs = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < MIN_SECONDS:
+        function()
+        runs += 1
+    return runs / elapsed
+
+
+def main() -> None:
+    source = "var total = 250; var member = true; var limit = 1000;" + RULE
+    program = lox.compile(RULE)
+    shared: dict[str, object] = {"total": 250, "member": True, "limit": 1000}
+
+    def reparse() -> None:
+        Lox()._run(source)
+
+    def fresh() -> None:
+        program.run({"total": 250, "member": True, "limit": 1000})
+
+    def shared_globals() -> None:
+        program.run(shared)
+
+    for name, function in (
+        ("Lox._run", reparse),
+        ("compiled, fresh globals", fresh),
+        ("compiled, shared globals", shared_globals),
+    ):
+        print(f"{name:<26} {_runs_per_second(function):>10.0f} runs/s")
+
+
+if __name__ == "__main__":
+    main()
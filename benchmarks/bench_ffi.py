@@ -0,0 +1,63 @@
+"""Compare the cost of calling a native function with a Lox defined one."""
+
+import time
+
+from lox.ffi import lox_native
+from lox.interpret import Interpreter
+from lox.output import CaptureOutput
+from lox.parser import Parser
+from lox.runtime_error import LoxRuntimeErr
+from lox.scanner import Scanner, Token
+
+CALLS = 100_000
+
+LOOP = """
+fun loxAdd(a, b) {{ return a + b; }}
+var total = 0;
+for (var i = 0; i < {calls}; i = i + 1) {{
+  total = {callee}(total, i);
+}}
+print total;
+"""
+
+
+class Reporter:
+    def error(self, line: int, message: str) -> None:
+        raise SystemExit(f"[line {line}] {message}")
+
+    def parser_error(self, token: Token, message: str) -> None:
+        raise SystemExit(f"[line {token.line}] {message}")
+
+    def runtime_error(self, err: LoxRuntimeErr) -> None:
+        raise SystemExit(f"[line {err.token.line}] {err.message}")
+
+
+@lox_native(arity=2, types=(float, float))
+def typed_add(a: float, b: float) -> float:
+    return a + b
+
+
+@lox_native(arity=2)
+def untyped_add(a: object, b: object) -> object:
+    assert isinstance(a, float)
+    assert isinstance(b, float)
+    return a + b
+
+
+def main() -> None:
+    for callee in ("loxAdd", "typed_add", "untyped_add"):
+        reporter = Reporter()
+        source = LOOP.format(calls=CALLS, callee=callee)
+        statements = Parser(reporter, Scanner(reporter, source).scan_tokens()).parse()
+        assert statements is not None
+        interpreter = Interpreter(CaptureOutput())
+        interpreter.define("typed_add", typed_add)
+        interpreter.define("untyped_add", untyped_add)
+        start = time.perf_counter()
+        interpreter.interpret(reporter, statements)
+        elapsed = time.perf_counter() - start
+        print(f"{callee}: {elapsed / CALLS * 1e6:.2f}us per iteration")
+
+
+if __name__ == "__main__":
+    main()
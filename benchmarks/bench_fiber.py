@@ -0,0 +1,110 @@
+"""Spawning, switching and joining Lox fibers, see `lox.fiber`.
+
+Spawns 100k fibers that each yield 10 times and joins them all. Reports the
+total time, the cost of a switch, measured against the same program calling a
+native that does nothing instead of `yield`, and the cost of handing control
+between two Python threads for comparison. Then reports the peak memory per
+live fiber with tracemalloc, on a tenth of the fibers. Pass the number of
+fibers as an argument.
+"""
+
+import sys
+import threading
+import time
+import tracemalloc
+
+from lox.ffi import lox_native
+from lox.interpret import Interpreter
+from lox.output import CaptureOutput
+from lox.parser import Parser
+from lox.runtime_error import LoxRuntimeErr
+from lox.scanner import Scanner, Token
+
+YIELDS = 10
+SCRIPT = """
+fun work() {{
+  for (var i = 0; i < {yields}; i = i + 1) {switch}();
+  return 1;
+}}
+var tasks = map();
+for (var i = 0; i < {fibers}; i = i + 1) set(tasks, i, spawn(work));
+var total = 0;
+for (var i = 0; i < {fibers}; i = i + 1) total = total + join(get(tasks, i));
+print total;
+"""
+HANDOFFS = 20_000
+
+
+class Reporter:
+    def error(self, line: int, message: str) -> None:
+        raise SystemExit(f"[line {line}] {message}")
+
+    def parser_error(self, token: Token, message: str) -> None:
+        raise SystemExit(f"[line {token.line}] {message}")
+
+    def runtime_error(self, err: LoxRuntimeErr) -> None:
+        raise SystemExit(f"[line {err.token.line}] {err.message}")
+
+
+@lox_native(arity=0)
+def nothing() -> object:
+    return None
+
+
+def _run(fibers: int, switch: str) -> float:
+    reporter = Reporter()
+    source = SCRIPT.format(fibers=fibers, yields=YIELDS, switch=switch)
+    statements = Parser(reporter, Scanner(reporter, source).scan_tokens()).parse()
+    assert statements is not None
+    output = CaptureOutput()
+    interpreter = Interpreter(output)
+    interpreter.define("nothing", nothing)
+    start = time.perf_counter()
+    interpreter.interpret_fibers(reporter, statements)
+    elapsed = time.perf_counter() - start
+    assert output.text == f"{fibers}\n"
+    return elapsed
+
+
+def _peak_per_fiber(fibers: int) -> float:
+    tracemalloc.start()
+    _run(fibers, "yield")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / fibers
+
+
+def _thread_handoff() -> float:
+    # Two threads that take turns, like two fibers that yield to each other.
+    turns = [threading.Semaphore(0), threading.Semaphore(0)]
+
+    def player(me: int) -> None:
+        for _ in range(HANDOFFS // 2):
+            turns[me].acquire()
+            turns[1 - me].release()
+
+    threads = [threading.Thread(target=player, args=(me,)) for me in (0, 1)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    turns[0].release()
+    for thread in threads:
+        thread.join()
+    return (time.perf_counter() - start) / HANDOFFS
+
+
+def main() -> None:
+    fibers = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    switches = fibers * YIELDS
+    with_yield = _run(fibers, "yield")
+    without = _run(fibers, "nothing")
+    print(f"{fibers} fibers, {YIELDS} yields each")
+    print(f"  total          {with_yield:>8.2f} s")
+    print(f"  per switch     {(with_yield - without) / switches * 1e6:>8.2f} us")
+    print(f"  thread handoff {_thread_handoff() * 1e6:>8.2f} us")
+    peak = _peak_per_fiber(fibers // 10)
+    print(f"  peak memory    {peak:>8.0f} bytes per fiber")
+
+
+if __name__ == "__main__":
+    main()
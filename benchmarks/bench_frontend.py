@@ -0,0 +1,79 @@
+"""Measure scanner and parser throughput and memory on generated programs.
+
+Throughput that drops as the input grows points at super-linear behavior. Pass
+the largest size in bytes as an argument, 10 MB by default.
+"""
+
+import functools
+import gc
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable, Sequence
+
+from lox.main import Lox
+from lox.parser import Parser
+from lox.scanner import Scanner, Token
+from lox.timings import count_nodes
+from tool.generate_lox import generate
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000]
+MIN_SECONDS = 0.5
+
+
+def _scan(reporter: Lox, source: str) -> None:
+    Scanner(reporter, source).scan_tokens()
+
+
+def _parse(reporter: Lox, tokens: Sequence[Token]) -> None:
+    Parser(reporter, tokens).parse()
+
+
+def _best(function: Callable[[], None], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    max_size = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    reporter = Lox()
+    print(
+        f"{'size':>11} {'tokens':>10} {'nodes':>10} {'scan MB/s':>10} "
+        f"{'parse Mnodes/s':>15} {'B/token':>8} {'B/node':>8}"
+    )
+    for size in (size for size in SIZES if size <= max_size):
+        source = generate(size)
+        tokens = Scanner(reporter, source).scan_tokens()
+        statements = Parser(reporter, tokens).parse()
+        assert statements is not None
+        nodes: Counter[str] = Counter()
+        count_nodes(statements, nodes)
+        del statements
+        repeat = max(1, int(MIN_SECONDS * 1e6 / len(source)))
+        scan = _best(functools.partial(_scan, reporter, source), repeat)
+        parse = _best(functools.partial(_parse, reporter, tokens), repeat)
+
+        gc.collect()
+        tracemalloc.start()
+        tokens = Scanner(reporter, source).scan_tokens()
+        token_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        statements = Parser(reporter, tokens).parse()
+        node_bytes = tracemalloc.get_traced_memory()[0] - token_bytes
+        tracemalloc.stop()
+        del statements
+
+        print(
+            f"{len(source):>11} {len(tokens):>10} {nodes.total():>10} "
+            f"{len(source) / scan / 1e6:>10.2f} {nodes.total() / parse / 1e6:>15.3f} "
+            f"{token_bytes / len(tokens):>8.0f} {node_bytes / nodes.total():>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
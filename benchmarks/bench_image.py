@@ -0,0 +1,107 @@
+"""Compare running a large prelude with restoring it from an image.
+
+Times the prelude both in process, running it against loading its image, and end
+to end, as `lox` processes that run a tiny script after either. Exits with 1 when
+loading the image is not faster than running the prelude. Pass the number of
+prelude functions as an argument, 2000 by default.
+"""
+
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from lox.image import load_image, save_image
+from lox.main import Lox
+
+REPEAT = 7
+SOURCE = Path(__file__).parent.parent / "src"
+
+FUNCTION = """\
+fun helper{i}(a, b) {{
+  var total = 0;
+  for (var k = 0; k < a; k = k + 1) {{
+    if (k * {i} > b) {{
+      total = total + k - b;
+    }} else {{
+      total = total - 1;
+    }}
+  }}
+  return total;
+}}
+var constant{i} = "helper" + "{i}";
+"""
+
+
+def _prelude(functions: int) -> str:
+    return "".join(FUNCTION.format(i=i) for i in range(functions))
+
+
+def _median(function: Callable[[], None]) -> float:
+    times: list[float] = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def _process(*arguments: str) -> Callable[[], None]:
+    environment = dict(os.environ, PYTHONPATH=str(SOURCE))
+
+    def run() -> None:
+        subprocess.run(
+            [sys.executable, "-m", "lox.main", *arguments],
+            check=True,
+            env=environment,
+            stdout=subprocess.DEVNULL,
+        )
+
+    return run
+
+
+def main() -> None:
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    prelude = _prelude(functions)
+    lox = Lox()
+    lox._run(prelude)
+    image = io.BytesIO()
+    save_image(lox._interpreter, image)
+
+    def run_prelude() -> None:
+        Lox()._run(prelude)
+
+    def restore() -> None:
+        load_image(Lox()._interpreter, io.BytesIO(image.getvalue()))
+
+    running = _median(run_prelude)
+    loading = _median(restore)
+    print(f"prelude: {functions} functions, {len(prelude)} bytes")
+    print(f"image: {len(image.getvalue())} bytes")
+    print(f"run prelude: {running * 1000:8.1f} ms")
+    print(f"load image:  {loading * 1000:8.1f} ms ({running / loading:.1f}x faster)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        image_path = Path(directory, "prelude.img")
+        image_path.write_bytes(image.getvalue())
+        script = Path(directory, "script.lox")
+        script.write_text(f"print helper{functions - 1}(3, 1);\n", "utf-8")
+        both = Path(directory, "both.lox")
+        both.write_text(prelude + script.read_text("utf-8"), "utf-8")
+        print(f"lox prelude + script:     {_median(_process(str(both))):.3f} s")
+        print(
+            "lox --image IMAGE script: "
+            f"{_median(_process('--image', str(image_path), str(script))):.3f} s"
+        )
+
+    if loading >= running:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
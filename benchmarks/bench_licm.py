@@ -0,0 +1,21 @@
+"""Compare nested numeric loops with and without loop invariant code motion."""
+
+import time
+from pathlib import Path
+
+from lox.main import Lox
+from lox.optimize import MAX_OPT_LEVEL
+
+SOURCE = (Path(__file__).parent / "nested_loops.lox").read_text("utf-8")
+
+
+def main() -> None:
+    for opt_level in range(MAX_OPT_LEVEL + 1):
+        start = time.perf_counter()
+        Lox(opt_level=opt_level)._run(SOURCE)
+        elapsed = time.perf_counter() - start
+        print(f"--opt-level={opt_level}: {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
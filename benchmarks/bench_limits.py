@@ -0,0 +1,31 @@
+"""Measure the overhead of execution limits on nested numeric loops."""
+
+import time
+from pathlib import Path
+
+from lox.limits import Limits
+from lox.main import Lox
+
+SOURCE = (Path(__file__).parent / "nested_loops.lox").read_text("utf-8")
+REPEAT = 5
+
+CONFIGURATIONS = {
+    "no limits": None,
+    "fuel": Limits(fuel=1 << 40),
+    "timeout": Limits(timeout=3600),
+    "all limits": Limits(fuel=1 << 40, timeout=3600, max_allocations=1 << 40),
+}
+
+
+def main() -> None:
+    for name, limits in CONFIGURATIONS.items():
+        best = float("inf")
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            Lox(limits=limits)._run(SOURCE)
+            best = min(best, time.perf_counter() - start)
+        print(f"{name}: {best:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Word count with a native map against the if-chain a map-less script needs."""
+
+import random
+import time
+
+from lox.main import Lox
+
+WORDS = [f"word{i}" for i in range(100)]
+STREAM_LENGTH = 20_000
+
+MAP_COUNT = """
+var counts = map();
+fun count(word) {
+  var n = get(counts, word);
+  if (n == nil) n = 0;
+  set(counts, word, n + 1);
+}
+"""
+
+
+def _if_chain_count() -> str:
+    lines = [f"var count{i} = 0;" for i in range(len(WORDS))]
+    lines.append("fun count(word) {")
+    for i, word in enumerate(WORDS):
+        lines.append(f'  if (word == "{word}") {{ count{i} = count{i} + 1; return; }}')
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    rng = random.Random(31)
+    stream = "\n".join(f'count("{rng.choice(WORDS)}");' for _ in range(STREAM_LENGTH))
+    for name, prelude in (("map", MAP_COUNT), ("if chain", _if_chain_count())):
+        start = time.perf_counter()
+        Lox()._run(prelude + stream)
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
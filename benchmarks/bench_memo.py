@@ -0,0 +1,20 @@
+"""Compare recursive Fibonacci with and without memoization of pure functions."""
+
+import time
+from pathlib import Path
+
+from lox.main import Lox
+
+SOURCE = (Path(__file__).parent / "fib.lox").read_text("utf-8")
+
+
+def main() -> None:
+    for memoize in (0, 128):
+        start = time.perf_counter()
+        Lox(memoize=memoize)._run(SOURCE)
+        elapsed = time.perf_counter() - start
+        print(f"--memoize={memoize}: {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Bytes per live runtime object, measured with tracemalloc.
+
+Scans and parses the benchmark programs, then keeps many copies of their runtime
+objects alive at once and divides the memory they hold by their number: tokens,
+the functions they declare, with and without a captured variable, the
+environments of calls to them and of blocks. tests/lox/test_memory.py checks
+the same numbers against upper bounds.
+"""
+
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from lox.ast import Function
+from lox.environment import Cell, Environment
+from lox.interpret import LoxFunction
+from lox.parser import Parser
+from lox.runtime_error import LoxRuntimeErr
+from lox.scanner import Scanner, Token
+
+COPIES = 10_000
+
+
+class Reporter:
+    def error(self, line: int, message: str) -> None:
+        raise SystemExit(f"[line {line}] {message}")
+
+    def parser_error(self, token: Token, message: str) -> None:
+        raise SystemExit(f"[line {token.line}] {message}")
+
+    def runtime_error(self, err: LoxRuntimeErr) -> None:
+        raise SystemExit(f"[line {err.token.line}] {err.message}")
+
+
+def bytes_per(make: Callable[[], object], count: int = COPIES) -> float:
+    """The memory held by each of `count` objects returned by `make`."""
+    kept: list[object] = [None] * count
+    tracemalloc.start()
+    try:
+        for index in range(count):
+            kept[index] = make()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current / count
+
+
+def _tokens(source: str) -> list[Token]:
+    return Scanner(Reporter(), source).scan_tokens()
+
+
+def main() -> None:
+    paths = sorted(Path(__file__).parent.glob("*.lox"))
+    sources = [path.read_text("utf-8") for path in paths]
+    tokens = sum(len(_tokens(source)) for source in sources)
+    per_source = bytes_per(lambda: [_tokens(source) for source in sources], 100)
+    declarations = [
+        statement
+        for source in sources
+        for statement in Parser(Reporter(), _tokens(source)).parse() or []
+        if isinstance(statement, Function)
+    ]
+    function = declarations[0]
+    globals_ = Environment()
+    cells = {"captured": Cell(0.0)}
+
+    def call_scope() -> Environment:
+        environment = Environment(globals_)
+        for param in function.params:
+            environment.define(param.lexeme, 0.0)
+        return environment
+
+    print(f"{len(paths)} programs, {tokens} tokens, {len(declarations)} functions")
+    print(f"  token           {per_source / tokens:>6.0f} bytes")
+    print(f"  function        {bytes_per(lambda: LoxFunction(function)):>6.0f} bytes")
+    closure = bytes_per(lambda: LoxFunction(function, dict(cells)))
+    print(f"  closure         {closure:>6.0f} bytes")
+    print(f"  call scope      {bytes_per(call_scope):>6.0f} bytes")
+    print(f"  block scope     {bytes_per(lambda: Environment(globals_)):>6.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
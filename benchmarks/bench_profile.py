@@ -0,0 +1,25 @@
+"""Measure the overhead of both profilers on recursive Fibonacci."""
+
+import contextlib
+import sys
+import time
+from pathlib import Path
+
+from lox.main import Lox
+from lox.profile import PROFILERS
+
+SOURCE = (Path(__file__).parent / "fib.lox").read_text("utf-8")
+
+
+def main() -> None:
+    for name in (None, *PROFILERS):
+        profiler = contextlib.nullcontext() if name is None else PROFILERS[name]()
+        start = time.perf_counter()
+        with profiler:
+            Lox()._run(SOURCE)
+        elapsed = time.perf_counter() - start
+        print(f"{name or 'no profiler'}: {elapsed:.3f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Time repeated string concatenation in Lox for growing output sizes.
+
+With ropes the time per megabyte should stay roughly constant.
+"""
+
+import time
+
+from lox.main import Lox
+
+LINE = "0123456789" * 10
+
+SOURCE = """
+var line = "{line}";
+var report = "";
+var i = 0;
+while (i < {lines}) {{
+  report = report + line;
+  i = i + 1;
+}}
+"""
+
+
+def main() -> None:
+    for megabytes in (1, 2, 5, 10):
+        lines = megabytes * 1_000_000 // len(LINE)
+        source = SOURCE.format(line=LINE, lines=lines)
+        start = time.perf_counter()
+        Lox()._run(source)
+        elapsed = time.perf_counter() - start
+        print(f"{megabytes:>3} MB: {elapsed:.3f}s ({elapsed / megabytes:.3f}s/MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Scaling of `lox run-many` over the number of worker processes.
+
+Writes a batch of small scripts to a temporary directory and runs it with 1, 2,
+4, ... up to one worker per core, reporting scripts per second and the speedup
+over one worker. For comparison, also times one `lox` process per script, on a
+sample. Pass the number of scripts as an argument, 2000 by default.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from lox.batch import run_many
+
+SOURCE = Path(__file__).parent.parent / "src"
+SAMPLE = 50
+SCRIPT = """
+fun fib(n) {{ if (n < 2) return n; return fib(n - 1) + fib(n - 2); }}
+var total = 0;
+for (var i = 0; i < {n}; i = i + 1) total = total + fib(12);
+print total;
+"""
+
+
+def _per_process(paths: list[str]) -> float:
+    environment = dict(os.environ, PYTHONPATH=str(SOURCE))
+    start = time.perf_counter()
+    for path in paths:
+        subprocess.run(
+            [sys.executable, "-m", "lox.main", path],
+            env=environment,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+    return len(paths) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    scripts = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    cores = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        paths: list[str] = []
+        for index in range(scripts):
+            path = Path(directory, f"{index}.lox")
+            path.write_text(SCRIPT.format(n=index % 4 + 1))
+            paths.append(str(path))
+        print(f"{scripts} scripts, {cores} cores")
+        print(
+            f"  {'process per script':<20} {_per_process(paths[:SAMPLE]):>8.0f} scripts/s"
+        )
+        jobs, baseline = 1, 0.0
+        while True:
+            start = time.perf_counter()
+            results = list(run_many(paths, jobs))
+            rate = scripts / (time.perf_counter() - start)
+            assert all(result.status == 0 for result in results)
+            baseline = baseline or rate
+            name = f"run-many --jobs {jobs}"
+            print(f"  {name:<20} {rate:>8.0f} scripts/s  {rate / baseline:>5.2f}x")
+            if jobs >= cores:
+                break
+            jobs = min(jobs * 2, cores)
+
+
+if __name__ == "__main__":
+    main()
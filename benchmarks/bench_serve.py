@@ -0,0 +1,87 @@
+"""Load test `lox serve` with concurrent clients.
+
+Starts a server on a temporary socket, sends requests for a small script from
+several threads and reports the throughput and the latency percentiles. For
+comparison, also times a fresh `lox` process per script and a `lox.client`
+process per script. Pass the number of concurrent clients as an argument, 16
+by default.
+"""
+
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from lox.client import request
+
+REQUESTS = 2000
+SOURCE = Path(__file__).parent.parent / "src"
+SCRIPT = """
+fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+print fib(10);
+"""
+
+
+def _timed_request(socket: Path, script: Path) -> float:
+    start = time.perf_counter()
+    code = request(socket, script, io.StringIO(), io.StringIO())
+    assert code == 0
+    return time.perf_counter() - start
+
+
+def _process(*arguments: str) -> float:
+    environment = dict(os.environ, PYTHONPATH=str(SOURCE))
+    times: list[float] = []
+    for _ in range(10):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", *arguments],
+            check=True,
+            env=environment,
+            stdout=subprocess.DEVNULL,
+        )
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main() -> None:
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    with tempfile.TemporaryDirectory() as directory:
+        socket = Path(directory, "lox.sock")
+        script = Path(directory, "fib.lox")
+        script.write_text(SCRIPT, "utf-8")
+        server = subprocess.Popen(
+            [sys.executable, "-m", "lox.main", "serve", "--socket", str(socket)],
+            env=dict(os.environ, PYTHONPATH=str(SOURCE)),
+        )
+        try:
+            while not socket.exists():
+                time.sleep(0.01)
+            start = time.perf_counter()
+            with ThreadPoolExecutor(clients) as pool:
+                latencies = sorted(
+                    pool.map(lambda _: _timed_request(socket, script), range(REQUESTS))
+                )
+            elapsed = time.perf_counter() - start
+            client = _process("lox.client", "--socket", str(socket), str(script))
+        finally:
+            server.terminate()
+            server.wait()
+        fresh = _process("lox.main", str(script))
+
+    print(f"{REQUESTS} requests from {clients} clients in {elapsed:.2f}s")
+    print(f"throughput {REQUESTS / elapsed:>8.0f} requests/s")
+    for percentile in (50, 90, 99):
+        latency = latencies[len(latencies) * percentile // 100]
+        print(f"p{percentile:<9} {latency * 1000:>8.2f} ms")
+    print(f"lox.client process {client * 1000:>8.1f} ms")
+    print(f"lox process        {fresh * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Check the import time of `lox.main` against a budget, with `-X importtime`.
+
+Exits with 1 when the median cumulative import time is over budget, and lists
+the slowest modules so the culprit is easy to find.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BUDGET_MS = 100
+REPEAT = 11
+SOURCE = Path(__file__).parent.parent / "src"
+
+
+def _import_times() -> dict[str, int]:
+    environment = dict(os.environ, PYTHONPATH=str(SOURCE))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import lox.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=environment,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> None:
+    runs = [_import_times() for _ in range(REPEAT)]
+    median = statistics.median(run["lox.main"] for run in runs) / 1000
+    slowest = sorted(runs[-1].items(), key=lambda item: item[1], reverse=True)
+    for name, micros in slowest[1:11]:
+        print(f"{name:<40} {micros / 1000:>7.1f} ms")
+    print(f"import lox.main: {median:.1f} ms, budget {BUDGET_MS} ms")
+    if median > BUDGET_MS:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
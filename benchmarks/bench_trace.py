@@ -0,0 +1,37 @@
+"""Check that tracing hooks cost nothing unless a tracer is attached."""
+
+import time
+from pathlib import Path
+
+from lox.interpret import Interpreter
+from lox.main import Lox
+from lox.output import CaptureOutput
+from lox.trace import Tracer
+
+REPEAT = 5
+
+
+def _run(source: str, setup: str) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        lox = Lox(CaptureOutput())
+        interpreter: Interpreter = lox._interpreter
+        if setup != "no tracer":
+            interpreter.attach(Tracer())
+        if setup == "detached":
+            interpreter.detach()
+        start = time.perf_counter()
+        lox._run(source)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    for name in ("fib", "nested_loops"):
+        source = (Path(__file__).parent / f"{name}.lox").read_text("utf-8")
+        for setup in ("no tracer", "detached", "no-op tracer"):
+            print(f"{name}, {setup}: {_run(source, setup):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import importlib
+from typing import TYPE_CHECKING
+
+# The embedding API is imported on first use, so that `lox.client` starts
+# without importing the interpreter.
+if TYPE_CHECKING:
+    from lox.program import (
+        CompileError,
+        Diagnostic,
+        LoxError,
+        Program,
+        RunError,
+        compile,
+    )
+    from lox.vector import VectorExpression, compile_expression
+
+_MODULES = {
+    "CompileError": "lox.program",
+    "Diagnostic": "lox.program",
+    "LoxError": "lox.program",
+    "Program": "lox.program",
+    "RunError": "lox.program",
+    "compile": "lox.program",
+    "VectorExpression": "lox.vector",
+    "compile_expression": "lox.vector",
+}
+
+__all__ = [
+    "CompileError",
+    "Diagnostic",
+    "LoxError",
+    "Program",
+    "RunError",
+    "VectorExpression",
+    "compile",
+    "compile_expression",
+]
+
+
+def __getattr__(name: str) -> object:
+    if name not in _MODULES:
+        raise AttributeError(f"module 'lox' has no attribute '{name}'")
+    return getattr(importlib.import_module(_MODULES[name]), name)  # type: ignore[misc]
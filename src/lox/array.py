@@ -0,0 +1,23 @@
+from array import array
+from typing import override
+
+from lox.render import render
+
+# Arrays longer than this are abbreviated when printed.
+_MAX_RENDERED = 8
+
+
+class LoxArray:
+    """A fixed size array of numbers, stored unboxed in an `array('d')`."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: "array[float]") -> None:
+        self.values = values
+
+    @override
+    def __str__(self) -> str:
+        shown = ", ".join(render(value) for value in self.values[:_MAX_RENDERED])
+        if len(self.values) <= _MAX_RENDERED:
+            return f"[{shown}]"
+        return f"[{shown}, ... ({len(self.values)} elements)]"
@@ -148,6 +148,7 @@ class If(Stmt):
 
 @dataclass(frozen=True)
 class While(Stmt):
+    keyword: Token
     condition: Expr
     body: Stmt
 
@@ -174,6 +175,16 @@ class Print(Stmt):
         return visitor.visit_print_stmt(self)
 
 
+@dataclass(frozen=True)
+class Return(Stmt):
+    keyword: Token
+    value: Expr | None
+
+    @override
+    def accept[T](self, visitor: "VisitorStmt[T]") -> T:
+        return visitor.visit_return_stmt(self)
+
+
 @dataclass(frozen=True)
 class Var(Stmt):
     name: Token
@@ -198,4 +209,6 @@ class VisitorStmt[T](ABC):
     @abstractmethod
     def visit_print_stmt(self, expr: Print) -> T: ...
     @abstractmethod
+    def visit_return_stmt(self, expr: Return) -> T: ...
+    @abstractmethod
     def visit_var_stmt(self, expr: Var) -> T: ...
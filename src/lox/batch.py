@@ -0,0 +1,207 @@
+"""Runs many independent scripts on a pool of processes, for `lox run-many`.
+
+Each script runs in a fresh `Interpreter`, like `lox script.lox` would, but the
+worker processes start once and import the interpreter once for the whole batch.
+Results are written as JSON lines, in the order of the scripts:
+
+    {"path": "a.lox", "status": 70, "stdout": "1\\n", "stderr": "...", "seconds": 0.01}
+
+The status is 0, 65 for compile errors, 66 for unreadable files and 70 for
+runtime errors, including exceeded limits, errors of the interpreter itself and
+crashed workers. A failing script never stops the scripts after it.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from functools import partial
+from pathlib import Path
+from typing import TextIO
+
+from lox.limits import Limits
+from lox.optimize import MAX_OPT_LEVEL
+from lox.output import CaptureOutput
+from lox.program import CompileError, RunError, compile
+
+# Scripts are handed to the workers in chunks of at most this many.
+_MAX_CHUNK = 64
+
+
+@dataclass(frozen=True)
+class Result:
+    path: str
+    status: int
+    stdout: str
+    stderr: str
+    seconds: float
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))  # type: ignore[misc]
+
+
+def run_script(path: str, limits: Limits, opt_level: int = 0) -> Result:
+    """Runs one script and captures its output, see `lox.main.Lox.run_file`."""
+    start = time.perf_counter()
+    output = CaptureOutput()
+    status, stderr = 0, ""
+    try:
+        program = compile(Path(path).read_text("utf-8"), opt_level)
+        program.run(output=output, limits=limits)
+    except (OSError, UnicodeDecodeError) as err:
+        status, stderr = 66, f"Error: {path}: {err}\n"
+    except CompileError as err:
+        status, stderr = 65, f"{err}\n"
+    except RunError as err:
+        status, stderr = 70, f"{err}\n"
+    except Exception as err:
+        # Like RecursionError, would crash `lox` itself, but only fails this
+        # script of the batch.
+        status, stderr = 70, f"Error: {type(err).__name__}: {err}\n"
+    return Result(path, status, output.text, stderr, time.perf_counter() - start)
+
+
+def run_many(
+    paths: Sequence[str],
+    jobs: int | None = None,
+    limits: Limits | None = None,
+    opt_level: int = 0,
+) -> Iterator[Result]:
+    """Runs `paths` on `jobs` processes, one per core by default, in order.
+
+    When a worker dies, the scripts that didn't finish run again on a new pool,
+    the first one alone to find out whether it crashed the worker.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    run = partial(run_script, limits=limits or Limits(), opt_level=opt_level)
+    pending = list(paths)
+    while pending:
+        done = 0
+        try:
+            chunk = max(1, min(_MAX_CHUNK, len(pending) // (jobs * 4)))
+            with ProcessPoolExecutor(jobs) as executor:
+                for result in executor.map(run, pending, chunksize=chunk):
+                    yield result
+                    done += 1
+        except BrokenProcessPool:
+            yield _run_alone(run, pending[done])
+            done += 1
+        pending = pending[done:]
+
+
+def _run_alone(run: partial[Result], path: str) -> Result:
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(1) as executor:
+            return executor.submit(run, path).result()
+    except BrokenProcessPool:
+        stderr = "Error: The worker process running the script crashed.\n"
+        return Result(path, 70, "", stderr, time.perf_counter() - start)
+
+
+def expand(patterns: Sequence[str]) -> list[str]:
+    """Expands glob patterns, `**` included. Other paths are kept as they are."""
+    paths: list[str] = []
+    for pattern in patterns:
+        paths.extend(sorted(glob.glob(pattern, recursive=True)) or [pattern])
+    return paths
+
+
+@dataclass(frozen=True)
+class Args:
+    paths: Sequence[str]
+    files_from: Path | None = None
+    output: Path | None = None
+    jobs: int | None = None
+    timeout: float | None = None
+    fuel: int | None = None
+    opt_level: int = 0
+
+
+def parse_arguments(args: Sequence[str]) -> Args:
+    parser = argparse.ArgumentParser(
+        prog="lox run-many", description="run many scripts on a process pool"
+    )
+    parser.add_argument(
+        "paths", nargs="*", help="scripts to run, or glob patterns like 'jobs/**/*.lox'"
+    )
+    parser.add_argument(
+        "--files-from",
+        type=Path,
+        metavar="PATH",
+        help="also run the scripts listed in PATH, one per line, or - for stdin",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        metavar="PATH",
+        help="write the results to PATH instead of stdout",
+    )
+    parser.add_argument(
+        "--jobs", type=int, help="worker processes, one per core by default"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help="stop each script after this much wall-clock time",
+    )
+    parser.add_argument(
+        "--fuel",
+        type=int,
+        help="stop each script after this many loop iterations and calls",
+    )
+    parser.add_argument(
+        "--opt-level",
+        type=int,
+        choices=range(MAX_OPT_LEVEL + 1),
+        default=0,
+        help="optimization passes to run before interpreting",
+    )
+    return Args(**vars(parser.parse_args(args)))  # type: ignore[misc]
+
+
+def _read_list(path: Path) -> list[str]:
+    stdin = str(path) == "-"
+    text: str = sys.stdin.read() if stdin else path.read_text("utf-8")  # type: ignore[misc]
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def _write(results: Iterator[Result], output: TextIO) -> int:
+    failed = 0
+    for result in results:
+        output.write(result.to_json() + "\n")
+        failed += result.status != 0
+    return failed
+
+
+def main(argv: Sequence[str]) -> None:
+    """Exits with 1 when any script failed."""
+    args = parse_arguments(argv)
+    paths = expand(args.paths)
+    if args.files_from is not None:
+        try:
+            paths.extend(_read_list(args.files_from))
+        except OSError as err:
+            print(f"Error: {args.files_from}: {err}", file=sys.stderr)
+            sys.exit(66)
+    limits = Limits(fuel=args.fuel, timeout=args.timeout)
+    start = time.perf_counter()
+    results = run_many(paths, args.jobs, limits, args.opt_level)
+    if args.output is None:
+        failed = _write(results, sys.stdout)
+    else:
+        with args.output.open("w", encoding="utf-8") as file:
+            failed = _write(results, file)
+    elapsed = time.perf_counter() - start
+    print(
+        f"lox run-many: {len(paths)} scripts, {failed} failed, {elapsed:.2f}s",
+        file=sys.stderr,
+    )
+    sys.exit(1 if failed else 0)
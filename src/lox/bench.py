@@ -0,0 +1,246 @@
+"""Runs the Lox benchmark workloads in fresh processes and compares results.
+
+`lox-bench run` times every `*.lox` file in a directory and writes the results as
+JSON. `lox-bench compare` reports the change between two such files and fails
+when a benchmark got significantly slower.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+import lox
+
+
+@dataclass(frozen=True)
+class Measurement:
+    seconds: float
+    max_rss_kib: int
+
+
+@dataclass(frozen=True)
+class Result:
+    times: Sequence[float]
+    max_rss_kib: int
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    @property
+    def stdev(self) -> float:
+        return statistics.stdev(self.times) if len(self.times) > 1 else 0.0
+
+
+def measure(python: str, path: Path) -> Measurement:
+    """Runs one script with `python -m lox.main` and waits for it with `wait4`."""
+    environment = dict(os.environ)
+    # Run the same lox package as this runner, installed or not.
+    source = str(Path(lox.__file__).parent.parent)
+    environment["PYTHONPATH"] = os.pathsep.join(
+        filter(None, (source, environment.get("PYTHONPATH")))
+    )
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [python, "-m", "lox.main", str(path)],
+        stdout=subprocess.DEVNULL,
+        env=environment,
+    )
+    _, status, usage = os.wait4(process.pid, 0)
+    seconds = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"{path} exited with {process.returncode}")
+    # ru_maxrss is in KiB on Linux, but in bytes on macOS.
+    scale = 1024 if sys.platform == "darwin" else 1
+    return Measurement(seconds, usage.ru_maxrss // scale)
+
+
+def run(python: str, paths: Sequence[Path], repeat: int) -> dict[str, Result]:
+    results: dict[str, Result] = {}
+    for path in paths:
+        measurements = [measure(python, path) for _ in range(repeat)]
+        results[path.stem] = Result(
+            [measurement.seconds for measurement in measurements],
+            max(measurement.max_rss_kib for measurement in measurements),
+        )
+        result = results[path.stem]
+        print(
+            f"{path.stem:<20} median {result.median:.3f}s "
+            f"stdev {result.stdev:.3f}s max rss {result.max_rss_kib} KiB",
+            file=sys.stderr,
+        )
+    return results
+
+
+def dump(results: Mapping[str, Result], python: str) -> str:
+    benchmarks: dict[str, object] = {
+        name: {
+            "times": list(result.times),
+            "median": result.median,
+            "stdev": result.stdev,
+            "max_rss_kib": result.max_rss_kib,
+        }
+        for name, result in results.items()
+    }
+    data: dict[str, object] = {
+        "python": python,
+        "python_version": platform.python_version(),
+        "benchmarks": benchmarks,
+    }
+    return json.dumps(data, indent=2)
+
+
+def load(text: str) -> dict[str, Result]:
+    data: dict[str, dict[str, dict[str, object]]] = json.loads(text)
+    results: dict[str, Result] = {}
+    for name, benchmark in data["benchmarks"].items():
+        times = benchmark["times"]
+        max_rss_kib = benchmark["max_rss_kib"]
+        assert isinstance(times, list) and isinstance(max_rss_kib, int)
+        results[name] = Result([float(time_) for time_ in times], max_rss_kib)
+    return results
+
+
+def _incomplete_beta(a: float, b: float, x: float) -> float:
+    """The regularized incomplete beta function, by Lentz's continued fraction."""
+    if x <= 0.0 or x >= 1.0:
+        return 0.0 if x <= 0.0 else 1.0
+    if x > (a + 1) / (a + b + 2):
+        return 1.0 - _incomplete_beta(b, a, 1.0 - x)
+    front = math.exp(
+        math.lgamma(a + b)
+        - math.lgamma(a)
+        - math.lgamma(b)
+        + a * math.log(x)
+        + b * math.log(1.0 - x)
+    )
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    fraction = d
+    for m in range(1, 200):
+        for numerator in (
+            m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+            -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1)),
+        ):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            fraction *= c * d
+        if abs(c * d - 1.0) < 1e-12:
+            break
+    return front * fraction / a
+
+
+def welch_p_value(first: Sequence[float], second: Sequence[float]) -> float:
+    """The two-sided p-value of Welch's t-test for equal means."""
+    if len(first) < 2 or len(second) < 2:
+        return 1.0
+    variance_first = statistics.variance(first) / len(first)
+    variance_second = statistics.variance(second) / len(second)
+    variance = variance_first + variance_second
+    difference = statistics.fmean(first) - statistics.fmean(second)
+    if variance == 0.0:
+        return 1.0 if difference == 0.0 else 0.0
+    t = difference / math.sqrt(variance)
+    freedom = variance**2 / (
+        variance_first**2 / (len(first) - 1) + variance_second**2 / (len(second) - 1)
+    )
+    return _incomplete_beta(freedom / 2, 0.5, freedom / (freedom + t * t))
+
+
+def compare(
+    base: Mapping[str, Result],
+    new: Mapping[str, Result],
+    alpha: float,
+    threshold: float,
+) -> list[str]:
+    """Prints the change per benchmark and returns those that regressed.
+
+    A benchmark regressed when its median grew by more than `threshold`, as a
+    fraction, and Welch's t-test rejects equal means at level `alpha`.
+    """
+    regressions: list[str] = []
+    for name in sorted(base.keys() & new.keys()):
+        before, after = base[name], new[name]
+        change = after.median / before.median - 1.0
+        p_value = welch_p_value(before.times, after.times)
+        significant = p_value < alpha
+        if significant and change > threshold:
+            verdict = "slower"
+            regressions.append(name)
+        elif significant and change < -threshold:
+            verdict = "faster"
+        else:
+            verdict = "no significant change"
+        print(
+            f"{name:<20} {before.median:.3f}s -> {after.median:.3f}s "
+            f"{change:+7.1%} p={p_value:.3f} {verdict}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lox benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="time benchmarks")
+    run_parser.add_argument(
+        "names", nargs="*", help="benchmarks to run, all by default"
+    )
+    run_parser.add_argument(
+        "--directory", type=Path, default=Path("benchmarks"), help="*.lox workloads"
+    )
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument(
+        "--python", default=sys.executable, help="interpreter to run lox with"
+    )
+    run_parser.add_argument("--output", type=Path, help="write the results as JSON")
+    compare_parser = commands.add_parser("compare", help="compare two results")
+    compare_parser.add_argument("base", type=Path)
+    compare_parser.add_argument("new", type=Path)
+    compare_parser.add_argument("--alpha", type=float, default=0.05)
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.02, help="ignore smaller changes"
+    )
+    args = parser.parse_args()
+
+    if args.command == "run":  # type: ignore[misc]
+        directory: Path = args.directory
+        names: list[str] = args.names
+        paths = sorted(
+            path for path in directory.glob("*.lox") if not names or path.stem in names
+        )
+        python: str = args.python
+        repeat: int = args.repeat
+        results = run(python, paths, repeat)
+        output: Path | None = args.output
+        if output is not None:
+            output.write_text(dump(results, python), "utf-8")
+    else:
+        base: Path = args.base
+        new: Path = args.new
+        alpha: float = args.alpha
+        threshold: float = args.threshold
+        regressions = compare(
+            load(base.read_text("utf-8")),
+            load(new.read_text("utf-8")),
+            alpha,
+            threshold,
+        )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
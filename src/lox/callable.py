@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from lox.interpret import Interpreter
+
+
+class LoxCallable(ABC):
+    __slots__ = ()
+
+    @property
+    @abstractmethod
+    def arity(self) -> int: ...
+
+    @abstractmethod
+    def call(
+        self, interpreter: "Interpreter", arguments: Sequence[object]
+    ) -> object: ...
@@ -0,0 +1,90 @@
+"""Runs a script on a `lox serve` daemon, see `lox.server`.
+
+Only imports the standard library, so `python -m lox.client script.lox` starts
+faster than `lox client script.lox`, which imports the interpreter first.
+
+The client sends one JSON line with the absolute path of the script. The server
+answers with frames of a one byte kind, a four byte big-endian length and the
+payload: text for `stdout` and `stderr`, and finally the exit code.
+"""
+
+import argparse
+import json
+import os
+import socket
+import struct
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import NamedTuple, TextIO
+
+STDOUT = b"o"
+STDERR = b"e"
+EXIT = b"x"
+HEADER = struct.Struct(">cI")
+
+
+def default_socket() -> Path:
+    directory = os.environ.get("XDG_RUNTIME_DIR")
+    if directory:
+        return Path(directory, "lox.sock")
+    return Path(f"/tmp/lox-{os.getuid()}.sock")
+
+
+def _receive(connection: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("The server closed the connection.")
+        data += chunk
+    return bytes(data)
+
+
+def request(socket_path: Path, script: Path, stdout: TextIO, stderr: TextIO) -> int:
+    """Runs `script` on the server, copies its output and returns the exit code."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(str(socket_path))
+        message: dict[str, str] = {"path": str(script.absolute())}
+        connection.sendall(json.dumps(message).encode() + b"\n")
+        while True:
+            kind: bytes
+            size: int
+            kind, size = HEADER.unpack(_receive(connection, HEADER.size))  # type: ignore[misc]
+            payload = _receive(connection, size)
+            if kind == EXIT:
+                return int(payload)
+            stream = stdout if kind == STDOUT else stderr
+            stream.write(payload.decode())
+            stream.flush()
+
+
+# A named tuple rather than a dataclass, which would double the import time.
+class Args(NamedTuple):
+    path: Path
+    socket: Path
+
+
+def parse_arguments(args: Sequence[str]) -> Args:
+    parser = argparse.ArgumentParser(
+        prog="lox client", description="run a script on a lox serve daemon"
+    )
+    parser.add_argument("path", type=Path, help="script to run")
+    parser.add_argument(
+        "--socket", type=Path, default=default_socket(), help="server socket"
+    )
+    return Args(**vars(parser.parse_args(args)))  # type: ignore[misc]
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_arguments(sys.argv[1:] if argv is None else argv)
+    try:
+        code = request(args.socket, args.path, sys.stdout, sys.stderr)
+    except OSError as err:
+        print(f"Error: {args.socket}: {err}", file=sys.stderr)
+        sys.exit(69)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
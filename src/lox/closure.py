@@ -0,0 +1,137 @@
+"""Which variables a function closes over, see `Interpreter.visit_function_stmt`.
+
+A closure only keeps the cells of the variables it reads or assigns but does not
+declare itself, instead of the whole chain of enclosing environments.
+"""
+
+from typing import final, override
+
+from lox.ast import (
+    Assign,
+    Binary,
+    Block,
+    Call,
+    Expression,
+    Function,
+    Grouping,
+    If,
+    Literal,
+    Logical,
+    Print,
+    Return,
+    Unary,
+    Var,
+    Variable,
+    VisitorExpr,
+    VisitorStmt,
+    While,
+)
+
+
+@final
+class _FreeVariables(VisitorExpr[None], VisitorStmt[None]):
+    """Resolves names like the interpreter would, with the scopes seen so far."""
+
+    def __init__(self, declaration: Function) -> None:
+        self._scopes = [{param.lexeme for param in declaration.params}]
+        self.free: set[str] = set()
+
+    def _use(self, name: str) -> None:
+        if not any(name in scope for scope in self._scopes):
+            self.free.add(name)
+
+    @override
+    def visit_binary_expr(self, expr: Binary) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    @override
+    def visit_call_expr(self, expr: Call) -> None:
+        expr.callee.accept(self)
+        for argument in expr.arguments:
+            argument.accept(self)
+
+    @override
+    def visit_assign_expr(self, expr: Assign) -> None:
+        expr.value.accept(self)
+        self._use(expr.name.lexeme)
+
+    @override
+    def visit_grouping_expr(self, expr: Grouping) -> None:
+        expr.expression.accept(self)
+
+    @override
+    def visit_literal_expr(self, expr: Literal) -> None:
+        pass
+
+    @override
+    def visit_logical_expr(self, expr: Logical) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    @override
+    def visit_unary_expr(self, expr: Unary) -> None:
+        expr.right.accept(self)
+
+    @override
+    def visit_variable_expr(self, expr: Variable) -> None:
+        self._use(expr.name.lexeme)
+
+    @override
+    def visit_expression_stmt(self, expr: Expression) -> None:
+        expr.expression.accept(self)
+
+    @override
+    def visit_function_stmt(self, expr: Function) -> None:
+        # Declared first, so that the function can call itself.
+        self._scopes[-1].add(expr.name.lexeme)
+        for name in free_variables(expr):
+            self._use(name)
+
+    @override
+    def visit_if_stmt(self, expr: If) -> None:
+        expr.condition.accept(self)
+        expr.then_branch.accept(self)
+        if expr.else_branch is not None:
+            expr.else_branch.accept(self)
+
+    @override
+    def visit_while_stmt(self, expr: While) -> None:
+        expr.condition.accept(self)
+        expr.body.accept(self)
+
+    @override
+    def visit_block_stmt(self, expr: Block) -> None:
+        self._scopes.append(set())
+        try:
+            for statement in expr.statements:
+                statement.accept(self)
+        finally:
+            self._scopes.pop()
+
+    @override
+    def visit_print_stmt(self, expr: Print) -> None:
+        expr.expression.accept(self)
+
+    @override
+    def visit_return_stmt(self, expr: Return) -> None:
+        if expr.value is not None:
+            expr.value.accept(self)
+
+    @override
+    def visit_var_stmt(self, expr: Var) -> None:
+        expr.initializer.accept(self)
+        self._scopes[-1].add(expr.name.lexeme)
+
+
+def free_variables(declaration: Function) -> frozenset[str]:
+    """The names `declaration` uses before or without declaring them.
+
+    Includes its own name when it calls itself, and the free variables of the
+    functions it declares. Globals are included too: only the interpreter knows
+    which names are local where the function is declared.
+    """
+    visitor = _FreeVariables(declaration)
+    for statement in declaration.body:
+        statement.accept(visitor)
+    return frozenset(visitor.free)
@@ -0,0 +1,59 @@
+from collections import Counter
+from typing import override
+
+from lox.ast import Assign, Call, Expr, Stmt, Variable
+from lox.callable import LoxCallable
+from lox.environment import Environment
+from lox.interpret import Interpreter, LoxFunction
+from lox.runtime_error import LoxRuntimeErr
+from lox.trace import Tracer
+
+
+class OperationCounter(Tracer):
+    """Counts the work `interpreter` does, which unlike time is deterministic.
+
+    `visits` counts evaluated nodes by type, `environments` the environments
+    created for blocks and calls, `hops` the enclosing environments variable
+    lookups and assignments walk through, and `native_calls` the calls of
+    natives by name.
+    """
+
+    def __init__(self, interpreter: Interpreter) -> None:
+        self._interpreter = interpreter
+        self.visits: Counter[str] = Counter()
+        self.environments = 0
+        self.hops = 0
+        self.native_calls: Counter[str] = Counter()
+
+    @override
+    def statement(self, stmt: Stmt) -> None:
+        self.visits[type(stmt).__name__] += 1
+
+    @override
+    def expression(self, expr: Expr) -> None:
+        self.visits[type(expr).__name__] += 1
+        if isinstance(expr, Variable | Assign):
+            self.hops += self._interpreter.environment.distance(expr.name.lexeme)
+
+    @override
+    def call(self, expr: Call) -> None:
+        if not isinstance(expr.callee, Variable):
+            return
+        try:
+            callee = self._interpreter.environment.get(expr.callee.name)
+        except LoxRuntimeErr:
+            return
+        if isinstance(callee, LoxCallable) and not isinstance(callee, LoxFunction):
+            self.native_calls[expr.callee.name.lexeme] += 1
+
+    @override
+    def environment(self, environment: Environment) -> None:
+        self.environments += 1
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "visits": dict(sorted(self.visits.items())),
+            "environments": self.environments,
+            "hops": self.hops,
+            "native_calls": dict(sorted(self.native_calls.items())),
+        }
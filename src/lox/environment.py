@@ -1,28 +1,139 @@
-from typing import Self
+from collections.abc import Callable, Mapping
+from typing import Self, override
 
 from lox.runtime_error import LoxRuntimeErr
 from lox.scanner import Token
 
 
+class Cell:
+    """A variable shared between its environment and closures, see `capture`."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: object) -> None:
+        self.value = value
+
+
+# The variables of every environment that didn't define any yet. Never written
+# to: `define` replaces it with a dict of its own first.
+_EMPTY: dict[str, object] = {}
+
+
 class Environment:
-    def __init__(self, enclosing: Self | None = None) -> None:
+    __slots__ = ("_enclosing", "_environment", "_cells")
+
+    def __init__(
+        self, enclosing: Self | None = None, cells: dict[str, Cell] | None = None
+    ) -> None:
         self._enclosing = enclosing
-        self._environment: dict[str, object] = {}
+        self._environment = _EMPTY
+        # Captured variables, which live in cells instead. Only looked at when a
+        # name is missing from `_environment`, so plain lookups cost nothing more.
+        self._cells = cells
+
+    @property
+    def variables(self) -> Mapping[str, object]:
+        """The variables defined in this environment, not in the enclosing ones."""
+        return self._environment
+
+    @property
+    def cells(self) -> Mapping[str, Cell]:
+        """The variables of this environment that closures captured."""
+        return {} if self._cells is None else self._cells
+
+    @property
+    def enclosing(self) -> Self | None:
+        return self._enclosing
 
     def define(self, name: str, value: object) -> None:
+        if self._cells is not None and name in self._cells:
+            self._cells[name].value = value
+            return
+        if self._environment is _EMPTY:
+            self._environment = {name: value}
+            return
         self._environment[name] = value
 
     def get(self, name: Token) -> object:
         if name.lexeme in self._environment:
             return self._environment[name.lexeme]
+        if self._cells is not None and name.lexeme in self._cells:
+            return self._cells[name.lexeme].value
         if self._enclosing is None:
+            if self._load(name.lexeme):
+                return self._environment[name.lexeme]
             raise LoxRuntimeErr(name, f"Undefined variable '{name.lexeme}'.")
         return self._enclosing.get(name)
 
+    def distance(self, name: str) -> int:
+        """The number of enclosing environments `get` visits to look up `name`."""
+        hops = 0
+        environment = self
+        while (
+            name not in environment._environment
+            and (environment._cells is None or name not in environment._cells)
+            and environment._enclosing
+        ):
+            environment = environment._enclosing
+            hops += 1
+        return hops
+
     def assign(self, name: Token, value: object) -> None:
         if name.lexeme in self._environment:
             self._environment[name.lexeme] = value
             return
+        if self._cells is not None and name.lexeme in self._cells:
+            self._cells[name.lexeme].value = value
+            return
         if self._enclosing is None:
+            if self._load(name.lexeme):
+                self._environment[name.lexeme] = value
+                return
             raise LoxRuntimeErr(name, f"Undefined variable '{name.lexeme}'.")
         self._enclosing.assign(name, value)
+
+    def capture(self, name: str) -> Cell | None:
+        """The cell of the local variable `name`, for a closure.
+
+        A variable moves into a cell the first time a closure captures it, and
+        stays there for later closures. Returns None for globals, which closures
+        look up like any other function.
+        """
+        if self._enclosing is None:
+            return None
+        if name in self._environment:
+            if self._cells is None:
+                self._cells = {}
+            cell = self._cells[name] = Cell(self._environment.pop(name))
+            return cell
+        if self._cells is not None and name in self._cells:
+            return self._cells[name]
+        return self._enclosing.capture(name)
+
+    def _load(self, name: str) -> bool:
+        """Called when `name` is not defined anywhere, returns whether it now is."""
+        return False
+
+
+class Globals(Environment):
+    """The outermost environment, which can define some names on first use.
+
+    `load` returns these names. It runs when a name is not found, so defining
+    them costs nothing for programs that don't need them. It never replaces a
+    definition.
+    """
+
+    __slots__ = ("_pending",)
+
+    def __init__(self, load: Callable[[], Mapping[str, object]]) -> None:
+        super().__init__()
+        self._environment = {}
+        self._pending: Callable[[], Mapping[str, object]] | None = load
+
+    @override
+    def _load(self, name: str) -> bool:
+        if self._pending is not None:
+            load, self._pending = self._pending, None
+            for key, value in load().items():
+                self._environment.setdefault(key, value)
+        return name in self._environment
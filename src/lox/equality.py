@@ -0,0 +1,32 @@
+from collections.abc import Hashable
+
+from lox.rope import Rope
+
+
+def lox_key(value: object) -> Hashable:
+    """Maps a Lox value to a Python value with the same equality and a hash.
+
+    nil, booleans, numbers and strings compare by value, everything else by
+    identity. Booleans are tagged, since `True == 1.0` holds in Python.
+    """
+    if isinstance(value, Rope):
+        return value.flatten()
+    if isinstance(value, bool):
+        return (bool, value)
+    return value
+
+
+def from_key(key: Hashable) -> object:
+    if isinstance(key, tuple):
+        return key[1]
+    return key
+
+
+def is_equal(left: object, right: object) -> bool:
+    if isinstance(left, bool) or isinstance(right, bool):
+        return left is right
+    if isinstance(left, Rope):
+        left = left.flatten()
+    if isinstance(right, Rope):
+        right = right.flatten()
+    return left == right
@@ -0,0 +1,141 @@
+import types
+from collections.abc import Callable, Mapping, Sequence
+from typing import TYPE_CHECKING, override
+
+from lox.array import LoxArray
+from lox.callable import LoxCallable
+from lox.map import LoxMap
+from lox.rope import Rope
+from lox.runtime_error import LoxNativeErr
+
+if TYPE_CHECKING:
+    from lox.interpret import Interpreter
+
+ENTRY_POINT_GROUP = "lox.natives"
+
+type NativeBody = Callable[..., object]  # type: ignore[explicit-any]
+
+_TYPE_NAMES: Mapping[type, str] = {
+    float: "number",
+    str: "string",
+    bool: "boolean",
+    LoxArray: "array",
+    LoxMap: "map",
+}
+
+
+class NativeFunction(LoxCallable):
+    """A Python function callable from Lox, see `lox_native`.
+
+    The interpreter passes arguments positionally, without building a list, and
+    checks them against `types` before the call, so `function` receives exactly
+    the declared types. Strings are always passed as `str`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        function: NativeBody,
+        arity: int,
+        types: Sequence[type] | None,
+    ) -> None:
+        if types is not None and len(types) != arity:
+            raise ValueError(f"{name}: expected {arity} types, got {len(types)}")
+        self.name = name
+        self.function = function
+        self.types = None if types is None else tuple(types)
+        self._arity = arity
+
+    @property
+    @override
+    def arity(self) -> int:
+        return self._arity
+
+    def check(self, index: int, argument: object) -> object:
+        # Ropes stay an implementation detail, with or without `types`.
+        if isinstance(argument, Rope):
+            argument = argument.flatten()
+        if self.types is None:
+            return argument
+        expected = self.types[index]
+        # bool is a subclass of int, not float, so isinstance is exact here.
+        if not isinstance(argument, expected):
+            name = _TYPE_NAMES.get(expected, expected.__name__)
+            raise LoxNativeErr(f"Argument {index + 1} of {self.name} must be a {name}.")
+        return argument
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        return self.function(
+            *(self.check(index, argument) for index, argument in enumerate(arguments))
+        )
+
+    @override
+    def __str__(self) -> str:
+        return "<native fun>"
+
+
+def lox_native(
+    arity: int, name: str | None = None, types: Sequence[type] | None = None
+) -> Callable[[NativeBody], NativeFunction]:
+    """Turns a Python function into a native Lox function.
+
+    `types` lists the Python type of each argument, e.g. `(float, str)`. Without
+    it, arguments are passed unchecked.
+    """
+
+    def decorator(function: NativeBody) -> NativeFunction:
+        return NativeFunction(
+            function.__name__ if name is None else name, function, arity, types
+        )
+
+    return decorator
+
+
+class NativeRegistry:
+    def __init__(self) -> None:
+        self._natives: dict[str, NativeFunction] = {}
+
+    @property
+    def natives(self) -> Mapping[str, NativeFunction]:
+        return self._natives
+
+    def register(self, native: NativeFunction) -> None:
+        self._natives[native.name] = native
+
+    def register_module(self, module: types.ModuleType) -> None:
+        for value in vars(module).values():  # type: ignore[misc]
+            if isinstance(value, NativeFunction):  # type: ignore[misc]
+                self.register(value)
+
+    def load_entry_points(self, group: str = ENTRY_POINT_GROUP) -> None:
+        """Registers natives from installed plugins.
+
+        Each entry point in `group` names either a `NativeFunction` or a module,
+        in which case all its `NativeFunction`s are registered.
+        """
+        # Importing importlib.metadata takes longer than starting the interpreter.
+        from importlib.metadata import entry_points
+
+        for entry_point in entry_points(group=group):
+            loaded: object = entry_point.load()
+            if isinstance(loaded, types.ModuleType):
+                self.register_module(loaded)
+            elif isinstance(loaded, NativeFunction):
+                self.register(loaded)
+            else:
+                raise TypeError(
+                    f"entry point {entry_point.name} is not a native function"
+                )
+
+
+_plugins: NativeRegistry | None = None
+
+
+def plugins() -> NativeRegistry:
+    """Natives from installed plugins, discovered once per process."""
+    global _plugins
+    if _plugins is None:
+        _plugins = NativeRegistry()
+        _plugins.load_entry_points()
+    return _plugins
@@ -0,0 +1,198 @@
+"""Lightweight cooperative tasks for Lox, see `Interpreter.interpret_fibers`.
+
+    fun worker() { print "working"; yield(); return 42; }
+    var task = spawn(worker);
+    print join(task);
+
+`spawn(function)` starts a fiber that calls a function without parameters,
+`yield()` lets the other fibers run, and `join(fiber)` waits for a fiber and
+returns its result. Fibers are generators of `Cooperative`, so switching between
+them resumes a generator instead of an OS thread. The scheduler runs ready
+fibers round-robin, and only switches on `yield` and `join`.
+"""
+
+import sys
+from collections import deque
+from collections.abc import Coroutine, Generator, Sequence
+from typing import TYPE_CHECKING, final, override
+
+from lox.callable import LoxCallable
+from lox.environment import Environment
+from lox.interpret import Cooperative, Steps
+from lox.runtime_error import LoxNativeErr
+
+if TYPE_CHECKING:
+    from lox.ast import Expr, Stmt
+    from lox.interpret import Interpreter
+
+
+@final
+class Fiber:
+    def __init__(self, number: int, steps: Steps[object], environment: Environment):
+        self.number = number
+        self.steps = steps
+        self.environment = environment
+        self.done = False
+        self.result: object = None
+        # What `steps` is sent when the fiber resumes, or thrown into it.
+        self.resume: object = None
+        self.waiters: list[Fiber] = []
+
+    @override
+    def __str__(self) -> str:
+        return f"<fiber {self.number}>"
+
+
+class _Request:
+    """What the fiber natives return to suspend the calling fiber."""
+
+    def __await__(self) -> Generator["_Request", object, object]:
+        # Only the scheduler understands requests, see `Scheduler._handle`.
+        return (yield self)
+
+
+class _Yield(_Request):
+    pass
+
+
+_YIELD = _Yield()
+
+
+@final
+class _Join(_Request):
+    def __init__(self, fiber: Fiber) -> None:
+        self.fiber = fiber
+
+
+class _Native(LoxCallable):
+    @override
+    def __str__(self) -> str:
+        return "<native fun>"
+
+
+class Spawn(_Native):
+    def __init__(self, scheduler: "Scheduler") -> None:
+        self._scheduler = scheduler
+
+    @property
+    @override
+    def arity(self) -> int:
+        return 1
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        function = arguments[0]
+        if not isinstance(function, LoxCallable) or function.arity != 0:
+            raise LoxNativeErr("Operand must be a function without parameters.")
+        return self._scheduler.spawn(function)
+
+
+class Yield(_Native):
+    @property
+    @override
+    def arity(self) -> int:
+        return 0
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        return _YIELD
+
+
+class Join(_Native):
+    @property
+    @override
+    def arity(self) -> int:
+        return 1
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        fiber = arguments[0]
+        if not isinstance(fiber, Fiber):
+            raise LoxNativeErr("Operand must be a fiber.")
+        return _Join(fiber)
+
+
+@final
+class Scheduler:
+    """Runs a program and the fibers it spawns, round-robin."""
+
+    def __init__(self, interpreter: "Interpreter") -> None:
+        self._interpreter = interpreter
+        # Fibers only switch on requests, never after a number of statements.
+        self._cooperative = Cooperative(interpreter, sys.maxsize)
+        self._ready: deque[Fiber] = deque()
+        self._live: dict[int, Fiber] = {}
+        self._spawned = 0
+        interpreter.define("spawn", Spawn(self))
+        interpreter.define("yield", Yield())
+        interpreter.define("join", Join())
+
+    def spawn(self, function: LoxCallable) -> Fiber:
+        return self._start(self._cooperative.call(function, ()))
+
+    def _start(self, steps: Steps[object]) -> Fiber:
+        self._spawned += 1
+        fiber = Fiber(self._spawned, steps, self._interpreter.globals)
+        self._live[fiber.number] = fiber
+        self._ready.append(fiber)
+        return fiber
+
+    def run(self, stmts: "Sequence[Expr | Stmt]") -> None:
+        """Runs `stmts` as the first fiber, until every fiber finished."""
+        self._start(self._cooperative.run(stmts))
+        cooperative, ready = self._cooperative, self._ready
+        previous = cooperative.environment
+        try:
+            while self._live:
+                if not ready:
+                    self._deadlock()
+                fiber = ready.popleft()
+                cooperative.environment = fiber.environment
+                try:
+                    if isinstance(fiber.resume, LoxNativeErr):
+                        request = fiber.steps.throw(fiber.resume)
+                    else:
+                        request = fiber.steps.send(fiber.resume)
+                except StopIteration as stop:
+                    result: object = stop.value
+                    self._finish(fiber, result)
+                    continue
+                fiber.environment = cooperative.environment
+                fiber.resume = None
+                self._handle(fiber, request)
+        finally:
+            cooperative.environment = previous
+            for fiber in self._live.values():
+                fiber.steps.close()
+
+    def _handle(self, fiber: Fiber, request: object) -> None:
+        match request:
+            case _Join(fiber=target) if not target.done:
+                target.waiters.append(fiber)
+            case _Join(fiber=target):
+                fiber.resume = target.result
+                self._ready.appendleft(fiber)
+            case _Yield():
+                self._ready.append(fiber)
+            case _:
+                if isinstance(request, Coroutine):
+                    request.close()
+                fiber.resume = LoxNativeErr("Fibers cannot wait for Python awaitables.")
+                self._ready.appendleft(fiber)
+
+    def _finish(self, fiber: Fiber, result: object) -> None:
+        fiber.done, fiber.result = True, result
+        del self._live[fiber.number]
+        for waiter in fiber.waiters:
+            waiter.resume = result
+        self._ready.extend(fiber.waiters)
+        fiber.waiters.clear()
+
+    def _deadlock(self) -> None:
+        # Every live fiber waits for another one, so fail the oldest at its join.
+        fiber = next(iter(self._live.values()))
+        for live in self._live.values():
+            if fiber in live.waiters:
+                live.waiters.remove(fiber)
+        fiber.resume = LoxNativeErr("Deadlock: every fiber is waiting in join().")
+        self._ready.append(fiber)
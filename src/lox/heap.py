@@ -0,0 +1,257 @@
+"""The Lox values reachable from an interpreter, for `lox --heap-report`.
+
+Walks the current environment, the environments enclosing it up to the globals,
+and every value their variables reach: maps, arrays, closures and the variables
+they captured. Each value is counted once, with its size from `sys.getsizeof`,
+by kind and by a source line:
+
+* functions by the line that declares them,
+* values reached through a closure by the line of the closure,
+* other values by the line that declares the variable they were first reached
+  from. Names declared more than once use their first declaration.
+
+Sizes are approximate: ropes share buffers, and natives or Python objects that
+the natives return are not looked into.
+"""
+
+import json
+import sys
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import TextIO, override
+
+from lox.array import LoxArray
+from lox.ast import Block, Expr, Function, If, Stmt, Var, While
+from lox.callable import LoxCallable
+from lox.environment import Cell, Environment
+from lox.interpret import Interpreter, LoxFunction
+from lox.map import LoxMap
+from lox.rope import Rope
+from lox.trace import Tracer
+
+# None for values no declaration in the program accounts for, like natives.
+type Line = int | None
+
+
+@dataclass
+class Usage:
+    count: int = 0
+    bytes: int = 0
+
+
+class Heap:
+    """How many values of each kind there are, and their size, by line."""
+
+    def __init__(self) -> None:
+        self.usage: dict[tuple[Line, str], Usage] = {}
+
+    def add(self, line: Line, kind: str, size: int) -> None:
+        usage = self.usage.setdefault((line, kind), Usage())
+        usage.count += 1
+        usage.bytes += size
+
+    def by_kind(self) -> dict[str, Usage]:
+        totals: dict[str, Usage] = {}
+        for (_, kind), usage in self.usage.items():
+            total = totals.setdefault(kind, Usage())
+            total.count += usage.count
+            total.bytes += usage.bytes
+        return totals
+
+    @property
+    def count(self) -> int:
+        return sum(usage.count for usage in self.usage.values())
+
+    @property
+    def bytes(self) -> int:
+        return sum(usage.bytes for usage in self.usage.values())
+
+    def diff(self, previous: "Heap") -> dict[tuple[Line, str], Usage]:
+        """What changed since `previous`, largest changes in bytes first."""
+        changes: dict[tuple[Line, str], Usage] = {}
+        for key in self.usage.keys() | previous.usage.keys():
+            now = self.usage.get(key, Usage())
+            before = previous.usage.get(key, Usage())
+            change = Usage(now.count - before.count, now.bytes - before.bytes)
+            if change.count or change.bytes:
+                changes[key] = change
+        return dict(sorted(changes.items(), key=_largest_first))
+
+    def report(self, file: TextIO, limit: int = 20) -> None:
+        print(f"heap: {self.count} values, {self.bytes / 1024:.1f} KiB", file=file)
+        print(f"{'line':<8} {'kind':<12} {'values':>10} {'KiB':>10}", file=file)
+        ranked = sorted(self.usage.items(), key=_largest_first)
+        for (line, kind), usage in ranked[:limit]:
+            print(
+                f"{_render_line(line):<8} {kind:<12} {usage.count:>10} "
+                f"{usage.bytes / 1024:>10.1f}",
+                file=file,
+            )
+
+
+def _largest_first(item: tuple[tuple[Line, str], Usage]) -> int:
+    return -abs(item[1].bytes)
+
+
+def _render_line(line: Line) -> str:
+    return "-" if line is None else str(line)
+
+
+def declaration_lines(stmts: Sequence[Expr | Stmt]) -> dict[str, int]:
+    """The line of the first declaration of each name in `stmts`."""
+    lines: dict[str, int] = {}
+    pending = list(reversed(stmts))
+    while pending:
+        match pending.pop():
+            case Var(name=name):
+                lines.setdefault(name.lexeme, name.line)
+            case Function(name=name, params=params, body=body):
+                lines.setdefault(name.lexeme, name.line)
+                for param in params:
+                    lines.setdefault(param.lexeme, name.line)
+                pending.extend(reversed(body))
+            case Block(statements=statements):
+                pending.extend(reversed(statements))
+            case If(then_branch=then_branch, else_branch=else_branch):
+                if else_branch is not None:
+                    pending.append(else_branch)
+                pending.append(then_branch)
+            case While(body=body):
+                pending.append(body)
+    return lines
+
+
+def walk(interpreter: Interpreter, lines: Mapping[str, int] | None = None) -> Heap:
+    """Counts what `interpreter`'s environments reach, see the module docstring.
+
+    `lines` are the declaration lines of variables, from `declaration_lines`.
+    Without them only functions and what they reach are grouped by line.
+    """
+    lines = lines or {}
+    heap = Heap()
+    seen: set[int] = set()
+    pending: list[tuple[object, Line]] = []
+    environment: Environment | None = interpreter.environment
+    while environment is not None:
+        variables, cells = environment.variables, environment.cells
+        size = sys.getsizeof(environment)
+        if variables:
+            size += sys.getsizeof(variables)
+        if cells:
+            size += sys.getsizeof(cells) + _cells_size(cells, seen)
+        line: Line = None
+        if environment.enclosing is not None:
+            names = [*variables, *cells]
+            line = min((lines[name] for name in names if name in lines), default=None)
+        heap.add(line, "environment", size)
+        for name, value in variables.items():
+            pending.append((value, lines.get(name)))
+        for name, cell in cells.items():
+            pending.append((cell.value, lines.get(name)))
+        environment = environment.enclosing
+    while pending:
+        value, line = pending.pop()
+        if value is None or isinstance(value, bool) or id(value) in seen:
+            continue
+        seen.add(id(value))
+        heap.add(*_measure(value, line, seen, pending))
+    return heap
+
+
+def _cells_size(cells: Mapping[str, Cell], seen: set[int]) -> int:
+    # Closures share cells with the environment they were declared in.
+    size = 0
+    for cell in cells.values():
+        if id(cell) not in seen:
+            seen.add(id(cell))
+            size += sys.getsizeof(cell)
+    return size
+
+
+def _measure(
+    value: object, line: Line, seen: set[int], pending: list[tuple[object, Line]]
+) -> tuple[Line, str, int]:
+    """The line, kind and size of `value`, after queueing the values it holds."""
+    match value:
+        case float():
+            return line, "number", sys.getsizeof(value)
+        case str():
+            return line, "string", sys.getsizeof(value)
+        case Rope():
+            # Only counts its own characters, since ropes share their parts.
+            return line, "string", sys.getsizeof(value) + len(value)
+        case LoxMap(entries=entries):
+            for key, item in entries.items():
+                # Booleans are tagged in keys, see `lox_key`.
+                if not isinstance(key, tuple):
+                    pending.append((key, line))
+                pending.append((item, line))
+            return line, "map", sys.getsizeof(value) + sys.getsizeof(entries)
+        case LoxArray(values=values):
+            return line, "array", sys.getsizeof(value) + sys.getsizeof(values)
+        case LoxFunction(declaration=declaration, cells=cells):
+            line = declaration.name.line
+            size = sys.getsizeof(value)
+            if cells is not None:
+                size += sys.getsizeof(cells) + _cells_size(cells, seen)
+                pending.extend((cell.value, line) for cell in cells.values())
+            return line, "function", size
+        case LoxCallable():
+            return line, "native", sys.getsizeof(value)
+        case _:
+            return line, "other", sys.getsizeof(value)
+
+
+class Snapshots(Tracer):
+    """Writes how the heap changed to `file` every `interval` seconds.
+
+    Each snapshot is a JSON line with the seconds since the start, the number of
+    values and bytes, and the changes since the previous snapshot by line and
+    kind. Snapshots are taken between statements, when `Interpreter.attach`
+    attached this tracer.
+    """
+
+    # Reading the clock before every statement would slow the run down more.
+    _CHECK_EVERY = 1024
+
+    def __init__(
+        self, interpreter: Interpreter, file: TextIO, interval: float = 1.0
+    ) -> None:
+        self._interpreter = interpreter
+        self._file = file
+        self._interval = interval
+        self._lines: dict[str, int] = {}
+        self._previous = Heap()
+        self._start = time.monotonic()
+        self._next = self._start + interval
+        self._statements = 0
+
+    def declare(self, stmts: Sequence[Expr | Stmt]) -> None:
+        """Groups the variables declared in `stmts` by their lines."""
+        for name, line in declaration_lines(stmts).items():
+            self._lines.setdefault(name, line)
+
+    @override
+    def statement(self, stmt: Stmt) -> None:
+        self._statements += 1
+        if self._statements % self._CHECK_EVERY == 0 and time.monotonic() >= self._next:
+            self.snapshot()
+
+    def snapshot(self) -> None:
+        now = time.monotonic()
+        self._next = now + self._interval
+        heap = walk(self._interpreter, self._lines)
+        changes: list[object] = [
+            {"line": line, "kind": kind, "values": change.count, "bytes": change.bytes}
+            for (line, kind), change in heap.diff(self._previous).items()
+        ]
+        data: dict[str, object] = {
+            "seconds": round(now - self._start, 3),
+            "values": heap.count,
+            "bytes": heap.bytes,
+            "changes": changes,
+        }
+        self._file.write(json.dumps(data) + "\n")
+        self._file.flush()
+        self._previous = heap
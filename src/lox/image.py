@@ -0,0 +1,133 @@
+"""Snapshots of the global variables of an `Interpreter`.
+
+An image holds the globals a script defined, functions with their declarations
+and any other values, so a prelude can run once and be restored by every later
+process without scanning, parsing or executing it again. Natives are not part of
+the image: they are saved by name and looked up in the restoring interpreter,
+which must provide the same ones.
+
+Images are pickles, so loading one can run arbitrary code. Only load images you
+would also run as scripts.
+"""
+
+import gc
+import pickle
+from typing import BinaryIO, TypeGuard, override
+
+from lox.callable import LoxCallable
+from lox.ffi import NativeFunction
+from lox.fiber import Join, Spawn, Yield
+from lox.interpret import Clock, Interpreter, LoxFunction
+from lox.natives import NATIVES
+from lox.runtime_error import LoxRuntimeErr
+from lox.scanner import Token, TokenType
+
+MAGIC = b"LOXIMAGE"
+# Bump when the AST or the runtime values change shape.
+VERSION = 2
+
+
+class ImageError(Exception):
+    pass
+
+
+def _is_native(value: object) -> TypeGuard[LoxCallable]:
+    return isinstance(value, LoxCallable) and not isinstance(value, LoxFunction)
+
+
+def _builtin_name(value: LoxCallable) -> str | None:
+    """The name every interpreter defines `value` under, if it is a built-in."""
+    match value:
+        case NativeFunction(name=name):
+            return name
+        case Clock():
+            return "clock"
+        case Spawn():
+            return "spawn"
+        case Yield():
+            return "yield"
+        case Join():
+            return "join"
+    for name, native in NATIVES.items():
+        if native is value:
+            return name
+    return None
+
+
+class _Pickler(pickle.Pickler):
+    def __init__(self, file: BinaryIO, natives: dict[int, str]) -> None:
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self._natives = natives
+
+    @override
+    def persistent_id(self, obj: object) -> str | None:
+        if not _is_native(obj):
+            return None
+        if id(obj) not in self._natives:
+            raise ImageError(f"Cannot save {obj}, it is not a global variable.")
+        return self._natives[id(obj)]
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file: BinaryIO, interpreter: Interpreter) -> None:
+        super().__init__(file)
+        self._interpreter = interpreter
+
+    @override
+    def persistent_load(self, pid: object) -> object:
+        assert isinstance(pid, str)
+        try:
+            # Through `get`, so that natives from plugins are loaded on demand.
+            return self._interpreter.globals.get(
+                Token(TokenType.IDENTIFIER, pid, None, 0)
+            )
+        except LoxRuntimeErr:
+            raise ImageError(f"The image needs the native '{pid}'.") from None
+
+
+def save_image(interpreter: Interpreter, file: BinaryIO) -> None:
+    """Writes every global variable of `interpreter` that isn't a native to `file`.
+
+    Natives are saved by the name the restoring interpreter defines them under:
+    `var total = sum;` saves `total`, even after `sum` is reassigned. Natives
+    that aren't built-ins are saved by the first global name that holds them.
+    """
+    variables = interpreter.globals.variables
+    natives: dict[int, str] = {}
+    saved: dict[str, object] = {}
+    for name, value in variables.items():
+        if _is_native(value) and id(value) not in natives:
+            natives[id(value)] = _builtin_name(value) or name
+    for name, value in variables.items():
+        if natives.get(id(value)) != name:
+            saved[name] = value
+    file.write(MAGIC + VERSION.to_bytes(2, "little"))
+    try:
+        _Pickler(file, natives).dump(saved)
+    except (pickle.PicklingError, TypeError) as err:
+        raise ImageError(f"Cannot save the globals: {err}") from err
+
+
+def load_image(interpreter: Interpreter, file: BinaryIO) -> None:
+    """Defines the global variables saved in `file` by `save_image`."""
+    header = file.read(len(MAGIC) + 2)
+    if not header.startswith(MAGIC):
+        raise ImageError("Not a Lox image.")
+    version = int.from_bytes(header[len(MAGIC) :], "little")
+    if version != VERSION:
+        raise ImageError(f"Unsupported image version {version}, expected {VERSION}.")
+    # An image is mostly small AST nodes without cycles, which the collector
+    # would scan over and over while they are created.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        variables: dict[str, object] = _Unpickler(file, interpreter).load()
+    except ImageError:
+        raise
+    except Exception as err:
+        raise ImageError(f"Corrupt image: {err}") from err
+    finally:
+        if enabled:
+            gc.enable()
+    for name, value in variables.items():
+        interpreter.define(name, value)
@@ -1,7 +1,6 @@
 import time
-from abc import ABC, abstractmethod
-from collections.abc import Sequence
-from typing import Protocol, final, override
+from collections.abc import Awaitable, Generator, Mapping, Sequence
+from typing import TYPE_CHECKING, Protocol, final, override
 
 from lox.ast import (
     Assign,
@@ -16,6 +15,7 @@ from lox.ast import (
     Literal,
     Logical,
     Print,
+    Return,
     Stmt,
     Unary,
     Var,
@@ -24,11 +24,22 @@ from lox.ast import (
     VisitorStmt,
     While,
 )
-from lox.environment import Environment
+from lox.callable import LoxCallable
+from lox.environment import Cell, Environment, Globals
+from lox.equality import is_equal
+from lox.ffi import NativeFunction, plugins
+from lox.limits import Limits, Meter
+from lox.memo import MemoCache, memo_key
+from lox.natives import NATIVES
+from lox.output import BufferedOutput, Output
 from lox.render import render
-from lox.runtime_error import LoxRuntimeErr
+from lox.rope import Rope, concat
+from lox.runtime_error import LoxNativeErr, LoxNativeLimitErr, LoxRuntimeErr
 from lox.scanner import TokenType
 
+if TYPE_CHECKING:
+    from lox.trace import Tracer
+
 
 def _check_float(value: object, exception: Exception) -> float:
     if not isinstance(value, float):
@@ -44,23 +55,182 @@ def _is_truthy(value: object) -> bool:
     return True
 
 
+def _plugin_natives() -> Mapping[str, object]:
+    return plugins().natives
+
+
 class ErrorReporter(Protocol):
     def runtime_error(self, err: LoxRuntimeErr) -> None: ...
 
 
+class _Return(Exception):
+    def __init__(self, value: object) -> None:
+        self.value = value
+
+
 @final
 class Interpreter(VisitorExpr[object], VisitorStmt[None]):
-    def __init__(self) -> None:
-        self._globals = Environment()
-        self._environment = self._globals
+    def __init__(
+        self,
+        output: Output | None = None,
+        memo_size: int = 0,
+        limits: Limits | None = None,
+    ) -> None:
+        self._output = BufferedOutput() if output is None else output
+        # Buffered output is flushed from the meter during long computations.
+        poll = self._output.poll if isinstance(self._output, BufferedOutput) else None
+        self._meter = Meter(Limits() if limits is None else limits, poll)
+        self._ticks = 0
+        self._allocations = 0
+        # Plugins are only discovered when a name isn't found, which keeps
+        # startup fast.
+        self._globals = Globals(_plugin_natives)
+        self._environment: Environment = self._globals
         self._globals.define("clock", Clock())
+        for name, native in NATIVES.items():
+            self._globals.define(name, native)
+        self._memo_size = memo_size
+        # By declaration id, with the declaration and the globals it reads.
+        self._pure_functions: dict[int, tuple[Function, frozenset[str]]] = {}
+        self._memo_caches: dict[int, tuple[str, MemoCache]] = {}
+        # By declaration id, with the declaration to keep the id from being reused.
+        self._free_variables: dict[int, tuple[Function, frozenset[str]]] = {}
+        # Whether a block declares variables, by block id, like `_free_variables`.
+        self._scoped_blocks: dict[int, tuple[Block, bool]] = {}
+        self._tracer: Tracer | None = None
+
+    def define(self, name: str, value: object) -> None:
+        if self._pure_functions:
+            self._forget({name})
+        self._globals.define(name, value)
+
+    def allocate(self, count: int) -> None:
+        """Accounts for values allocated by a native, see `Limits`."""
+        self._allocations += count
+        if self._meter.exceeds_allocations(self._allocations):
+            raise LoxNativeLimitErr("Allocation limit exceeded.")
+
+    def attach(self, tracer: "Tracer") -> None:
+        """Sends runtime events to `tracer` until `detach` is called."""
+        from lox.trace import instrument
+
+        self.detach()
+        for name, method in instrument(self, tracer).items():
+            setattr(self, name, method)
+        self._tracer = tracer
+
+    def detach(self) -> None:
+        if self._tracer is None:
+            return
+        from lox.trace import INSTRUMENTED
+
+        for name in INSTRUMENTED:
+            delattr(self, name)
+        self._tracer = None
+
+    @property
+    def globals(self) -> Environment:
+        return self._globals
+
+    @property
+    def environment(self) -> Environment:
+        """The innermost environment of the code being executed."""
+        return self._environment
+
+    @property
+    def memo_caches(self) -> Sequence[tuple[str, MemoCache]]:
+        return list(self._memo_caches.values())
 
     def interpret(self, reporter: ErrorReporter, stmts: Sequence[Expr | Stmt]) -> None:
+        self._start(stmts)
         try:
             for stmt in stmts:
                 stmt.accept(self)
         except LoxRuntimeErr as err:
-            reporter.runtime_error(err)
+            self._report(reporter, err)
+        finally:
+            self._output.flush()
+
+    async def interpret_async(
+        self,
+        reporter: ErrorReporter,
+        stmts: Sequence[Expr | Stmt],
+        yield_every: int = 1000,
+    ) -> None:
+        """Like `interpret`, but lets other tasks run on the event loop meanwhile.
+
+        Natives may return awaitables, for instance by being `async def`
+        functions, which are awaited without blocking the loop. The program also
+        yields to the loop every `yield_every` statements.
+        """
+        self._start(stmts)
+        steps = Cooperative(self, yield_every).run(stmts)
+        value: object = None
+        error: Exception | None = None
+        try:
+            while True:
+                awaitable = steps.send(value) if error is None else steps.throw(error)
+                value, error = None, None
+                try:
+                    value = await awaitable
+                except Exception as err:
+                    # Raised where the native was called, see `Cooperative.call`.
+                    error = err
+        except StopIteration:
+            pass
+        except LoxRuntimeErr as err:
+            self._report(reporter, err)
+        finally:
+            steps.close()
+            self._output.flush()
+
+    def interpret_fibers(
+        self, reporter: ErrorReporter, stmts: Sequence[Expr | Stmt]
+    ) -> None:
+        """Like `interpret`, with the `spawn`, `yield` and `join` natives of fibers.
+
+        See `lox.fiber`. The program ends once every fiber finished.
+        """
+        from lox.fiber import Scheduler
+
+        self._start(stmts)
+        try:
+            Scheduler(self).run(stmts)
+        except LoxRuntimeErr as err:
+            self._report(reporter, err)
+        finally:
+            self._output.flush()
+
+    def _start(self, stmts: Sequence[Expr | Stmt]) -> None:
+        if self._memo_size > 0:
+            from lox.purity import declared_names, pure_functions
+
+            # Functions memoized by earlier chunks may read what this one declares.
+            if self._pure_functions:
+                self._forget(declared_names(stmts))
+            self._pure_functions.update(pure_functions(stmts))
+        self._meter.start(self._ticks)
+        self._ticks = 0
+
+    def _forget(self, names: set[str]) -> None:
+        """Stops memoizing the functions that read one of `names`, directly or not."""
+        stale = set(names)
+        changed = True
+        while changed:
+            changed = False
+            for key, (declaration, reads) in list(self._pure_functions.items()):
+                if reads & stale:
+                    del self._pure_functions[key]
+                    stale.add(declaration.name.lexeme)
+                    if key in self._memo_caches:
+                        self._memo_caches[key][1].disable()
+                    changed = True
+
+    def _report(self, reporter: ErrorReporter, err: LoxRuntimeErr) -> None:
+        if self._tracer is not None:
+            self._tracer.error(err)
+        self._output.flush()
+        reporter.runtime_error(err)
 
     @override
     def visit_binary_expr(self, expr: Binary) -> object:
@@ -72,8 +242,9 @@ class Interpreter(VisitorExpr[object], VisitorStmt[None]):
             case TokenType.PLUS:
                 if isinstance(right, float) and isinstance(left, float):
                     return left + right
-                if isinstance(right, str) and isinstance(left, str):
-                    return left + right
+                if isinstance(right, str | Rope) and isinstance(left, str | Rope):
+                    self._allocations += 1 + (len(right) >> 6)
+                    return concat(left, right)
                 raise LoxRuntimeErr(
                     expr.operator, "Operands must be be two numbers or two strings."
                 )
@@ -134,21 +305,9 @@ class Interpreter(VisitorExpr[object], VisitorStmt[None]):
                 )
                 return left_float <= right_float
             case TokenType.BANG_EQUAL:
-                right_float = _check_float(
-                    right, LoxRuntimeErr(expr.operator, "Operands must be numbers.")
-                )
-                left_float = _check_float(
-                    left, LoxRuntimeErr(expr.operator, "Operands must be numbers.")
-                )
-                return left_float != right_float
+                return not is_equal(left, right)
             case TokenType.EQUAL_EQUAL:
-                right_float = _check_float(
-                    right, LoxRuntimeErr(expr.operator, "Operands must be numbers.")
-                )
-                left_float = _check_float(
-                    left, LoxRuntimeErr(expr.operator, "Operands must be numbers.")
-                )
-                return left_float == right_float
+                return is_equal(left, right)
         raise NotImplementedError()
 
     @override
@@ -179,7 +338,7 @@ class Interpreter(VisitorExpr[object], VisitorStmt[None]):
     @override
     def visit_print_stmt(self, expr: Print) -> None:
         value = expr.expression.accept(self)
-        print(render(value))
+        self._output.write(render(value) + "\n")
 
     @override
     def visit_var_stmt(self, expr: Var) -> None:
@@ -200,7 +359,12 @@ class Interpreter(VisitorExpr[object], VisitorStmt[None]):
     def visit_call_expr(self, expr: Call) -> object:
         # Order of argument evaluation matter! Moreover, we could check whether the callee is
         # callable before evaluating arguments.
+        self._ticks -= 1
+        if self._ticks < 0:
+            self._ticks = self._meter.refuel(expr.paren, self._allocations)
         callee = expr.callee.accept(self)
+        if type(callee) is NativeFunction and callee.arity == len(expr.arguments):
+            return self._call_native(callee, expr)
         arguments = [arg.accept(self) for arg in expr.arguments]
         if not isinstance(callee, LoxCallable):
             raise LoxRuntimeErr(expr.paren, "Can only call functions and classes.")
@@ -209,14 +373,51 @@ class Interpreter(VisitorExpr[object], VisitorStmt[None]):
                 expr.paren,
                 f"Expected {callee.arity} arguments but got {len(arguments)}.",
             )
-        return callee.call(self, arguments)
+        try:
+            return callee.call(self, arguments)
+        except LoxNativeErr as err:
+            raise err.at(expr.paren) from None
+
+    def _call_native(self, native: NativeFunction, expr: Call) -> object:
+        # Specialised by arity, so the arguments never end up in a list.
+        function, arguments = native.function, expr.arguments
+        try:
+            match len(arguments):
+                case 0:
+                    return function()
+                case 1:
+                    return function(native.check(0, arguments[0].accept(self)))
+                case 2:
+                    first = arguments[0].accept(self)
+                    second = arguments[1].accept(self)
+                    return function(native.check(0, first), native.check(1, second))
+            return native.call(self, [arg.accept(self) for arg in arguments])
+        except LoxNativeErr as err:
+            raise err.at(expr.paren) from None
 
     @override
     def visit_block_stmt(self, expr: Block) -> None:
+        if self.is_scoped(expr):
+            self._allocations += 1
+            self.execute_block(expr.statements, Environment(self._environment))
+            return
+        # Shares the enclosing environment instead of an empty one of its own.
+        for statement in expr.statements:
+            statement.accept(self)
+
+    def is_scoped(self, block: Block) -> bool:
+        """Whether `block` declares variables, and so needs an environment."""
+        entry = self._scoped_blocks.get(id(block))
+        if entry is None:
+            scoped = any(isinstance(stmt, Var | Function) for stmt in block.statements)
+            entry = self._scoped_blocks[id(block)] = block, scoped
+        return entry[1]
+
+    def execute_block(self, stmts: Sequence[Stmt], environment: Environment) -> None:
         previous = self._environment
         try:
-            self._environment = Environment(previous)
-            for statement in expr.statements:
+            self._environment = environment
+            for statement in stmts:
                 statement.accept(self)
         finally:
             self._environment = previous
@@ -232,12 +433,49 @@ class Interpreter(VisitorExpr[object], VisitorStmt[None]):
     def visit_while_stmt(self, expr: While) -> None:
         while _is_truthy(expr.condition.accept(self)):
             expr.body.accept(self)
+            self._ticks -= 1
+            if self._ticks < 0:
+                self._ticks = self._meter.refuel(expr.keyword, self._allocations)
 
     @override
     def visit_function_stmt(self, expr: Function) -> None:
-        function = LoxFunction(expr)
+        cells = None
+        if self._environment is not self._globals:
+            cells = self._capture(expr)
+        function = LoxFunction(expr, cells)
+        if id(expr) in self._pure_functions:
+            if id(expr) not in self._memo_caches:
+                self._memo_caches[id(expr)] = (
+                    expr.name.lexeme,
+                    MemoCache(self._memo_size),
+                )
+            function = MemoizedFunction(expr, cells, self._memo_caches[id(expr)][1])
         self._environment.define(expr.name.lexeme, function)
 
+    def _capture(self, declaration: Function) -> dict[str, Cell] | None:
+        """The cells of the local variables `declaration` uses, if any."""
+        if id(declaration) in self._free_variables:
+            _, names = self._free_variables[id(declaration)]
+        else:
+            from lox.closure import free_variables
+
+            names = free_variables(declaration)
+            self._free_variables[id(declaration)] = declaration, names
+        if declaration.name.lexeme in names:
+            # Defined early, so that the function can capture itself.
+            self._environment.define(declaration.name.lexeme, None)
+        cells: dict[str, Cell] = {}
+        for name in names:
+            cell = self._environment.capture(name)
+            if cell is not None:
+                cells[name] = cell
+        return cells or None
+
+    @override
+    def visit_return_stmt(self, expr: Return) -> None:
+        value = None if expr.value is None else expr.value.accept(self)
+        raise _Return(value)
+
     @override
     def visit_logical_expr(self, expr: Logical) -> object:
         left = expr.left.accept(self)
@@ -253,16 +491,9 @@ class Interpreter(VisitorExpr[object], VisitorStmt[None]):
         raise NotImplementedError()
 
 
-class LoxCallable(ABC):
-    @property
-    @abstractmethod
-    def arity(self) -> int: ...
-
-    @abstractmethod
-    def call(self, interpreter: Interpreter, arguments: Sequence[object]) -> object: ...
-
-
 class Clock(LoxCallable):
+    __slots__ = ()
+
     @property
     @override
     def arity(self) -> int:
@@ -278,8 +509,29 @@ class Clock(LoxCallable):
 
 
 class LoxFunction(LoxCallable):
-    def __init__(self, declaration: Function) -> None:
+    __slots__ = ("_declaration", "_cells")
+
+    def __init__(
+        self, declaration: Function, cells: dict[str, Cell] | None = None
+    ) -> None:
         self._declaration = declaration
+        self._cells = cells
+
+    @property
+    def declaration(self) -> Function:
+        return self._declaration
+
+    @property
+    def cells(self) -> dict[str, Cell] | None:
+        """The variables the function closes over, or None if it doesn't."""
+        return self._cells
+
+    def enclosing(self, interpreter: Interpreter) -> Environment:
+        # Functions see the globals of the interpreter that calls them, which
+        # lets `Program.run` share functions between interpreters.
+        if self._cells is None:
+            return interpreter._globals
+        return Environment(interpreter._globals, self._cells)
 
     @property
     @override
@@ -288,12 +540,310 @@ class LoxFunction(LoxCallable):
 
     @override
     def call(self, interpreter: Interpreter, arguments: Sequence[object]) -> object:
-        environment = Environment(interpreter._globals)
+        interpreter._allocations += 1
+        # Like `enclosing`, inlined for the common case.
+        if self._cells is None:
+            environment = Environment(interpreter._globals)
+        else:
+            environment = Environment(Environment(interpreter._globals, self._cells))
         for param, argument in zip(self._declaration.params, arguments, strict=True):
             environment.define(param.lexeme, argument)
-        Block(self._declaration.body).accept(interpreter)
+        try:
+            interpreter.execute_block(self._declaration.body, environment)
+        except _Return as return_:
+            return return_.value
         return None
 
+    def steps(
+        self, cooperative: "Cooperative", arguments: Sequence[object]
+    ) -> "Steps[object]":
+        """Like `call`, but as steps that can suspend, see `Cooperative`."""
+        return cooperative.call_function(self, arguments)
+
     @override
     def __str__(self) -> str:
         return f"<fun {self._declaration.name.lexeme}>"
+
+
+class MemoizedFunction(LoxFunction):
+    __slots__ = ("_cache",)
+
+    def __init__(
+        self, declaration: Function, cells: dict[str, Cell] | None, cache: MemoCache
+    ) -> None:
+        super().__init__(declaration, cells)
+        self._cache = cache
+
+    @override
+    def __reduce__(
+        self,
+    ) -> tuple[type[LoxFunction], tuple[Function, dict[str, Cell] | None]]:
+        # A cache belongs to the interpreter that filled it, so images only keep
+        # the declaration and the cells.
+        return LoxFunction, (self.declaration, self.cells)
+
+    @override
+    def call(self, interpreter: Interpreter, arguments: Sequence[object]) -> object:
+        if not self._cache.enabled:
+            return super().call(interpreter, arguments)
+        key = memo_key(arguments)
+        found, value = self._cache.get(key)
+        if not found:
+            value = super().call(interpreter, arguments)
+            self._cache.put(key, value)
+        return value
+
+    @override
+    def steps(
+        self, cooperative: "Cooperative", arguments: Sequence[object]
+    ) -> "Steps[object]":
+        if not self._cache.enabled:
+            return (yield from super().steps(cooperative, arguments))
+        key = memo_key(arguments)
+        found, value = self._cache.get(key)
+        if not found:
+            value = yield from super().steps(cooperative, arguments)
+            self._cache.put(key, value)
+        return value
+
+
+class _Pause:
+    def __await__(self) -> Generator[None]:
+        # A bare yield makes the asyncio task run the other tasks first.
+        yield
+
+
+PAUSE = _Pause()
+
+# Steps of a program that yield the awaitables it waits for and return `T`.
+type Steps[T] = Generator[Awaitable[object], object, T]
+
+
+def _has_call(expr: Expr) -> bool:
+    match expr:
+        case Call():
+            return True
+        case Binary(left=left, right=right) | Logical(left=left, right=right):
+            return _has_call(left) or _has_call(right)
+        case Unary(right=operand) | Grouping(expression=operand):
+            return _has_call(operand)
+        case Assign(value=value):
+            return _has_call(value)
+    return False
+
+
+def _done[T](value: T) -> Steps[T]:
+    """Steps that finish with `value` right away."""
+    yield from ()
+    return value
+
+
+@final
+class Cooperative(VisitorExpr[Steps[object]], VisitorStmt[Steps[None]]):
+    """Executes statements as generators that can suspend the program.
+
+    The generators yield the awaitables that natives return, and `PAUSE` every
+    `yield_every` statements, to whoever drives them: `Interpreter.interpret_async`
+    or the scheduler of `lox.fiber`. They are sent back the results.
+
+    Only calls can suspend, so expressions without calls are evaluated by the
+    interpreter as usual. Everything else mirrors the interpreter's visits, and
+    reuses them for operators.
+    """
+
+    def __init__(self, interpreter: Interpreter, yield_every: int) -> None:
+        self._interpreter = interpreter
+        self._yield_every = yield_every
+        self._countdown = yield_every
+        # By expression id, with the expression to keep the id from being reused.
+        self._suspends: dict[int, tuple[Expr, bool]] = {}
+
+    @property
+    def environment(self) -> Environment:
+        """The interpreter's current environment, which drivers switch."""
+        return self._interpreter._environment
+
+    @environment.setter
+    def environment(self, environment: Environment) -> None:
+        self._interpreter._environment = environment
+
+    def run(self, stmts: Sequence[Expr | Stmt]) -> Steps[None]:
+        for stmt in stmts:
+            if isinstance(stmt, Expr):
+                yield from self.evaluate(stmt)
+            else:
+                yield from self.execute(stmt)
+
+    # `execute` and `evaluate` return the visitors' generators instead of being
+    # generators themselves, which would add a frame to every suspension.
+
+    def execute(self, stmt: Stmt) -> Steps[None]:
+        self._countdown -= 1
+        if self._countdown <= 0:
+            self._countdown = self._yield_every
+            return self._pause(stmt)
+        return stmt.accept(self)
+
+    def _pause(self, stmt: Stmt) -> Steps[None]:
+        yield PAUSE
+        yield from stmt.accept(self)
+
+    def execute_block(
+        self, stmts: Sequence[Stmt], environment: Environment
+    ) -> Steps[None]:
+        interpreter = self._interpreter
+        previous = interpreter._environment
+        try:
+            interpreter._environment = environment
+            for stmt in stmts:
+                yield from self.execute(stmt)
+        finally:
+            interpreter._environment = previous
+
+    def evaluate(self, expr: Expr) -> Steps[object]:
+        if id(expr) in self._suspends:
+            _, suspends = self._suspends[id(expr)]
+        else:
+            suspends = _has_call(expr)
+            self._suspends[id(expr)] = expr, suspends
+        if not suspends:
+            return _done(expr.accept(self._interpreter))
+        return expr.accept(self)
+
+    @override
+    def visit_expression_stmt(self, expr: Expression) -> Steps[None]:
+        yield from self.evaluate(expr.expression)
+
+    @override
+    def visit_function_stmt(self, expr: Function) -> Steps[None]:
+        return _done(self._interpreter.visit_function_stmt(expr))
+
+    @override
+    def visit_if_stmt(self, expr: If) -> Steps[None]:
+        if (yield from self.evaluate(expr.condition)):
+            yield from self.execute(expr.then_branch)
+        elif expr.else_branch is not None:
+            yield from self.execute(expr.else_branch)
+
+    @override
+    def visit_while_stmt(self, expr: While) -> Steps[None]:
+        interpreter = self._interpreter
+        while _is_truthy((yield from self.evaluate(expr.condition))):
+            yield from self.execute(expr.body)
+            interpreter._ticks -= 1
+            if interpreter._ticks < 0:
+                interpreter._ticks = interpreter._meter.refuel(
+                    expr.keyword, interpreter._allocations
+                )
+
+    @override
+    def visit_block_stmt(self, expr: Block) -> Steps[None]:
+        interpreter = self._interpreter
+        if interpreter.is_scoped(expr):
+            interpreter._allocations += 1
+            environment = Environment(interpreter._environment)
+            yield from self.execute_block(expr.statements, environment)
+            return
+        for stmt in expr.statements:
+            yield from self.execute(stmt)
+
+    @override
+    def visit_print_stmt(self, expr: Print) -> Steps[None]:
+        value = yield from self.evaluate(expr.expression)
+        self._interpreter._output.write(render(value) + "\n")
+
+    @override
+    def visit_return_stmt(self, expr: Return) -> Steps[None]:
+        value = None if expr.value is None else (yield from self.evaluate(expr.value))
+        raise _Return(value)
+
+    @override
+    def visit_var_stmt(self, expr: Var) -> Steps[None]:
+        value = yield from self.evaluate(expr.initializer)
+        self._interpreter._environment.define(expr.name.lexeme, value)
+
+    @override
+    def visit_binary_expr(self, expr: Binary) -> Steps[object]:
+        left = yield from self.evaluate(expr.left)
+        right = yield from self.evaluate(expr.right)
+        return self._interpreter.visit_binary_expr(
+            Binary(Literal(left), expr.operator, Literal(right))
+        )
+
+    @override
+    def visit_call_expr(self, expr: Call) -> Steps[object]:
+        interpreter = self._interpreter
+        interpreter._ticks -= 1
+        if interpreter._ticks < 0:
+            interpreter._ticks = interpreter._meter.refuel(
+                expr.paren, interpreter._allocations
+            )
+        callee = yield from self.evaluate(expr.callee)
+        arguments: list[object] = []
+        for argument in expr.arguments:
+            arguments.append((yield from self.evaluate(argument)))
+        if not isinstance(callee, LoxCallable):
+            raise LoxRuntimeErr(expr.paren, "Can only call functions and classes.")
+        if callee.arity != len(arguments):
+            raise LoxRuntimeErr(
+                expr.paren,
+                f"Expected {callee.arity} arguments but got {len(arguments)}.",
+            )
+        try:
+            return (yield from self.call(callee, arguments))
+        except LoxNativeErr as err:
+            raise err.at(expr.paren) from None
+
+    @override
+    def visit_assign_expr(self, expr: Assign) -> Steps[object]:
+        value = yield from self.evaluate(expr.value)
+        self._interpreter._environment.assign(expr.name, value)
+        return value
+
+    @override
+    def visit_grouping_expr(self, expr: Grouping) -> Steps[object]:
+        return (yield from self.evaluate(expr.expression))
+
+    @override
+    def visit_literal_expr(self, expr: Literal) -> Steps[object]:
+        return _done(expr.value)
+
+    @override
+    def visit_logical_expr(self, expr: Logical) -> Steps[object]:
+        left = yield from self.evaluate(expr.left)
+        if _is_truthy(left) == (expr.operator.type_ == TokenType.OR):
+            return left
+        return (yield from self.evaluate(expr.right))
+
+    @override
+    def visit_unary_expr(self, expr: Unary) -> Steps[object]:
+        value = yield from self.evaluate(expr.right)
+        return self._interpreter.visit_unary_expr(Unary(expr.operator, Literal(value)))
+
+    @override
+    def visit_variable_expr(self, expr: Variable) -> Steps[object]:
+        return _done(self._interpreter.visit_variable_expr(expr))
+
+    def call(self, callee: LoxCallable, arguments: Sequence[object]) -> Steps[object]:
+        """Calls `callee`, whose arity the caller checked."""
+        if isinstance(callee, LoxFunction):
+            return (yield from callee.steps(self, arguments))
+        value = callee.call(self._interpreter, arguments)
+        if isinstance(value, Awaitable):
+            value = yield value
+        return value
+
+    def call_function(
+        self, function: LoxFunction, arguments: Sequence[object]
+    ) -> Steps[object]:
+        interpreter = self._interpreter
+        interpreter._allocations += 1
+        declaration = function.declaration
+        environment = Environment(function.enclosing(interpreter))
+        for param, argument in zip(declaration.params, arguments, strict=True):
+            environment.define(param.lexeme, argument)
+        try:
+            yield from self.execute_block(declaration.body, environment)
+        except _Return as return_:
+            return return_.value
+        return None
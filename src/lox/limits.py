@@ -0,0 +1,72 @@
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from lox.runtime_error import LoxLimitErr
+from lox.scanner import Token
+
+# Without a fuel limit, deadlines and allocations are checked this often.
+CHECK_INTERVAL = 1024
+_UNLIMITED = 1 << 62
+
+
+@dataclass(frozen=True)
+class Limits:
+    """Resource limits for one `Interpreter`.
+
+    `fuel` counts loop iterations and calls. `timeout` is the wall-clock time in
+    seconds each `interpret` call may take. `max_allocations` caps the number of
+    values allocated over the lifetime of the interpreter: environments, strings
+    (one per started 64 characters), array elements and map entries.
+    """
+
+    fuel: int | None = None
+    timeout: float | None = None
+    max_allocations: int | None = None
+
+
+class Meter:
+    """Enforces `Limits`, see `Interpreter.tick`.
+
+    The interpreter counts ticks down from a grant handed out by `refuel`. Only
+    when the grant runs out does the meter look at the clock or the limits, so
+    the common case is a single decrement. `poll`, if given, is called on every
+    refuel, at least every `CHECK_INTERVAL` ticks.
+    """
+
+    def __init__(self, limits: Limits, poll: Callable[[], None] | None = None) -> None:
+        self._limits = limits
+        self._fuel = limits.fuel
+        self._deadline: float | None = None
+        self._poll = poll
+
+    def start(self, unused: int) -> None:
+        """Starts the timeout and takes back what is left of the last grant."""
+        if self._fuel is not None:
+            self._fuel += max(unused, 0)
+        if self._limits.timeout is not None:
+            self._deadline = time.monotonic() + self._limits.timeout
+
+    def refuel(self, token: Token, allocations: int) -> int:
+        """Charges the tick that exhausted the last grant and hands out a new one."""
+        if self._poll is not None:
+            self._poll()
+        if self.exceeds_allocations(allocations):
+            raise LoxLimitErr(token, "Allocation limit exceeded.")
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            raise LoxLimitErr(token, "Timeout exceeded.")
+        if self._fuel is None:
+            unlimited = self._deadline is None and self._limits.max_allocations is None
+            if unlimited and self._poll is None:
+                return _UNLIMITED
+            return CHECK_INTERVAL
+        if self._fuel <= 0:
+            raise LoxLimitErr(token, "Out of fuel.")
+        self._fuel -= 1
+        grant = min(CHECK_INTERVAL, self._fuel)
+        self._fuel -= grant
+        return grant
+
+    def exceeds_allocations(self, allocations: int) -> bool:
+        limit = self._limits.max_allocations
+        return limit is not None and allocations > limit
@@ -1,32 +1,201 @@
 import argparse
 import sys
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from pydantic import BaseModel
-
+from lox.ast import Expr, Stmt
 from lox.interpret import Interpreter
+from lox.limits import Limits
+from lox.optimize import MAX_OPT_LEVEL, optimize
+from lox.output import Output, UnbufferedOutput
 from lox.parser import Parser
 from lox.runtime_error import LoxRuntimeErr
 from lox.scanner import Scanner, Token, TokenType
 
+# Profilers and timings are imported when used, to keep startup fast.
+if TYPE_CHECKING:
+    from lox.heap import Snapshots
+    from lox.profile import Profiler
+    from lox.timings import Timings
+
+PROFILERS = ("deterministic", "sampling")
+
 
-class Args(BaseModel):
+@dataclass(frozen=True)
+class Args:
     path: Path | None = None
+    unbuffered: bool = False
+    opt_level: int = 0
+    memoize: int = 0
+    stats: bool = False
+    fuel: int | None = None
+    timeout: float | None = None
+    max_allocations: int | None = None
+    profile: str | None = None
+    profile_output: Path | None = None
+    timings: bool = False
+    timings_format: str = "table"
+    image: Path | None = None
+    save_image: Path | None = None
+    fibers: bool = False
+    heap_report: bool = False
+    heap_snapshots: Path | None = None
+    heap_interval: float = 1.0
+
+
+def _expand_timings(args: Sequence[str]) -> list[str]:
+    """Expands `--timings=FORMAT` to `--timings --timings-format FORMAT`.
+
+    `--timings` takes no value, so that `--timings script.lox` runs the script.
+    """
+    expanded: list[str] = []
+    for arg in args:
+        if arg.startswith("--timings="):
+            expanded += [
+                "--timings",
+                "--timings-format",
+                arg.removeprefix("--timings="),
+            ]
+        else:
+            expanded.append(arg)
+    return expanded
 
 
 def parse_arguments(args: Sequence[str]) -> Args:
     parser = argparse.ArgumentParser(description="jlox")
-    parser.add_argument("path", nargs="?", const=None, help="script to run with jlox")
+    parser.add_argument("path", nargs="?", type=Path, help="script to run with jlox")
+    parser.add_argument(
+        "--unbuffered",
+        action="store_true",
+        help="write the output of every print statement immediately",
+    )
+    parser.add_argument(
+        "--opt-level",
+        type=int,
+        choices=range(MAX_OPT_LEVEL + 1),
+        default=0,
+        help="optimization passes to run before interpreting",
+    )
+    parser.add_argument(
+        "--memoize",
+        type=int,
+        default=0,
+        metavar="SIZE",
+        help="cache up to SIZE results of each pure function",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="report runtime statistics on stderr",
+    )
+    parser.add_argument(
+        "--fuel",
+        type=int,
+        help="stop after this many loop iterations and calls",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help="stop after this much wall-clock time",
+    )
+    parser.add_argument(
+        "--max-allocations",
+        type=int,
+        help="stop after allocating this many values",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILERS,
+        help="report where the script spends its time on stderr",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=Path,
+        metavar="PATH",
+        help="write the profiled call stacks to PATH, for flamegraph tools",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="report the time and memory each phase takes on stderr, "
+        "--timings=json is short for --timings --timings-format json",
+    )
+    parser.add_argument(
+        "--timings-format",
+        choices=("table", "json"),
+        default="table",
+        help="the format of the --timings report",
+    )
+    parser.add_argument(
+        "--image",
+        type=Path,
+        metavar="PATH",
+        help="restore the globals saved with --save-image before running",
+    )
+    parser.add_argument(
+        "--save-image",
+        type=Path,
+        metavar="PATH",
+        help="save the globals to PATH after running",
+    )
+    parser.add_argument(
+        "--fibers",
+        action="store_true",
+        help="define spawn, yield and join to run functions as fibers",
+    )
+    parser.add_argument(
+        "--heap-report",
+        action="store_true",
+        help="report the values the globals reach on stderr, by line and kind",
+    )
+    parser.add_argument(
+        "--heap-snapshots",
+        type=Path,
+        metavar="PATH",
+        help="write how the reachable values change to PATH while running",
+    )
+    parser.add_argument(
+        "--heap-interval",
+        type=float,
+        default=1.0,
+        metavar="SECONDS",
+        help="time between two --heap-snapshots",
+    )
 
-    return Args.model_validate(vars(parser.parse_args(args)))  # type: ignore[misc]
+    namespace = parser.parse_args(_expand_timings(args))
+    # Both attach a tracer to the interpreter, which only takes one.
+    if namespace.heap_snapshots is not None and namespace.timings:  # type: ignore[misc]
+        parser.error("argument --heap-snapshots: not allowed with argument --timings")
+    return Args(**vars(namespace))  # type: ignore[misc]
 
 
 class Lox:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        output: Output | None = None,
+        opt_level: int = 0,
+        memoize: int = 0,
+        limits: Limits | None = None,
+        timings: bool = False,
+        fibers: bool = False,
+    ) -> None:
         self.had_error = False
         self.had_runtime_error = False
-        self._interpreter = Interpreter()
+        self._interpreter = Interpreter(output, memoize, limits)
+        self._opt_level = opt_level
+        self._fibers = fibers
+        self.timings: Timings | None = None
+        self._snapshots: Snapshots | None = None
+        # The last program run, for the declaration lines of `report_heap`.
+        self._program: Sequence[Expr | Stmt] = ()
+        if timings:
+            import lox.timings
+
+            self.timings = lox.timings.Timings()
 
     def error(self, line: int, message: str) -> None:
         self._report(line, "", message)
@@ -39,27 +208,149 @@ class Lox:
 
     def runtime_error(self, err: LoxRuntimeErr) -> None:
         self.had_runtime_error = True
-        self._report(err.token.line, "", err.message)
+        print(f"[line {err.token.line}] Error: {err.message}", file=sys.stderr)
 
     def _report(self, line: int, where: str, message: str) -> None:
         print(f"[line {line}] Error{where}: {message}", file=sys.stderr)
         self.had_error = True
 
+    def _phase(self, name: str) -> AbstractContextManager[None]:
+        return nullcontext() if self.timings is None else self.timings.phase(name)
+
     def _run(self, source: str) -> None:
-        scanner = Scanner(self, source)  # Ugh
-        tokens = scanner.scan_tokens()
+        with self._phase("scan"):
+            scanner = Scanner(self, source)  # Ugh
+            tokens = scanner.scan_tokens()
         if self.had_error:
             return
-        statements = Parser(self, tokens).parse()
+        with self._phase("parse"):
+            statements = Parser(self, tokens).parse()
         if statements is None:
             return
         if self.had_error:
             return  # type: ignore[unreachable] # https://github.com/python/mypy/issues/17537
-        self._interpreter.interpret(self, statements)
+        with self._phase("optimize"):
+            program = optimize(statements, self._opt_level)
+        self._program = program
+        if self._snapshots is not None:
+            self._snapshots.declare(program)
+            self._interpreter.attach(self._snapshots)
+            try:
+                self._interpret(program)
+            finally:
+                self._interpreter.detach()
+                self._snapshots.snapshot()
+            return
+        if self.timings is None:
+            self._interpret(program)
+            return
+        from lox.timings import count_nodes
+
+        self.timings.tokens += len(tokens)
+        count_nodes(statements, self.timings.nodes)
+        self._interpreter.attach(self.timings.counters)
+        try:
+            with self._phase("interpret"):
+                self._interpret(program)
+        finally:
+            self._interpreter.detach()
+
+    def _interpret(self, program: Sequence[Expr | Stmt]) -> None:
+        if self._fibers:
+            self._interpreter.interpret_fibers(self, program)
+        else:
+            self._interpreter.interpret(self, program)
+
+    def load_image(self, path: Path) -> None:
+        from lox.image import ImageError, load_image
+
+        try:
+            with self._phase("image"), path.open("rb") as file:
+                load_image(self._interpreter, file)
+        except (ImageError, OSError) as err:
+            print(f"Error: {path}: {err}", file=sys.stderr)
+            sys.exit(66)
+
+    def save_image(self, path: Path) -> None:
+        from lox.image import ImageError, save_image
+
+        try:
+            with path.open("wb") as file:
+                save_image(self._interpreter, file)
+        except (ImageError, OSError) as err:
+            print(f"Error: {path}: {err}", file=sys.stderr)
+            sys.exit(74)
 
-    def run_file(self, path: Path) -> None:
-        source = path.read_text("utf-8")
-        self._run(source)
+    @contextmanager
+    def snapshot_heap(self, path: Path | None, interval: float) -> Iterator[None]:
+        """Writes heap snapshots to `path` while running, see `lox.heap.Snapshots`."""
+        if path is None:
+            yield
+            return
+        from lox.heap import Snapshots
+
+        try:
+            file = path.open("w", encoding="utf-8")
+        except OSError as err:
+            print(f"Error: {path}: {err}", file=sys.stderr)
+            sys.exit(74)
+        with file:
+            self._snapshots = Snapshots(self._interpreter, file, interval)
+            try:
+                yield
+            finally:
+                self._snapshots = None
+
+    def report_heap(self) -> None:
+        from lox.heap import declaration_lines, walk
+
+        walk(self._interpreter, declaration_lines(self._program)).report(sys.stderr)
+
+    def report_stats(self) -> None:
+        for name, cache in self._interpreter.memo_caches:
+            stats = cache.stats
+            print(
+                f"memo {name}: {stats.hits} hits, {stats.misses} misses, "
+                f"{stats.evictions} evictions",
+                file=sys.stderr,
+            )
+
+    def report_profile(self, profiler: "Profiler", output: Path | None) -> None:
+        profiler.profile.report(sys.stderr)
+        if output is not None:
+            with output.open("w", encoding="utf-8") as file:
+                profiler.profile.write_collapsed(file)
+
+    def report_timings(self, json: bool) -> None:
+        if self.timings is None:
+            return
+        if json:
+            print(self.timings.to_json(), file=sys.stderr)
+        else:
+            self.timings.report(sys.stderr)
+
+    def run_file(
+        self,
+        path: Path,
+        stats: bool = False,
+        profiler: "Profiler | None" = None,
+        profile_output: Path | None = None,
+        timings: str = "table",
+        heap_report: bool = False,
+    ) -> None:
+        with self._phase("read"):
+            source = path.read_text("utf-8")
+        if profiler is None:
+            self._run(source)
+        else:
+            with profiler:
+                self._run(source)
+            self.report_profile(profiler, profile_output)
+        if stats:
+            self.report_stats()
+        if heap_report:
+            self.report_heap()
+        self.report_timings(timings == "json")
         if self.had_error:
             sys.exit(65)
         if self.had_runtime_error:
@@ -77,12 +368,55 @@ class Lox:
 
 
 def main() -> None:
+    match sys.argv[1:2]:
+        case ["serve"]:
+            from lox import server
+
+            server.main(sys.argv[2:])
+            return
+        case ["client"]:
+            from lox import client
+
+            client.main(sys.argv[2:])
+            return
+        case ["run-many"]:
+            from lox import batch
+
+            batch.main(sys.argv[2:])
+            return
     args = parse_arguments(sys.argv[1:])
-    match args.path:
-        case None:
-            Lox().run_prompt()
-        case path:
-            Lox().run_file(path)
+    output = UnbufferedOutput() if args.unbuffered else None
+    limits = Limits(args.fuel, args.timeout, args.max_allocations)
+    lox = Lox(
+        output,
+        args.opt_level,
+        args.memoize,
+        limits,
+        args.timings,
+        args.fibers,
+    )
+    profiler: Profiler | None = None
+    if args.profile is not None:
+        from lox.profile import PROFILERS as profilers
+
+        profiler = profilers[args.profile]()
+    if args.image is not None:
+        lox.load_image(args.image)
+    with lox.snapshot_heap(args.heap_snapshots, args.heap_interval):
+        match args.path:
+            case None:
+                lox.run_prompt()
+            case path:
+                lox.run_file(
+                    path,
+                    args.stats,
+                    profiler,
+                    args.profile_output,
+                    args.timings_format,
+                    args.heap_report,
+                )
+    if args.save_image is not None:
+        lox.save_image(args.save_image)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,15 @@
+from collections.abc import Hashable
+from typing import override
+
+
+class LoxMap:
+    """A hash map from Lox values, normalized with `lox_key`, to Lox values."""
+
+    __slots__ = ("entries",)
+
+    def __init__(self, entries: dict[Hashable, object] | None = None) -> None:
+        self.entries = {} if entries is None else entries
+
+    @override
+    def __str__(self) -> str:
+        return f"<map of {len(self.entries)}>"
@@ -0,0 +1,61 @@
+import math
+from collections import OrderedDict
+from collections.abc import Hashable, Sequence
+from dataclasses import dataclass
+
+from lox.rope import Rope
+
+
+@dataclass
+class MemoStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+def _key(argument: object) -> Hashable:
+    match argument:
+        case Rope():
+            return str, argument.flatten()
+        case float():
+            # `0.0 == -0.0`, but `1 / x` tells them apart.
+            return float, argument, math.copysign(1.0, argument)
+    # `True == 1.0` in Python, but not in Lox, so the type is part of the key.
+    return type(argument), argument
+
+
+def memo_key(arguments: Sequence[object]) -> Hashable:
+    return tuple(map(_key, arguments))
+
+
+class MemoCache:
+    """A least recently used cache of return values, keyed with `memo_key`."""
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._values: OrderedDict[Hashable, object] = OrderedDict()
+        self.stats = MemoStats()
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Drops the cached values, for a function that is no longer pure."""
+        self._values.clear()
+        self.enabled = False
+
+    def get(self, key: Hashable) -> tuple[bool, object]:
+        if key not in self._values:
+            self.stats.misses += 1
+            return False, None
+        self.stats.hits += 1
+        self._values.move_to_end(key)
+        return True, self._values[key]
+
+    def put(self, key: Hashable, value: object) -> None:
+        self._values[key] = value
+        self._values.move_to_end(key)
+        if len(self._values) > self._max_size:
+            self._values.popitem(last=False)
+            self.stats.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._values)
@@ -0,0 +1,290 @@
+import math
+from array import array
+from collections.abc import Hashable, Mapping, Sequence
+from itertools import count, repeat
+from typing import TYPE_CHECKING, override
+
+from lox.array import LoxArray
+from lox.callable import LoxCallable
+from lox.equality import from_key, lox_key
+from lox.map import LoxMap
+from lox.rope import Rope
+from lox.runtime_error import LoxNativeErr
+
+if TYPE_CHECKING:
+    from lox.interpret import Interpreter
+
+
+def _array(value: object) -> "array[float]":
+    if not isinstance(value, LoxArray):
+        raise LoxNativeErr("Operand must be an array.")
+    return value.values
+
+
+def _map(value: object) -> dict[Hashable, object]:
+    if not isinstance(value, LoxMap):
+        raise LoxNativeErr("Operand must be a map.")
+    return value.entries
+
+
+def _number(value: object) -> float:
+    if not isinstance(value, float):
+        raise LoxNativeErr("Operand must be a number.")
+    return value
+
+
+def _size(value: object) -> int:
+    size = _number(value)
+    if size < 0 or not size.is_integer():
+        raise LoxNativeErr("Size must be a non-negative integer.")
+    return int(size)
+
+
+def _index(values: "array[float]", value: object) -> int:
+    index = _number(value)
+    if not index.is_integer() or not 0 <= index < len(values):
+        raise LoxNativeErr("Array index out of range.")
+    return int(index)
+
+
+def _same_length(left: "array[float]", right: "array[float]") -> None:
+    if len(left) != len(right):
+        raise LoxNativeErr("Arrays must have the same length.")
+
+
+class _Native(LoxCallable):
+    @override
+    def __str__(self) -> str:
+        return "<native fun>"
+
+
+class ArrayNew(_Native):
+    @property
+    @override
+    def arity(self) -> int:
+        return 1
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        size = _size(arguments[0])
+        interpreter.allocate(size)
+        return LoxArray(array("d", [0.0]) * size)
+
+
+class Get(_Native):
+    @property
+    @override
+    def arity(self) -> int:
+        return 2
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        if isinstance(arguments[0], LoxMap):
+            return arguments[0].entries.get(lox_key(arguments[1]))
+        values = _array(arguments[0])
+        return values[_index(values, arguments[1])]
+
+
+class Set(_Native):
+    @property
+    @override
+    def arity(self) -> int:
+        return 3
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        if isinstance(arguments[0], LoxMap):
+            interpreter.allocate(1)
+            arguments[0].entries[lox_key(arguments[1])] = arguments[2]
+            return arguments[2]
+        values = _array(arguments[0])
+        value = _number(arguments[2])
+        values[_index(values, arguments[1])] = value
+        return value
+
+
+class Len(_Native):
+    @property
+    @override
+    def arity(self) -> int:
+        return 1
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        match arguments[0]:
+            case LoxArray(values=values):
+                return float(len(values))
+            case str() | Rope() as string:
+                return float(len(string))
+        raise LoxNativeErr("Operand must be an array or a string.")
+
+
+class Sum(_Native):
+    @property
+    @override
+    def arity(self) -> int:
+        return 1
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        return float(sum(_array(arguments[0])))
+
+
+class Dot(_Native):
+    @property
+    @override
+    def arity(self) -> int:
+        return 2
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        left, right = _array(arguments[0]), _array(arguments[1])
+        _same_length(left, right)
+        return math.sumprod(left, right)
+
+
+class Scale(_Native):
+    @property
+    @override
+    def arity(self) -> int:
+        return 2
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        values, factor = _array(arguments[0]), _number(arguments[1])
+        interpreter.allocate(len(values))
+        return LoxArray(array("d", map(float.__mul__, values, repeat(factor))))
+
+
+class Add(_Native):
+    @property
+    @override
+    def arity(self) -> int:
+        return 2
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        left, right = _array(arguments[0]), _array(arguments[1])
+        _same_length(left, right)
+        interpreter.allocate(len(left))
+        return LoxArray(array("d", map(float.__add__, left, right)))
+
+
+class Sort(_Native):
+    @property
+    @override
+    def arity(self) -> int:
+        return 1
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        values = _array(arguments[0])
+        interpreter.allocate(len(values))
+        return LoxArray(array("d", sorted(values)))
+
+
+class MapNew(_Native):
+    @property
+    @override
+    def arity(self) -> int:
+        return 0
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        return LoxMap()
+
+
+class Has(_Native):
+    @property
+    @override
+    def arity(self) -> int:
+        return 2
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        return lox_key(arguments[1]) in _map(arguments[0])
+
+
+class Keys(_Native):
+    """Returns the keys as a map from their insertion index to the key."""
+
+    @property
+    @override
+    def arity(self) -> int:
+        return 1
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        entries = _map(arguments[0])
+        interpreter.allocate(len(entries))
+        keys = map(from_key, entries)
+        return LoxMap(dict(zip(map(float, count()), keys, strict=False)))
+
+
+class Size(_Native):
+    @property
+    @override
+    def arity(self) -> int:
+        return 1
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        return float(len(_map(arguments[0])))
+
+
+class Merge(_Native):
+    """Returns a new map with the entries of both maps; the second one wins."""
+
+    @property
+    @override
+    def arity(self) -> int:
+        return 2
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        merged = _map(arguments[0]) | _map(arguments[1])
+        interpreter.allocate(len(merged))
+        return LoxMap(merged)
+
+
+class HeapStats(_Native):
+    """Returns a map from each kind of value to a map of its "count" and "bytes".
+
+    Counts the values reachable from the caller, see `lox.heap`.
+    """
+
+    @property
+    @override
+    def arity(self) -> int:
+        return 0
+
+    @override
+    def call(self, interpreter: "Interpreter", arguments: Sequence[object]) -> object:
+        from lox.heap import walk
+
+        totals = walk(interpreter).by_kind()
+        interpreter.allocate(3 * len(totals))
+        stats: dict[Hashable, object] = {
+            kind: LoxMap({"count": float(usage.count), "bytes": float(usage.bytes)})
+            for kind, usage in totals.items()
+        }
+        return LoxMap(stats)
+
+
+NATIVES: Mapping[str, LoxCallable] = {
+    "array": ArrayNew(),
+    "get": Get(),
+    "set": Set(),
+    "len": Len(),
+    "sum": Sum(),
+    "dot": Dot(),
+    "scale": Scale(),
+    "add": Add(),
+    "sort": Sort(),
+    "map": MapNew(),
+    "has": Has(),
+    "keys": Keys(),
+    "size": Size(),
+    "merge": Merge(),
+    "heapStats": HeapStats(),
+}
@@ -0,0 +1,379 @@
+import itertools
+from collections.abc import Callable, Iterator, Sequence
+from typing import final, override
+
+from lox.ast import (
+    Assign,
+    Binary,
+    Block,
+    Call,
+    Expr,
+    Expression,
+    Function,
+    Grouping,
+    If,
+    Literal,
+    Logical,
+    Print,
+    Return,
+    Stmt,
+    Unary,
+    Var,
+    Variable,
+    VisitorExpr,
+    VisitorStmt,
+    While,
+)
+from lox.scanner import Token, TokenType
+
+type Program = Sequence[Expr | Stmt]
+type Pass = Callable[[Program], Program]
+
+# Temporaries use a name the scanner can never produce, so they can't clash with
+# user variables.
+_TEMPORARY_PREFIX = "$licm"
+
+
+@final
+class _Reads(VisitorExpr[None]):
+    """Collects the variables an expression reads and whether it is pure."""
+
+    def __init__(self) -> None:
+        self.names: set[str] = set()
+        self.pure = True
+
+    @override
+    def visit_binary_expr(self, expr: Binary) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    @override
+    def visit_call_expr(self, expr: Call) -> None:
+        self.pure = False
+
+    @override
+    def visit_assign_expr(self, expr: Assign) -> None:
+        self.pure = False
+
+    @override
+    def visit_grouping_expr(self, expr: Grouping) -> None:
+        expr.expression.accept(self)
+
+    @override
+    def visit_literal_expr(self, expr: Literal) -> None:
+        pass
+
+    @override
+    def visit_logical_expr(self, expr: Logical) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    @override
+    def visit_unary_expr(self, expr: Unary) -> None:
+        expr.right.accept(self)
+
+    @override
+    def visit_variable_expr(self, expr: Variable) -> None:
+        self.names.add(expr.name.lexeme)
+
+
+@final
+class _Writes(VisitorExpr[None], VisitorStmt[None]):
+    """Collects the variables a loop may assign or shadow and whether it calls.
+
+    Function bodies are skipped: they only run through a call, and any call makes
+    every variable a possible target.
+    """
+
+    def __init__(self) -> None:
+        self.names: set[str] = set()
+        self.calls = False
+
+    @override
+    def visit_binary_expr(self, expr: Binary) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    @override
+    def visit_call_expr(self, expr: Call) -> None:
+        self.calls = True
+        expr.callee.accept(self)
+        for argument in expr.arguments:
+            argument.accept(self)
+
+    @override
+    def visit_assign_expr(self, expr: Assign) -> None:
+        self.names.add(expr.name.lexeme)
+        expr.value.accept(self)
+
+    @override
+    def visit_grouping_expr(self, expr: Grouping) -> None:
+        expr.expression.accept(self)
+
+    @override
+    def visit_literal_expr(self, expr: Literal) -> None:
+        pass
+
+    @override
+    def visit_logical_expr(self, expr: Logical) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    @override
+    def visit_unary_expr(self, expr: Unary) -> None:
+        expr.right.accept(self)
+
+    @override
+    def visit_variable_expr(self, expr: Variable) -> None:
+        pass
+
+    @override
+    def visit_expression_stmt(self, expr: Expression) -> None:
+        expr.expression.accept(self)
+
+    @override
+    def visit_function_stmt(self, expr: Function) -> None:
+        self.names.add(expr.name.lexeme)
+
+    @override
+    def visit_if_stmt(self, expr: If) -> None:
+        expr.condition.accept(self)
+        expr.then_branch.accept(self)
+        if expr.else_branch is not None:
+            expr.else_branch.accept(self)
+
+    @override
+    def visit_while_stmt(self, expr: While) -> None:
+        expr.condition.accept(self)
+        expr.body.accept(self)
+
+    @override
+    def visit_block_stmt(self, expr: Block) -> None:
+        for statement in expr.statements:
+            statement.accept(self)
+
+    @override
+    def visit_print_stmt(self, expr: Print) -> None:
+        expr.expression.accept(self)
+
+    @override
+    def visit_return_stmt(self, expr: Return) -> None:
+        if expr.value is not None:
+            expr.value.accept(self)
+
+    @override
+    def visit_var_stmt(self, expr: Var) -> None:
+        self.names.add(expr.name.lexeme)
+        expr.initializer.accept(self)
+
+
+@final
+class _Hoist(VisitorExpr[Expr], VisitorStmt[Stmt]):
+    """Replaces loop invariant subexpressions of one loop with cached temporaries.
+
+    A hoisted expression `e` becomes `$t or ($t = e)`, where `$t` is declared as nil
+    right before the loop. `e` is still evaluated at its first use, so a loop that
+    never runs or an expression that fails behaves exactly as before. Values that
+    are falsey are simply recomputed, which is correct since `e` is pure.
+    """
+
+    def __init__(self, writes: _Writes, names: Iterator[str], line: int) -> None:
+        self._writes = writes
+        self._names = names
+        self._line = line
+        self.temporaries: list[Var] = []
+
+    def _invariant(self, expr: Expr) -> bool:
+        reads = _Reads()
+        expr.accept(reads)
+        if not reads.pure:
+            return False
+        if reads.names and self._writes.calls:
+            return False
+        return self._writes.names.isdisjoint(reads.names)
+
+    def _cached(self, expr: Expr) -> Expr:
+        if isinstance(expr, Literal | Variable):
+            return expr
+        if isinstance(expr, Grouping) and isinstance(
+            expr.expression, Literal | Variable
+        ):
+            return expr
+        if not self._invariant(expr):
+            return expr.accept(self)
+        name = Token(TokenType.IDENTIFIER, next(self._names), None, self._line)
+        self.temporaries.append(Var(name, Literal(None)))
+        return Logical(
+            Variable(name),
+            Token(TokenType.OR, "or", None, self._line),
+            Assign(name, expr),
+        )
+
+    @override
+    def visit_binary_expr(self, expr: Binary) -> Expr:
+        return Binary(self._cached(expr.left), expr.operator, self._cached(expr.right))
+
+    @override
+    def visit_call_expr(self, expr: Call) -> Expr:
+        return Call(
+            self._cached(expr.callee),
+            expr.paren,
+            [self._cached(argument) for argument in expr.arguments],
+        )
+
+    @override
+    def visit_assign_expr(self, expr: Assign) -> Expr:
+        if expr.name.lexeme.startswith(_TEMPORARY_PREFIX):
+            return expr
+        return Assign(expr.name, self._cached(expr.value))
+
+    @override
+    def visit_grouping_expr(self, expr: Grouping) -> Expr:
+        return Grouping(self._cached(expr.expression))
+
+    @override
+    def visit_literal_expr(self, expr: Literal) -> Expr:
+        return expr
+
+    @override
+    def visit_logical_expr(self, expr: Logical) -> Expr:
+        return Logical(self._cached(expr.left), expr.operator, self._cached(expr.right))
+
+    @override
+    def visit_unary_expr(self, expr: Unary) -> Expr:
+        return Unary(expr.operator, self._cached(expr.right))
+
+    @override
+    def visit_variable_expr(self, expr: Variable) -> Expr:
+        return expr
+
+    @override
+    def visit_expression_stmt(self, expr: Expression) -> Stmt:
+        return Expression(self._cached(expr.expression))
+
+    @override
+    def visit_function_stmt(self, expr: Function) -> Stmt:
+        return expr
+
+    @override
+    def visit_if_stmt(self, expr: If) -> Stmt:
+        return If(
+            self._cached(expr.condition),
+            expr.then_branch.accept(self),
+            None if expr.else_branch is None else expr.else_branch.accept(self),
+        )
+
+    @override
+    def visit_while_stmt(self, expr: While) -> Stmt:
+        return While(expr.keyword, self._cached(expr.condition), expr.body.accept(self))
+
+    @override
+    def visit_block_stmt(self, expr: Block) -> Stmt:
+        return Block([statement.accept(self) for statement in expr.statements])
+
+    @override
+    def visit_print_stmt(self, expr: Print) -> Stmt:
+        return Print(self._cached(expr.expression))
+
+    @override
+    def visit_return_stmt(self, expr: Return) -> Stmt:
+        if expr.value is None:
+            return expr
+        return Return(expr.keyword, self._cached(expr.value))
+
+    @override
+    def visit_var_stmt(self, expr: Var) -> Stmt:
+        return Var(expr.name, self._cached(expr.initializer))
+
+
+@final
+class _LoopInvariantCodeMotion(VisitorStmt[Stmt]):
+    def __init__(self) -> None:
+        self._names = (f"{_TEMPORARY_PREFIX}{i}" for i in itertools.count())
+
+    def statements(self, statements: Sequence[Stmt]) -> list[Stmt]:
+        result: list[Stmt] = []
+        for statement in statements:
+            if isinstance(statement, While):
+                result.extend(self._loop(statement))
+            else:
+                result.append(statement.accept(self))
+        return result
+
+    def _loop(self, loop: While) -> list[Stmt]:
+        writes = _Writes()
+        loop.accept(writes)
+        hoist = _Hoist(writes, self._names, loop.keyword.line)
+        hoisted = loop.accept(hoist)
+        assert isinstance(hoisted, While)
+        # Loops nested in the body only see what this loop left behind.
+        return [
+            *hoist.temporaries,
+            While(hoisted.keyword, hoisted.condition, hoisted.body.accept(self)),
+        ]
+
+    @override
+    def visit_expression_stmt(self, expr: Expression) -> Stmt:
+        return expr
+
+    @override
+    def visit_function_stmt(self, expr: Function) -> Stmt:
+        return Function(expr.name, expr.params, self.statements(expr.body))
+
+    @override
+    def visit_if_stmt(self, expr: If) -> Stmt:
+        return If(
+            expr.condition,
+            expr.then_branch.accept(self),
+            None if expr.else_branch is None else expr.else_branch.accept(self),
+        )
+
+    @override
+    def visit_while_stmt(self, expr: While) -> Stmt:
+        statements = self._loop(expr)
+        if len(statements) == 1:
+            return statements[0]
+        return Block(statements)
+
+    @override
+    def visit_block_stmt(self, expr: Block) -> Stmt:
+        return Block(self.statements(expr.statements))
+
+    @override
+    def visit_print_stmt(self, expr: Print) -> Stmt:
+        return expr
+
+    @override
+    def visit_return_stmt(self, expr: Return) -> Stmt:
+        return expr
+
+    @override
+    def visit_var_stmt(self, expr: Var) -> Stmt:
+        return expr
+
+
+def loop_invariant_code_motion(program: Program) -> Program:
+    motion = _LoopInvariantCodeMotion()
+    result: list[Expr | Stmt] = []
+    for node in program:
+        if isinstance(node, Stmt):
+            # Top-level loops get a block, so temporaries are not globals.
+            result.append(node.accept(motion))
+        else:
+            result.append(node)
+    return result
+
+
+PASSES: Sequence[Sequence[Pass]] = (
+    (),
+    (loop_invariant_code_motion,),
+)
+
+MAX_OPT_LEVEL = len(PASSES) - 1
+
+
+def optimize(program: Program, level: int) -> Program:
+    for passes in PASSES[: level + 1]:
+        for pass_ in passes:
+            program = pass_(program)
+    return program
@@ -0,0 +1,85 @@
+import sys
+import time
+from collections.abc import Sequence
+from typing import Protocol, TextIO
+
+
+class Output(Protocol):
+    def write(self, text: str) -> None: ...
+    def flush(self) -> None: ...
+
+
+class BufferedOutput:
+    """Collects writes and hands them to `stream` in large chunks.
+
+    The buffer is flushed once it holds `max_chars` characters, on the first write
+    `max_delay` seconds after the previous flush, and whenever `flush` is called.
+    The interpreter also calls `poll` periodically, see `Meter`, so that a line
+    printed before a long computation doesn't wait for the next write.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        max_chars: int = 1 << 16,
+        max_delay: float = 0.1,
+    ) -> None:
+        self._stream = sys.stdout if stream is None else stream
+        self._max_chars = max_chars
+        self._max_delay = max_delay
+        self._parts: list[str] = []
+        self._size = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+        self._size += len(text)
+        if (
+            self._size >= self._max_chars
+            or time.monotonic() - self._last_flush >= self._max_delay
+        ):
+            self.flush()
+
+    def poll(self) -> None:
+        """Flushes the buffer if it has waited for `max_delay` seconds."""
+        if self._parts and time.monotonic() - self._last_flush >= self._max_delay:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._parts:
+            self._stream.write("".join(self._parts))
+            self._parts.clear()
+            self._size = 0
+        self._stream.flush()
+        self._last_flush = time.monotonic()
+
+
+class UnbufferedOutput:
+    def __init__(self, stream: TextIO | None = None) -> None:
+        self._stream = sys.stdout if stream is None else stream
+
+    def write(self, text: str) -> None:
+        self._stream.write(text)
+        self._stream.flush()
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+
+class CaptureOutput:
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+
+    def flush(self) -> None:
+        pass
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    @property
+    def lines(self) -> Sequence[str]:
+        return self.text.splitlines()
@@ -14,6 +14,7 @@ from lox.ast import (
     Literal,
     Logical,
     Print,
+    Return,
     Stmt,
     Unary,
     Var,
@@ -37,6 +38,7 @@ class Parser:
         self._reporter = reporter
         self._tokens = tokens
         self._current = 0
+        self._function_depth = 0
 
     def expression(self) -> Expr:
         return self.comma()
@@ -126,10 +128,11 @@ class Parser:
         assert left.type_ == TokenType.LEFT_PAREN
         if self.peek() == TokenType.RIGHT_PAREN:
             return Call(callee, self.consume(), [])
-        arguments = [self.expression()]
+        # Arguments bind tighter than the comma operator.
+        arguments = [self.assignment()]
         while self.peek() == TokenType.COMMA:
             self.consume()
-            arguments.append(self.expression())
+            arguments.append(self.assignment())
         right = self.consume()
         if len(arguments) >= 255:
             self._error(right, "Can't have more than 255 arguments.")
@@ -185,6 +188,16 @@ class Parser:
                 return None
         return declarations
 
+    def parse_expression(self) -> Expr | None:
+        """Parses a source that holds a single expression, without a semicolon."""
+        try:
+            expr = self.expression()
+            if self.peek() != TokenType.EOF:
+                raise self._error(self.consume(), "Expect end of expression.")
+        except ParserError:
+            return None
+        return expr
+
     def find_errors(self) -> None:
         while self.peek() != TokenType.EOF:
             self.declaration()
@@ -211,6 +224,8 @@ class Parser:
             return self.while_stmt()
         if self.peek() == TokenType.FOR:
             return self.for_stmt()
+        if self.peek() == TokenType.RETURN:
+            return self.return_stmt()
         return self.expr_stmt()
 
     def fun_stmt(self, kind: str) -> Function:
@@ -237,7 +252,11 @@ class Parser:
         right = self.consume()
         if right.type_ != TokenType.RIGHT_PAREN:
             raise self._error(name, "Expect ')' after parameters.")
-        body = self.block_stmt()
+        self._function_depth += 1
+        try:
+            body = self.block_stmt()
+        finally:
+            self._function_depth -= 1
         return Function(name, params, body.statements)
 
     def for_stmt(self) -> While | Block:
@@ -269,7 +288,7 @@ class Parser:
         body = self.stmt()
         if increment is not None:
             body = Block(statements=[body, Expression(increment)])
-        while_ = While(condition, body)
+        while_ = While(for_, condition, body)
         if initializer is not None:
             return Block(statements=[initializer, while_])
         return while_
@@ -284,7 +303,7 @@ class Parser:
         right = self.consume()
         if right.type_ != TokenType.RIGHT_PAREN:
             raise self._error(right, "Expect ')' after condition.")
-        return While(expr, self.stmt())
+        return While(while_, expr, self.stmt())
 
     def if_stmt(self) -> If:
         if_ = self.consume()
@@ -332,6 +351,17 @@ class Parser:
 
         return Print(expression)
 
+    def return_stmt(self) -> Return:
+        keyword = self.consume()
+        assert keyword.type_ == TokenType.RETURN
+        if self._function_depth == 0:
+            self._error(keyword, "Can't return from top-level code.")
+        value = None if self.peek() == TokenType.SEMICOLON else self.expression()
+        semicolon = self.consume()
+        if semicolon.type_ != TokenType.SEMICOLON:
+            raise self._error(semicolon, message="Expect ';' after return value.")
+        return Return(keyword, value)
+
     def var_stmt(self) -> Var:
         var = self.consume()
         assert var.type_ == TokenType.VAR
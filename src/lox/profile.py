@@ -0,0 +1,273 @@
+import signal
+import sys
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from types import CodeType, FrameType, TracebackType
+from typing import Protocol, Self, TextIO
+
+from lox.ast import (
+    Assign,
+    Binary,
+    Call,
+    Expr,
+    Function,
+    Logical,
+    Return,
+    Stmt,
+    Unary,
+    Var,
+    Variable,
+    While,
+)
+from lox.interpret import Interpreter, LoxFunction
+
+ROOT = "<script>"
+
+_CALL = LoxFunction.call.__code__
+_VISITS: frozenset[CodeType] = frozenset(
+    value.__code__  # type: ignore[misc]
+    for name, value in vars(Interpreter).items()  # type: ignore[misc]
+    if name.startswith("visit_")
+)
+
+
+def node_line(node: Expr | Stmt) -> int | None:
+    """The source line of a node, for those nodes that keep a token."""
+    match node:
+        case Binary(operator=token) | Logical(operator=token) | Unary(operator=token):
+            return token.line
+        case Call(paren=token):
+            return token.line
+        case Assign(name=token) | Variable(name=token) | Var(name=token):
+            return token.line
+        case Function(name=token):
+            return token.line
+        case Return(keyword=token) | While(keyword=token):
+            return token.line
+    return None
+
+
+def function_name(function: LoxFunction) -> str:
+    name = function.declaration.name
+    return f"{name.lexeme}:{name.line}"
+
+
+@dataclass
+class FunctionStats:
+    calls: int = 0
+    self_ns: int = 0
+    total_ns: int = 0
+
+
+def _self_time(item: tuple[str, FunctionStats]) -> int:
+    return item[1].self_ns
+
+
+class Profile:
+    """Time spent per Lox function, per source line and per call stack.
+
+    Stacks start at `ROOT` and list `name:line` of each active function, outermost
+    first. A sampled profile has no call counts.
+    """
+
+    def __init__(self, sampled: bool) -> None:
+        self.sampled = sampled
+        self.functions: defaultdict[str, FunctionStats] = defaultdict(FunctionStats)
+        self.lines: Counter[int] = Counter()
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+
+    @property
+    def total_ns(self) -> int:
+        return self.stacks.total()
+
+    def add(self, stack: tuple[str, ...], line: int | None, elapsed: int) -> None:
+        self.stacks[stack] += elapsed
+        self.functions[stack[-1]].self_ns += elapsed
+        if line is not None:
+            self.lines[line] += elapsed
+
+    def report(self, file: TextIO, limit: int = 20) -> None:
+        total = max(self.total_ns, 1)
+        kind = "sampled" if self.sampled else "deterministic"
+        print(f"profile ({kind}): {total / 1e9:.3f}s", file=file)
+        print(
+            f"{'function':<24} {'calls':>8} {'self':>9} {'total':>9} {'self%':>6}",
+            file=file,
+        )
+        ranked = sorted(self.functions.items(), key=_self_time, reverse=True)
+        for name, stats in ranked[:limit]:
+            calls = "-" if self.sampled else str(stats.calls)
+            print(
+                f"{name:<24} {calls:>8} {stats.self_ns / 1e9:>8.3f}s "
+                f"{stats.total_ns / 1e9:>8.3f}s {100 * stats.self_ns / total:>5.1f}%",
+                file=file,
+            )
+        print(f"{'line':<24} {'':>8} {'self':>9} {'':>9} {'self%':>6}", file=file)
+        for line, elapsed in self.lines.most_common(limit):
+            print(
+                f"{line:<24} {'':>8} {elapsed / 1e9:>8.3f}s {'':>9} "
+                f"{100 * elapsed / total:>5.1f}%",
+                file=file,
+            )
+
+    def write_collapsed(self, file: TextIO) -> None:
+        """Writes stacks in the collapsed format of flamegraph.pl, in microseconds."""
+        for stack, elapsed in sorted(self.stacks.items()):
+            if elapsed >= 1000:
+                file.write(f"{';'.join(stack)} {elapsed // 1000}\n")
+
+
+class Profiler(Protocol):
+    @property
+    def profile(self) -> Profile: ...
+    def __enter__(self) -> Self: ...
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None: ...
+
+
+class DeterministicProfiler:
+    """Measures every Lox call with `sys.monitoring`.
+
+    Events are only enabled for `LoxFunction.call` and the interpreter's visit
+    methods. Each interval between two events is charged to the innermost Lox
+    function and to the line of the last node with a token the interpreter
+    visited. Time spent in the callbacks is left out of the profile, but they
+    still slow the interpreter down several times.
+    """
+
+    _TOOL = sys.monitoring.PROFILER_ID
+
+    def __init__(self) -> None:
+        self._profile = Profile(sampled=False)
+        self._stack: tuple[str, ...] = (ROOT,)
+        self._frames: list[tuple[int, int | None]] = []
+        self._line: int | None = None
+        # Profiled time so far, which excludes the callbacks.
+        self._clock = 0
+        self._last = 0
+
+    @property
+    def profile(self) -> Profile:
+        return self._profile
+
+    def __enter__(self) -> Self:
+        events = sys.monitoring.events
+        sys.monitoring.use_tool_id(self._TOOL, "lox")
+        sys.monitoring.register_callback(self._TOOL, events.PY_START, self._start)
+        sys.monitoring.register_callback(self._TOOL, events.PY_RETURN, self._return)
+        sys.monitoring.set_local_events(
+            self._TOOL, _CALL, events.PY_START | events.PY_RETURN
+        )
+        for code in _VISITS:
+            sys.monitoring.set_local_events(self._TOOL, code, events.PY_START)
+        self._last = time.perf_counter_ns()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._charge()
+        for code in (_CALL, *_VISITS):
+            sys.monitoring.set_local_events(self._TOOL, code, 0)
+        sys.monitoring.register_callback(
+            self._TOOL, sys.monitoring.events.PY_START, None
+        )
+        sys.monitoring.register_callback(
+            self._TOOL, sys.monitoring.events.PY_RETURN, None
+        )
+        sys.monitoring.free_tool_id(self._TOOL)
+        root = self._profile.functions[ROOT]
+        root.calls += 1
+        root.total_ns += self._clock
+
+    def _charge(self) -> None:
+        elapsed = time.perf_counter_ns() - self._last
+        self._clock += elapsed
+        self._profile.add(self._stack, self._line, elapsed)
+
+    def _start(self, code: CodeType, _: int) -> None:
+        self._charge()
+        frame = sys._getframe(1)
+        if code is _CALL:
+            function: LoxFunction = frame.f_locals["self"]  # type: ignore[misc]
+            self._frames.append((self._clock, self._line))
+            self._stack += (function_name(function),)
+            self._profile.functions[self._stack[-1]].calls += 1
+        else:
+            node: Expr | Stmt = frame.f_locals["expr"]  # type: ignore[misc]
+            self._line = node_line(node) or self._line
+        self._last = time.perf_counter_ns()
+
+    def _return(self, code: CodeType, _: int, __: object) -> None:
+        self._charge()
+        if self._frames:
+            entered, self._line = self._frames.pop()
+            name = self._stack[-1]
+            self._stack = self._stack[:-1]
+            # Recursive calls are already covered by the outermost one.
+            if name not in self._stack:
+                self._profile.functions[name].total_ns += self._clock - entered
+        self._last = time.perf_counter_ns()
+
+
+class SamplingProfiler:
+    """Samples the Lox call stack on every `interval` seconds of CPU time.
+
+    A `SIGPROF` timer interrupts the interpreter, which then walks the Python
+    frames for Lox calls and visited nodes. Only available on Unix, and only for
+    the main thread.
+    """
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self._profile = Profile(sampled=True)
+        self._interval = interval
+        self._weight = int(interval * 1e9)
+
+    @property
+    def profile(self) -> Profile:
+        return self._profile
+
+    def __enter__(self) -> Self:
+        signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self._interval, self._interval)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, signal.SIG_DFL)
+
+    def _sample(self, _: int, frame: FrameType | None) -> None:
+        functions: list[str] = []
+        line: int | None = None
+        while frame is not None:
+            code = frame.f_code
+            if code is _CALL:
+                function: LoxFunction = frame.f_locals["self"]  # type: ignore[misc]
+                functions.append(function_name(function))
+            elif line is None and not functions and code in _VISITS:
+                node: Expr | Stmt = frame.f_locals["expr"]  # type: ignore[misc]
+                line = node_line(node)
+            frame = frame.f_back
+        stack = (ROOT, *reversed(functions))
+        self._profile.add(stack, line, self._weight)
+        for name in set(stack):
+            self._profile.functions[name].total_ns += self._weight
+
+
+PROFILERS: dict[str, type[DeterministicProfiler] | type[SamplingProfiler]] = {
+    "deterministic": DeterministicProfiler,
+    "sampling": SamplingProfiler,
+}
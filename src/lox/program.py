@@ -0,0 +1,138 @@
+"""Compile Lox once and run it many times, for embedding Lox in Python.
+
+    program = lox.compile("var allowed = age >= 18;")
+    variables = {"age": 21}
+    program.run(variables)
+    assert variables["allowed"] is True
+
+Errors are raised as `CompileError` and `RunError`, which hold `Diagnostic`s
+instead of printing them.
+"""
+
+from collections.abc import MutableMapping, Sequence
+from dataclasses import dataclass
+from typing import override
+
+from lox.ast import Expr, Stmt
+from lox.interpret import Interpreter
+from lox.limits import Limits
+from lox.optimize import optimize
+from lox.output import Output
+from lox.parser import Parser
+from lox.rope import Rope
+from lox.runtime_error import LoxRuntimeErr
+from lox.scanner import Scanner, Token, TokenType
+
+
+@dataclass(frozen=True)
+class Diagnostic:
+    line: int
+    message: str
+    # Where on the line, like " at 'x'" or " at end", or empty.
+    where: str = ""
+
+    @override
+    def __str__(self) -> str:
+        return f"[line {self.line}] Error{self.where}: {self.message}"
+
+
+class LoxError(Exception):
+    def __init__(self, diagnostics: Sequence[Diagnostic]) -> None:
+        super().__init__("\n".join(map(str, diagnostics)))
+        self.diagnostics = diagnostics
+
+
+class CompileError(LoxError):
+    """The source has syntax errors, one diagnostic for each."""
+
+
+class RunError(LoxError):
+    """The program stopped with a runtime error, its only diagnostic."""
+
+
+class _Collector:
+    def __init__(self) -> None:
+        self.diagnostics: list[Diagnostic] = []
+
+    def error(self, line: int, message: str) -> None:
+        self.diagnostics.append(Diagnostic(line, message))
+
+    def parser_error(self, token: Token, message: str) -> None:
+        where = " at end" if token.type_ == TokenType.EOF else f" at '{token.lexeme}'"
+        self.diagnostics.append(Diagnostic(token.line, message, where))
+
+    def runtime_error(self, err: LoxRuntimeErr) -> None:
+        self.diagnostics.append(Diagnostic(err.token.line, err.message))
+
+
+def to_lox(value: object) -> object:
+    # Lox numbers are floats, but Python callers mostly have ints.
+    if isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def to_python(value: object) -> object:
+    return value.flatten() if isinstance(value, Rope) else value
+
+
+class Program:
+    """A parsed and optimized script, see `compile`. Programs are immutable."""
+
+    def __init__(self, statements: Sequence[Expr | Stmt]) -> None:
+        self._statements = statements
+
+    def run(
+        self,
+        variables: MutableMapping[str, object] | None = None,
+        output: Output | None = None,
+        limits: Limits | None = None,
+    ) -> None:
+        """Runs the program in a fresh interpreter.
+
+        `variables` are defined as globals first. Afterwards, every global the
+        program defined or assigned is written back to `variables`, so passing
+        the same mapping to several runs shares state between them, functions
+        included. Strings are written back as `str`, and whole numbers as `int`
+        where the variable held an `int`.
+        """
+        interpreter = Interpreter(output, limits=limits)
+        globals_ = interpreter.globals.variables
+        before = dict(globals_)
+        if variables is not None:
+            for name, value in variables.items():
+                before[name] = to_lox(value)
+                interpreter.define(name, before[name])
+        collector = _Collector()
+        interpreter.interpret(collector, self._statements)
+        if variables is not None:
+            for name, value in globals_.items():
+                if before.get(name) is value:
+                    continue
+                was_int = type(variables.get(name)) is int
+                if was_int and isinstance(value, float) and value.is_integer():
+                    variables[name] = int(value)
+                else:
+                    variables[name] = to_python(value)
+        if collector.diagnostics:
+            raise RunError(collector.diagnostics)
+
+
+def parse_expression(source: str) -> Expr:
+    """Scans and parses a single expression, like `price * qty > 100`."""
+    collector = _Collector()
+    tokens = Scanner(collector, source).scan_tokens()
+    expr = Parser(collector, tokens).parse_expression()
+    if collector.diagnostics or expr is None:
+        raise CompileError(collector.diagnostics)
+    return expr
+
+
+def compile(source: str, opt_level: int = 0) -> Program:
+    """Scans, parses and optimizes `source`, see `optimize`."""
+    collector = _Collector()
+    tokens = Scanner(collector, source).scan_tokens()
+    statements = Parser(collector, tokens).parse()
+    if collector.diagnostics or statements is None:
+        raise CompileError(collector.diagnostics)
+    return Program(optimize(statements, opt_level))
@@ -0,0 +1,270 @@
+from collections import defaultdict
+from collections.abc import Sequence
+from typing import final, override
+
+from lox.ast import (
+    Assign,
+    Binary,
+    Block,
+    Call,
+    Expr,
+    Expression,
+    Function,
+    Grouping,
+    If,
+    Literal,
+    Logical,
+    Print,
+    Return,
+    Stmt,
+    Unary,
+    Var,
+    Variable,
+    VisitorExpr,
+    VisitorStmt,
+    While,
+)
+
+
+@final
+class _Declarations(VisitorExpr[None], VisitorStmt[None]):
+    """Collects every function, variable and assignment target in a program."""
+
+    def __init__(self) -> None:
+        self.functions: defaultdict[str, list[Function]] = defaultdict(list)
+        self.variables: set[str] = set()
+        self.assigned: set[str] = set()
+
+    @override
+    def visit_binary_expr(self, expr: Binary) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    @override
+    def visit_call_expr(self, expr: Call) -> None:
+        expr.callee.accept(self)
+        for argument in expr.arguments:
+            argument.accept(self)
+
+    @override
+    def visit_assign_expr(self, expr: Assign) -> None:
+        self.assigned.add(expr.name.lexeme)
+        expr.value.accept(self)
+
+    @override
+    def visit_grouping_expr(self, expr: Grouping) -> None:
+        expr.expression.accept(self)
+
+    @override
+    def visit_literal_expr(self, expr: Literal) -> None:
+        pass
+
+    @override
+    def visit_logical_expr(self, expr: Logical) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    @override
+    def visit_unary_expr(self, expr: Unary) -> None:
+        expr.right.accept(self)
+
+    @override
+    def visit_variable_expr(self, expr: Variable) -> None:
+        pass
+
+    @override
+    def visit_expression_stmt(self, expr: Expression) -> None:
+        expr.expression.accept(self)
+
+    @override
+    def visit_function_stmt(self, expr: Function) -> None:
+        self.functions[expr.name.lexeme].append(expr)
+        self.variables.update(param.lexeme for param in expr.params)
+        for statement in expr.body:
+            statement.accept(self)
+
+    @override
+    def visit_if_stmt(self, expr: If) -> None:
+        expr.condition.accept(self)
+        expr.then_branch.accept(self)
+        if expr.else_branch is not None:
+            expr.else_branch.accept(self)
+
+    @override
+    def visit_while_stmt(self, expr: While) -> None:
+        expr.condition.accept(self)
+        expr.body.accept(self)
+
+    @override
+    def visit_block_stmt(self, expr: Block) -> None:
+        for statement in expr.statements:
+            statement.accept(self)
+
+    @override
+    def visit_print_stmt(self, expr: Print) -> None:
+        expr.expression.accept(self)
+
+    @override
+    def visit_return_stmt(self, expr: Return) -> None:
+        if expr.value is not None:
+            expr.value.accept(self)
+
+    @override
+    def visit_var_stmt(self, expr: Var) -> None:
+        self.variables.add(expr.name.lexeme)
+        expr.initializer.accept(self)
+
+
+@final
+class _Effects(VisitorExpr[None], VisitorStmt[None]):
+    """Checks the body of one function, assuming the functions it calls are pure.
+
+    Besides printing and assigning non-local variables, reading a non-local
+    variable makes a function impure too, unless it names another function: a
+    memoized result must not depend on global state.
+    """
+
+    def __init__(self, declaration: Function) -> None:
+        self._scopes = [{param.lexeme for param in declaration.params}]
+        self.pure = True
+        self.globals: set[str] = set()
+
+    def _is_local(self, name: str) -> bool:
+        return any(name in scope for scope in self._scopes)
+
+    @override
+    def visit_binary_expr(self, expr: Binary) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    @override
+    def visit_call_expr(self, expr: Call) -> None:
+        if not isinstance(expr.callee, Variable) or self._is_local(
+            expr.callee.name.lexeme
+        ):
+            self.pure = False
+        expr.callee.accept(self)
+        for argument in expr.arguments:
+            argument.accept(self)
+
+    @override
+    def visit_assign_expr(self, expr: Assign) -> None:
+        if not self._is_local(expr.name.lexeme):
+            self.pure = False
+        expr.value.accept(self)
+
+    @override
+    def visit_grouping_expr(self, expr: Grouping) -> None:
+        expr.expression.accept(self)
+
+    @override
+    def visit_literal_expr(self, expr: Literal) -> None:
+        pass
+
+    @override
+    def visit_logical_expr(self, expr: Logical) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    @override
+    def visit_unary_expr(self, expr: Unary) -> None:
+        expr.right.accept(self)
+
+    @override
+    def visit_variable_expr(self, expr: Variable) -> None:
+        if not self._is_local(expr.name.lexeme):
+            self.globals.add(expr.name.lexeme)
+
+    @override
+    def visit_expression_stmt(self, expr: Expression) -> None:
+        expr.expression.accept(self)
+
+    @override
+    def visit_function_stmt(self, expr: Function) -> None:
+        self.pure = False
+
+    @override
+    def visit_if_stmt(self, expr: If) -> None:
+        expr.condition.accept(self)
+        expr.then_branch.accept(self)
+        if expr.else_branch is not None:
+            expr.else_branch.accept(self)
+
+    @override
+    def visit_while_stmt(self, expr: While) -> None:
+        expr.condition.accept(self)
+        expr.body.accept(self)
+
+    @override
+    def visit_block_stmt(self, expr: Block) -> None:
+        self._scopes.append(set())
+        try:
+            for statement in expr.statements:
+                statement.accept(self)
+        finally:
+            self._scopes.pop()
+
+    @override
+    def visit_print_stmt(self, expr: Print) -> None:
+        self.pure = False
+
+    @override
+    def visit_return_stmt(self, expr: Return) -> None:
+        if expr.value is not None:
+            expr.value.accept(self)
+
+    @override
+    def visit_var_stmt(self, expr: Var) -> None:
+        expr.initializer.accept(self)
+        self._scopes[-1].add(expr.name.lexeme)
+
+
+def declared_names(program: Sequence[Expr | Stmt]) -> set[str]:
+    """Returns every name `program` declares or assigns, in any scope."""
+    declarations = _Declarations()
+    for node in program:
+        node.accept(declarations)
+    return (
+        declarations.functions.keys() | declarations.variables | declarations.assigned
+    )
+
+
+def pure_functions(
+    program: Sequence[Expr | Stmt],
+) -> dict[int, tuple[Function, frozenset[str]]]:
+    """Returns the function declarations whose results may be memoized, by id.
+
+    Only functions with a unique name that is never assigned or reused for a
+    variable are considered, so a call by name always reaches the declaration that
+    was analyzed. Natives such as `clock` are never pure. Each declaration comes
+    with the global names it reads, the names of other pure functions: results
+    are only valid as long as those names keep their declarations.
+    """
+    declarations = _Declarations()
+    for node in program:
+        node.accept(declarations)
+    candidates: dict[str, Function] = {
+        name: functions[0]
+        for name, functions in declarations.functions.items()
+        if len(functions) == 1
+        and name not in declarations.variables
+        and name not in declarations.assigned
+    }
+    dependencies: dict[str, set[str]] = {}
+    for name, declaration in candidates.items():
+        effects = _Effects(declaration)
+        for statement in declaration.body:
+            statement.accept(effects)
+        if effects.pure:
+            dependencies[name] = effects.globals
+    changed = True
+    while changed:
+        changed = False
+        for name, globals_ in list(dependencies.items()):
+            if not globals_ <= dependencies.keys():
+                del dependencies[name]
+                changed = True
+    return {
+        id(candidates[name]): (candidates[name], frozenset(globals_))
+        for name, globals_ in dependencies.items()
+    }
@@ -1,3 +1,6 @@
+from lox.rope import Rope
+
+
 def render(value: object) -> str:
     if value is None:
         return "nil"
@@ -7,4 +10,6 @@ def render(value: object) -> str:
         return "false"
     if isinstance(value, float):
         return str(value).removesuffix(".0")
+    if isinstance(value, Rope):
+        return value.flatten()
     return str(value)
@@ -0,0 +1,63 @@
+from typing import Self, override
+
+# Below this size, plain `str` concatenation is cheaper than a `Rope`.
+_MIN_ROPE_LENGTH = 64
+
+
+class Rope:
+    """A string produced by concatenation, flattened lazily.
+
+    Ropes built by appending to the most recent rope share one buffer of parts, so
+    `s = s + line` in a loop is amortised O(len(line)) instead of O(len(s)).
+    """
+
+    __slots__ = ("_parts", "_count", "_length", "_flat")
+
+    def __init__(self, parts: list[str], count: int, length: int) -> None:
+        self._parts = parts
+        self._count = count
+        self._length = length
+        self._flat: str | None = None
+
+    def concat(self, other: "str | Rope") -> Self:
+        right = other if isinstance(other, str) else other.flatten()
+        if self._count == len(self._parts):
+            self._parts.append(right)
+            return type(self)(self._parts, self._count + 1, self._length + len(right))
+        return type(self)([self.flatten(), right], 2, self._length + len(right))
+
+    def flatten(self) -> str:
+        if self._flat is None:
+            self._flat = "".join(self._parts[: self._count])
+        return self._flat
+
+    def __len__(self) -> int:
+        return self._length
+
+    @override
+    def __str__(self) -> str:
+        return self.flatten()
+
+    @override
+    def __repr__(self) -> str:
+        return f"Rope({self.flatten()!r})"
+
+    @override
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Rope):
+            return self._length == other._length and self.flatten() == other.flatten()
+        if isinstance(other, str):
+            return self._length == len(other) and self.flatten() == other
+        return NotImplemented
+
+    @override
+    def __hash__(self) -> int:
+        return hash(self.flatten())
+
+
+def concat(left: str | Rope, right: str | Rope) -> str | Rope:
+    if isinstance(left, Rope):
+        return left.concat(right)
+    if isinstance(right, str) and len(left) + len(right) < _MIN_ROPE_LENGTH:
+        return left + right
+    return Rope([left], 1, len(left)).concat(right)
@@ -1,7 +1,11 @@
+from typing import override
+
 from lox.scanner import Token
 
 
 class LoxRuntimeErr(Exception):
+    __slots__ = ("_token", "_message")
+
     def __init__(self, token: Token, message: str) -> None:
         self._token = token
         self._message = message
@@ -13,3 +17,27 @@ class LoxRuntimeErr(Exception):
     @property
     def token(self) -> Token:
         return self._token
+
+
+class LoxLimitErr(LoxRuntimeErr):
+    """Raised when a script exceeds one of the interpreter's `Limits`."""
+
+
+class LoxNativeErr(Exception):
+    """Raised by natives, which don't know the call site; see `at`."""
+
+    def __init__(self, message: str) -> None:
+        self._message = message
+
+    @property
+    def message(self) -> str:
+        return self._message
+
+    def at(self, token: Token) -> LoxRuntimeErr:
+        return LoxRuntimeErr(token, self._message)
+
+
+class LoxNativeLimitErr(LoxNativeErr):
+    @override
+    def at(self, token: Token) -> LoxRuntimeErr:
+        return LoxLimitErr(token, self.message)
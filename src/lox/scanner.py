@@ -50,7 +50,7 @@ class TokenType(enum.Enum):
     EOF = enum.auto()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Token:
     type_: TokenType
     lexeme: str
@@ -0,0 +1,191 @@
+"""A daemon that runs Lox scripts for `lox client`, see `lox.client`.
+
+`lox serve` imports everything and warms up once, freezes the heap with
+`gc.freeze` and forks a pool of workers that accept connections on one Unix
+domain socket. Since the collector never touches the frozen objects, the
+workers share them with the server copy-on-write. Each worker caches compiled
+programs by path and modification time. Output is sent as it is buffered, at
+least every 0.1 seconds, like `lox` writes it to stdout.
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+from typing import override
+
+from lox.client import EXIT, HEADER, STDERR, STDOUT, default_socket
+from lox.limits import Limits
+from lox.output import BufferedOutput
+from lox.program import CompileError, Program, RunError, compile
+
+
+class _FramedOutput(BufferedOutput):
+    """Buffers the output of one run and sends it as `STDOUT` frames."""
+
+    def __init__(self, connection: socket.socket) -> None:
+        super().__init__()
+        self._connection = connection
+
+    @override
+    def flush(self) -> None:
+        if self._parts:
+            _send(self._connection, STDOUT, "".join(self._parts).encode())
+            self._parts.clear()
+            self._size = 0
+        self._last_flush = time.monotonic()
+
+
+def _send(connection: socket.socket, kind: bytes, payload: bytes) -> None:
+    connection.sendall(HEADER.pack(kind, len(payload)) + payload)
+
+
+# Compiled programs by path and modification time, so edits miss the cache.
+_programs: dict[tuple[Path, int], Program | CompileError] = {}
+_MAX_PROGRAMS = 256
+
+
+def _compile(path: Path) -> Program | CompileError:
+    key = path, path.stat().st_mtime_ns
+    if key not in _programs:
+        if len(_programs) >= _MAX_PROGRAMS:
+            del _programs[next(iter(_programs))]
+        try:
+            _programs[key] = compile(path.read_text("utf-8"))
+        except CompileError as err:
+            _programs[key] = err
+    return _programs[key]
+
+
+def _run(connection: socket.socket, path: Path, limits: Limits) -> int:
+    try:
+        program = _compile(path)
+    except (OSError, UnicodeDecodeError) as err:
+        _send(connection, STDERR, f"Error: {path}: {err}\n".encode())
+        return 66
+    if isinstance(program, CompileError):
+        _send(connection, STDERR, f"{program}\n".encode())
+        return 65
+    try:
+        program.run(output=_FramedOutput(connection), limits=limits)
+    except RunError as err:
+        _send(connection, STDERR, f"{err}\n".encode())
+        return 70
+    except OSError:
+        # The client went away, see `_work`.
+        raise
+    except Exception as err:
+        # Like RecursionError, fails the run instead of the worker.
+        _send(connection, STDERR, f"Error: {type(err).__name__}: {err}\n".encode())
+        return 70
+    return 0
+
+
+def _handle(connection: socket.socket, limits: Limits) -> None:
+    with connection, connection.makefile("rb") as file:
+        request: dict[str, str] = json.loads(file.readline())
+        code = _run(connection, Path(request["path"]), limits)
+        _send(connection, EXIT, str(code).encode())
+
+
+def _work(listener: socket.socket, limits: Limits) -> None:
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    while True:
+        connection, _ = listener.accept()
+        try:
+            _handle(connection, limits)
+        except (OSError, ValueError, KeyError) as err:
+            # A client that went away or sent garbage only loses its own run.
+            print(f"lox serve: {err}", file=sys.stderr)
+
+
+def _fork(listener: socket.socket, limits: Limits) -> int:
+    pid = os.fork()
+    if pid == 0:
+        try:
+            _work(listener, limits)
+        finally:
+            os._exit(1)
+    return pid
+
+
+def _warm_up() -> None:
+    # Runs every phase once, so that lazily created state exists before the
+    # heap is frozen and shared with the workers.
+    compile("fun f(n) { return n + 1; } var x = f(1);").run()
+
+
+def _stop(_: int, __: FrameType | None) -> None:
+    sys.exit(0)
+
+
+def serve(path: Path, workers: int, limits: Limits) -> None:
+    """Serves until SIGTERM or SIGINT, replacing workers that exit."""
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    path.unlink(missing_ok=True)
+    listener.bind(str(path))
+    listener.listen(128)
+    _warm_up()
+    gc.freeze()
+    signal.signal(signal.SIGTERM, _stop)
+    children = {_fork(listener, limits) for _ in range(workers)}
+    print(f"lox serve: {workers} workers on {path}", file=sys.stderr)
+    try:
+        while True:
+            pid, _ = os.wait()
+            children.discard(pid)
+            children.add(_fork(listener, limits))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+        for _ in children:
+            os.wait()
+        listener.close()
+        path.unlink(missing_ok=True)
+
+
+@dataclass(frozen=True)
+class Args:
+    socket: Path
+    workers: int
+    timeout: float | None = None
+
+
+def parse_arguments(args: Sequence[str]) -> Args:
+    parser = argparse.ArgumentParser(
+        prog="lox serve", description="run scripts for lox client"
+    )
+    parser.add_argument(
+        "--socket", type=Path, default=default_socket(), help="socket to listen on"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes, one per core by default",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help="stop each run after this much wall-clock time",
+    )
+    return Args(**vars(parser.parse_args(args)))  # type: ignore[misc]
+
+
+def main(argv: Sequence[str]) -> None:
+    args = parse_arguments(argv)
+    serve(args.socket, args.workers, Limits(timeout=args.timeout))
@@ -0,0 +1,241 @@
+import json
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TextIO, final, override
+
+from lox.ast import (
+    Assign,
+    Binary,
+    Block,
+    Call,
+    Expr,
+    Expression,
+    Function,
+    Grouping,
+    If,
+    Literal,
+    Logical,
+    Print,
+    Return,
+    Stmt,
+    Unary,
+    Var,
+    Variable,
+    VisitorExpr,
+    VisitorStmt,
+    While,
+)
+from lox.environment import Environment
+from lox.trace import Tracer
+
+
+@dataclass
+class Phase:
+    wall_ns: int = 0
+    cpu_ns: int = 0
+    peak_bytes: int = 0
+
+
+@dataclass
+class Counters(Tracer):
+    statements: int = 0
+    calls: int = 0
+    environments: int = 0
+
+    @override
+    def statement(self, stmt: Stmt) -> None:
+        self.statements += 1
+
+    @override
+    def call(self, expr: Call) -> None:
+        self.calls += 1
+
+    @override
+    def environment(self, environment: Environment) -> None:
+        self.environments += 1
+
+
+@final
+class _NodeCounter(VisitorExpr[None], VisitorStmt[None]):
+    def __init__(self, counts: Counter[str]) -> None:
+        self._counts = counts
+
+    @override
+    def visit_binary_expr(self, expr: Binary) -> None:
+        self._counts["Binary"] += 1
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    @override
+    def visit_call_expr(self, expr: Call) -> None:
+        self._counts["Call"] += 1
+        expr.callee.accept(self)
+        for argument in expr.arguments:
+            argument.accept(self)
+
+    @override
+    def visit_assign_expr(self, expr: Assign) -> None:
+        self._counts["Assign"] += 1
+        expr.value.accept(self)
+
+    @override
+    def visit_grouping_expr(self, expr: Grouping) -> None:
+        self._counts["Grouping"] += 1
+        expr.expression.accept(self)
+
+    @override
+    def visit_literal_expr(self, expr: Literal) -> None:
+        self._counts["Literal"] += 1
+
+    @override
+    def visit_logical_expr(self, expr: Logical) -> None:
+        self._counts["Logical"] += 1
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    @override
+    def visit_unary_expr(self, expr: Unary) -> None:
+        self._counts["Unary"] += 1
+        expr.right.accept(self)
+
+    @override
+    def visit_variable_expr(self, expr: Variable) -> None:
+        self._counts["Variable"] += 1
+
+    @override
+    def visit_expression_stmt(self, expr: Expression) -> None:
+        self._counts["Expression"] += 1
+        expr.expression.accept(self)
+
+    @override
+    def visit_function_stmt(self, expr: Function) -> None:
+        self._counts["Function"] += 1
+        for statement in expr.body:
+            statement.accept(self)
+
+    @override
+    def visit_if_stmt(self, expr: If) -> None:
+        self._counts["If"] += 1
+        expr.condition.accept(self)
+        expr.then_branch.accept(self)
+        if expr.else_branch is not None:
+            expr.else_branch.accept(self)
+
+    @override
+    def visit_while_stmt(self, expr: While) -> None:
+        self._counts["While"] += 1
+        expr.condition.accept(self)
+        expr.body.accept(self)
+
+    @override
+    def visit_block_stmt(self, expr: Block) -> None:
+        self._counts["Block"] += 1
+        for statement in expr.statements:
+            statement.accept(self)
+
+    @override
+    def visit_print_stmt(self, expr: Print) -> None:
+        self._counts["Print"] += 1
+        expr.expression.accept(self)
+
+    @override
+    def visit_return_stmt(self, expr: Return) -> None:
+        self._counts["Return"] += 1
+        if expr.value is not None:
+            expr.value.accept(self)
+
+    @override
+    def visit_var_stmt(self, expr: Var) -> None:
+        self._counts["Var"] += 1
+        expr.initializer.accept(self)
+
+
+def count_nodes(nodes: Sequence[Expr | Stmt], counts: Counter[str]) -> None:
+    """Adds the number of nodes of each type in `nodes` to `counts`."""
+    counter = _NodeCounter(counts)
+    for node in nodes:
+        node.accept(counter)
+
+
+class Timings:
+    """Wall time, CPU time and peak memory per phase of `Lox._run`.
+
+    Phases accumulate over runs. Memory is measured with `tracemalloc`, which is
+    only tracing during phases, but slows them down: the times include it.
+    """
+
+    def __init__(self) -> None:
+        self.phases: dict[str, Phase] = {}
+        self.tokens = 0
+        self.nodes: Counter[str] = Counter()
+        self.counters = Counters()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        wall, cpu = time.perf_counter_ns(), time.process_time_ns()
+        try:
+            yield
+        finally:
+            phase = self.phases.setdefault(name, Phase())
+            phase.wall_ns += time.perf_counter_ns() - wall
+            phase.cpu_ns += time.process_time_ns() - cpu
+            _, peak = tracemalloc.get_traced_memory()
+            phase.peak_bytes = max(phase.peak_bytes, peak - start)
+            if started:
+                tracemalloc.stop()
+
+    def to_json(self) -> str:
+        phases: dict[str, object] = {
+            name: {
+                "wall_ns": phase.wall_ns,
+                "cpu_ns": phase.cpu_ns,
+                "peak_bytes": phase.peak_bytes,
+            }
+            for name, phase in self.phases.items()
+        }
+        counters: dict[str, object] = {
+            "statements": self.counters.statements,
+            "calls": self.counters.calls,
+            "environments": self.counters.environments,
+        }
+        nodes: dict[str, object] = dict(self.nodes)
+        data: dict[str, object] = {
+            "phases": phases,
+            "tokens": self.tokens,
+            "nodes": nodes,
+            "counters": counters,
+        }
+        return json.dumps(data)
+
+    def report(self, file: TextIO) -> None:
+        print(
+            f"{'phase':<12} {'wall ms':>10} {'cpu ms':>10} {'peak KiB':>10}", file=file
+        )
+        for name, phase in self.phases.items():
+            print(
+                f"{name:<12} {phase.wall_ns / 1e6:>10.3f} {phase.cpu_ns / 1e6:>10.3f} "
+                f"{phase.peak_bytes / 1024:>10.1f}",
+                file=file,
+            )
+        wall = sum(phase.wall_ns for phase in self.phases.values())
+        cpu = sum(phase.cpu_ns for phase in self.phases.values())
+        print(f"{'total':<12} {wall / 1e6:>10.3f} {cpu / 1e6:>10.3f}", file=file)
+        print("times include tracing memory allocations with tracemalloc", file=file)
+        print(f"tokens: {self.tokens}", file=file)
+        nodes = ", ".join(f"{name} {count}" for name, count in self.nodes.most_common())
+        print(f"nodes: {self.nodes.total()} ({nodes})", file=file)
+        counters = self.counters
+        print(
+            f"statements: {counters.statements}, calls: {counters.calls}, "
+            f"environments: {counters.environments}",
+            file=file,
+        )
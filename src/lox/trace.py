@@ -0,0 +1,111 @@
+from collections.abc import Callable, Mapping, Sequence
+from typing import TYPE_CHECKING
+
+from lox.ast import Call, Expr, Stmt, VisitorExpr, VisitorStmt
+from lox.environment import Environment
+from lox.runtime_error import LoxRuntimeErr
+
+if TYPE_CHECKING:
+    from lox.interpret import Interpreter
+
+_STATEMENT_VISITS = tuple(
+    name
+    for name in vars(VisitorStmt)  # type: ignore[misc]
+    if name.startswith("visit_")
+)
+
+_EXPRESSION_VISITS = tuple(
+    name
+    for name in vars(VisitorExpr)  # type: ignore[misc]
+    if name.startswith("visit_") and name != "visit_call_expr"
+)
+
+# Every interpreter method that `instrument` replaces.
+INSTRUMENTED = (
+    *_STATEMENT_VISITS,
+    *_EXPRESSION_VISITS,
+    "visit_call_expr",
+    "execute_block",
+)
+
+
+class Tracer:
+    """Receives runtime events from an `Interpreter`, see `Interpreter.attach`.
+
+    Every method does nothing, so subclasses only override the events they need.
+    """
+
+    def statement(self, stmt: Stmt) -> None:
+        """Called before executing any statement, including blocks and loops."""
+
+    def expression(self, expr: Expr) -> None:
+        """Called before evaluating any expression, including calls."""
+
+    def call(self, expr: Call) -> None:
+        """Called before evaluating the callee and the arguments of a call."""
+
+    def return_(self, expr: Call, value: object) -> None:
+        """Called after a call returned normally."""
+
+    def environment(self, environment: Environment) -> None:
+        """Called when a block or a function call starts in a new environment."""
+
+    def error(self, err: LoxRuntimeErr) -> None:
+        """Called before a runtime error is reported."""
+
+
+def _statement(visit: Callable[[Stmt], None], tracer: Tracer) -> Callable[[Stmt], None]:
+    def traced(stmt: Stmt) -> None:
+        tracer.statement(stmt)
+        visit(stmt)
+
+    return traced
+
+
+def _expression(
+    visit: Callable[[Expr], object], tracer: Tracer
+) -> Callable[[Expr], object]:
+    def traced(expr: Expr) -> object:
+        tracer.expression(expr)
+        return visit(expr)
+
+    return traced
+
+
+def _call(visit: Callable[[Call], object], tracer: Tracer) -> Callable[[Call], object]:
+    def traced(expr: Call) -> object:
+        tracer.expression(expr)
+        tracer.call(expr)
+        value = visit(expr)
+        tracer.return_(expr, value)
+        return value
+
+    return traced
+
+
+def _block(
+    execute: Callable[[Sequence[Stmt], Environment], None], tracer: Tracer
+) -> Callable[[Sequence[Stmt], Environment], None]:
+    def traced(stmts: Sequence[Stmt], environment: Environment) -> None:
+        tracer.environment(environment)
+        execute(stmts, environment)
+
+    return traced
+
+
+def instrument(interpreter: "Interpreter", tracer: Tracer) -> Mapping[str, object]:
+    """Returns traced versions of the `INSTRUMENTED` methods of `interpreter`.
+
+    The interpreter installs them as instance attributes, which take precedence
+    over its own methods in every `accept`. Without a tracer the dispatch is
+    left untouched, so tracing costs nothing unless it is used.
+    """
+    methods: dict[str, object] = {
+        name: _statement(getattr(interpreter, name), tracer)  # type: ignore[misc]
+        for name in _STATEMENT_VISITS
+    }
+    for name in _EXPRESSION_VISITS:
+        methods[name] = _expression(getattr(interpreter, name), tracer)  # type: ignore[misc]
+    methods["visit_call_expr"] = _call(interpreter.visit_call_expr, tracer)
+    methods["execute_block"] = _block(interpreter.execute_block, tracer)
+    return methods
@@ -0,0 +1,387 @@
+"""Evaluate one Lox expression over many rows of columnar data at once.
+
+    scores = lox.compile_expression('price * qty > 100 and region == "eu"')
+    scores.evaluate({"price": prices, "qty": quantities, "region": regions})
+
+Variables name columns. Each node runs over a whole column with `map` over an
+operator instead of visiting the tree once per row, as long as the
+operand types are known to fit. Everything else, calls and assignments for
+instance, runs through the `Interpreter` one row at a time, with the same
+results.
+"""
+
+from array import array
+from collections import deque
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from enum import Enum, auto
+from itertools import compress
+from typing import Protocol, cast, final, override, runtime_checkable
+
+from lox.ast import (
+    Assign,
+    Binary,
+    Call,
+    Expr,
+    Grouping,
+    Literal,
+    Logical,
+    Unary,
+    Variable,
+    VisitorExpr,
+)
+from lox.equality import is_equal
+from lox.interpret import Interpreter
+from lox.output import CaptureOutput
+from lox.program import Diagnostic, RunError, parse_expression, to_lox, to_python
+from lox.runtime_error import LoxRuntimeErr
+from lox.scanner import TokenType
+
+
+class _Kind(Enum):
+    """What every value of a column is known to be."""
+
+    NUMBER = auto()
+    STRING = auto()
+    BOOL = auto()
+    ANY = auto()
+
+
+type _Column = tuple[Sequence[object], _Kind]
+
+_NUMBER, _STRING, _BOOL, _ANY = _Kind.NUMBER, _Kind.STRING, _Kind.BOOL, _Kind.ANY
+
+# Binary operators that `map` can apply directly to two columns of numbers or of
+# strings. Slot wrappers like `float.__add__` are as fast as `operator.add`.
+_NUMBER_OPERATORS: Mapping[
+    TokenType, tuple[Callable[[float, float], object], _Kind]
+] = {
+    TokenType.PLUS: (float.__add__, _NUMBER),
+    TokenType.MINUS: (float.__sub__, _NUMBER),
+    TokenType.STAR: (float.__mul__, _NUMBER),
+    TokenType.SLASH: (float.__truediv__, _NUMBER),
+    TokenType.GREATER: (float.__gt__, _BOOL),
+    TokenType.GREATER_EQUAL: (float.__ge__, _BOOL),
+    TokenType.LESS: (float.__lt__, _BOOL),
+    TokenType.LESS_EQUAL: (float.__le__, _BOOL),
+    TokenType.EQUAL_EQUAL: (float.__eq__, _BOOL),
+    TokenType.BANG_EQUAL: (float.__ne__, _BOOL),
+}
+
+_STRING_OPERATORS: Mapping[TokenType, tuple[Callable[[str, str], object], _Kind]] = {
+    TokenType.PLUS: (str.__add__, _STRING),
+    TokenType.EQUAL_EQUAL: (str.__eq__, _BOOL),
+    TokenType.BANG_EQUAL: (str.__ne__, _BOOL),
+}
+
+
+def _is_not_equal(left: object, right: object) -> bool:
+    return not is_equal(left, right)
+
+
+def _is_truthy(value: object) -> bool:
+    return value is not None and value is not False
+
+
+def _is_falsey(value: object) -> bool:
+    return value is None or value is False
+
+
+def _kind(value: object) -> _Kind:
+    match value:
+        case bool():
+            return _BOOL
+        case float():
+            return _NUMBER
+        case str():
+            return _STRING
+    return _ANY
+
+
+@runtime_checkable
+class _DType(Protocol):
+    @property
+    def kind(self) -> str: ...
+
+
+@runtime_checkable
+class _NDArray(Protocol):
+    """The parts of a NumPy array `_column` uses, without importing NumPy."""
+
+    @property
+    def dtype(self) -> _DType: ...
+
+    def astype(self, dtype: type[float]) -> "_NDArray": ...
+
+    def tolist(self) -> list[object]: ...
+
+
+def _column(values: Sequence[object]) -> _Column:
+    if isinstance(values, array) and values.typecode == "d":
+        return values, _NUMBER
+    if isinstance(values, _NDArray):
+        # NumPy scalars like `np.int64` or `np.False_` are not Lox values.
+        match values.dtype.kind:
+            case "b":
+                return values.tolist(), _BOOL
+            case "i" | "u" | "f":
+                floats = cast("list[float]", values.astype(float).tolist())
+                return array("d", floats), _NUMBER
+        values = values.tolist()
+    types: set[type[object]] = set(map(type, values))  # type: ignore[misc]
+    if all(issubclass(type_, float) for type_ in types):
+        return values, _NUMBER
+    if all(issubclass(type_, int | float) and type_ is not bool for type_ in types):
+        return array("d", cast("Sequence[float]", values)), _NUMBER
+    if types == {str}:
+        return values, _STRING
+    if types == {bool}:
+        return values, _BOOL
+    return list(map(to_lox, values)), _ANY
+
+
+class _Batch:
+    """Some rows of the input columns, and the interpreter for per-row fallbacks."""
+
+    def __init__(
+        self,
+        columns: dict[str, _Column],
+        rows: int,
+        interpreter: Interpreter | None = None,
+    ) -> None:
+        self._columns = columns
+        self.rows = rows
+        self._interpreter = interpreter
+        self._parent: _Batch | None = None
+        self._indices: Sequence[int] = ()
+
+    @property
+    def names(self) -> Iterable[str]:
+        return self._columns.keys() if self._parent is None else self._parent.names
+
+    @property
+    def interpreter(self) -> Interpreter:
+        if self._interpreter is None:
+            self._interpreter = Interpreter(CaptureOutput())
+        return self._interpreter
+
+    def column(self, name: str) -> _Column | None:
+        if name not in self._columns and self._parent is not None:
+            column = self._parent.column(name)
+            if column is None:
+                return None
+            # Gathered on first use, since most subexpressions read few columns.
+            values, kind = column
+            self._columns[name] = list(map(values.__getitem__, self._indices)), kind
+        return self._columns.get(name)
+
+    def take(self, indices: Sequence[int]) -> "_Batch":
+        """The rows at `indices`, which keep their kinds."""
+        batch = _Batch({}, len(indices), self._interpreter)
+        batch._parent, batch._indices = self, indices
+        return batch
+
+
+type _Evaluate = Callable[[_Batch], _Column]
+
+
+def _per_row(expr: Expr) -> _Evaluate:
+    def evaluate(batch: _Batch) -> _Column:
+        interpreter = batch.interpreter
+        columns: list[tuple[str, Sequence[object]]] = []
+        for name in batch.names:
+            column = batch.column(name)
+            assert column is not None
+            columns.append((name, column[0]))
+        results: list[object] = []
+        for row in range(batch.rows):
+            for name, values in columns:
+                interpreter.define(name, values[row])
+            results.append(expr.accept(interpreter))
+        return results, _ANY
+
+    return evaluate
+
+
+@final
+class _Compiler(VisitorExpr[_Evaluate]):
+    @override
+    def visit_binary_expr(self, expr: Binary) -> _Evaluate:
+        left, right = expr.left.accept(self), expr.right.accept(self)
+        token = expr.operator
+
+        def evaluate(batch: _Batch) -> _Column:
+            left_values, left_kind = left(batch)
+            right_values, right_kind = right(batch)
+            if token.type_ == TokenType.COMMA:
+                return right_values, right_kind
+            if left_kind == right_kind == _NUMBER and token.type_ in _NUMBER_OPERATORS:
+                number, kind = _NUMBER_OPERATORS[token.type_]
+                return list(
+                    map(
+                        number,
+                        cast("Sequence[float]", left_values),
+                        cast("Sequence[float]", right_values),
+                    )
+                ), kind
+            if left_kind == right_kind == _STRING and token.type_ in _STRING_OPERATORS:
+                string, kind = _STRING_OPERATORS[token.type_]
+                return list(
+                    map(
+                        string,
+                        cast("Sequence[str]", left_values),
+                        cast("Sequence[str]", right_values),
+                    )
+                ), kind
+            match token.type_:
+                case TokenType.EQUAL_EQUAL:
+                    return list(map(is_equal, left_values, right_values)), _BOOL
+                case TokenType.BANG_EQUAL:
+                    return list(map(_is_not_equal, left_values, right_values)), _BOOL
+            # The interpreter checks the operand types and reports errors.
+            interpreter = batch.interpreter
+            return [
+                interpreter.visit_binary_expr(
+                    Binary(Literal(left_value), token, Literal(right_value))
+                )
+                for left_value, right_value in zip(
+                    left_values, right_values, strict=True
+                )
+            ], _ANY
+
+        return evaluate
+
+    @override
+    def visit_call_expr(self, expr: Call) -> _Evaluate:
+        return _per_row(expr)
+
+    @override
+    def visit_assign_expr(self, expr: Assign) -> _Evaluate:
+        return _per_row(expr)
+
+    @override
+    def visit_grouping_expr(self, expr: Grouping) -> _Evaluate:
+        return expr.expression.accept(self)
+
+    @override
+    def visit_literal_expr(self, expr: Literal) -> _Evaluate:
+        value, kind = expr.value, _kind(expr.value)
+
+        def evaluate(batch: _Batch) -> _Column:
+            return [value] * batch.rows, kind
+
+        return evaluate
+
+    @override
+    def visit_logical_expr(self, expr: Logical) -> _Evaluate:
+        left, right = expr.left.accept(self), expr.right.accept(self)
+        is_and = expr.operator.type_ == TokenType.AND
+        # The rows whose value is the right operand, like `Interpreter` decides.
+        decides = _is_truthy if is_and else _is_falsey
+
+        def evaluate(batch: _Batch) -> _Column:
+            left_values, left_kind = left(batch)
+            decided: Iterable[object]
+            match left_kind:
+                case _Kind.NUMBER | _Kind.STRING:
+                    # Always truthy.
+                    return right(batch) if is_and else (left_values, left_kind)
+                case _Kind.BOOL:
+                    decided = left_values if is_and else map(False.__eq__, left_values)
+                case _:
+                    decided = map(decides, left_values)
+            indices = list(compress(range(batch.rows), decided))
+            if not indices:
+                return left_values, left_kind
+            if len(indices) == batch.rows:
+                return right(batch)
+            # Short-circuit: the right operand only runs on the rows that need it.
+            right_values, right_kind = right(batch.take(indices))
+            values = list(left_values)
+            deque(map(values.__setitem__, indices, right_values), maxlen=0)
+            return values, left_kind if left_kind == right_kind else _ANY
+
+        return evaluate
+
+    @override
+    def visit_unary_expr(self, expr: Unary) -> _Evaluate:
+        right = expr.right.accept(self)
+        token = expr.operator
+
+        def evaluate(batch: _Batch) -> _Column:
+            values, kind = right(batch)
+            if token.type_ == TokenType.BANG:
+                return list(map(_is_falsey, values)), _BOOL
+            if kind == _NUMBER:
+                return list(
+                    map(float.__neg__, cast("Sequence[float]", values))
+                ), _NUMBER
+            interpreter = batch.interpreter
+            return [
+                interpreter.visit_unary_expr(Unary(token, Literal(value)))
+                for value in values
+            ], _ANY
+
+        return evaluate
+
+    @override
+    def visit_variable_expr(self, expr: Variable) -> _Evaluate:
+        name = expr.name.lexeme
+        # Natives and undefined names are left to the interpreter.
+        per_row = _per_row(expr)
+
+        def evaluate(batch: _Batch) -> _Column:
+            column = batch.column(name)
+            return per_row(batch) if column is None else column
+
+        return evaluate
+
+
+class VectorExpression:
+    """An expression compiled for columns, see `compile_expression`."""
+
+    def __init__(self, expr: Expr) -> None:
+        self._expr = expr
+        self._evaluate = expr.accept(_Compiler())
+
+    def evaluate(self, columns: Mapping[str, Sequence[object]]) -> Sequence[object]:
+        """The value of the expression for every row of `columns`.
+
+        Columns must have the same length. Python ints are Lox numbers, and so are
+        the elements of NumPy arrays of ints and floats, while NumPy arrays of
+        booleans hold Lox booleans. Numbers come back as an `array('d')`, other
+        results as a list.
+        """
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Columns must have the same length.")
+        prepared = {name: _column(values) for name, values in columns.items()}
+        rows = lengths.pop() if lengths else 1
+        try:
+            values, kind = self._evaluate(_Batch(dict(prepared), rows))
+        except LoxRuntimeErr:
+            self._raise_first_error(prepared, rows)
+            raise
+        if kind == _NUMBER:
+            return array("d", cast("Sequence[float]", values))
+        if kind == _ANY:
+            return list(map(to_python, values))
+        return values
+
+    def _raise_first_error(self, columns: Mapping[str, _Column], rows: int) -> None:
+        # Rows ran out of order, so find the first failing one in order.
+        interpreter = Interpreter(CaptureOutput())
+        for row in range(rows):
+            for name, (values, _) in columns.items():
+                interpreter.define(name, values[row])
+            try:
+                self._expr.accept(interpreter)
+            except LoxRuntimeErr as err:
+                where = f" in row {row}"
+                raise RunError(
+                    [Diagnostic(err.token.line, err.message, where)]
+                ) from None
+
+
+def compile_expression(source: str) -> VectorExpression:
+    """Parses `source`, a single expression, for `VectorExpression.evaluate`."""
+    return VectorExpression(parse_expression(source))
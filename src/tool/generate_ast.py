@@ -2,20 +2,20 @@ import argparse
 import subprocess
 import sys
 from collections.abc import Sequence
+from dataclasses import dataclass
 from pathlib import Path
 
-from pydantic import BaseModel
-
 
-class Args(BaseModel):
+@dataclass(frozen=True)
+class Args:
     path: Path
 
 
 def parse_arguments(args: Sequence[str]) -> Args:
     parser = argparse.ArgumentParser(description="generate_ast")
-    parser.add_argument("path", help="output directory")
+    parser.add_argument("path", type=Path, help="output directory")
 
-    return Args.model_validate(vars(parser.parse_args(args)))  # type: ignore[misc]
+    return Args(**vars(parser.parse_args(args)))  # type: ignore[misc]
 
 
 def main() -> None:
@@ -40,9 +40,10 @@ def main() -> None:
             "Expression ; expression: Expr",
             "Function   ; name: Token, params: Sequence[Token], body: Sequence[Stmt]",
             "If         ; condition: Expr, then_branch: Stmt, else_branch: Stmt | None",
-            "While      ; condition: Expr, body: Stmt",
+            "While      ; keyword: Token, condition: Expr, body: Stmt",
             "Block      ; statements: Sequence[Stmt]",
             "Print      ; expression: Expr",
+            "Return     ; keyword: Token, value: Expr | None",
             "Var        ; name: Token, initializer: Expr",
         ],
     )
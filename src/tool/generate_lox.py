@@ -0,0 +1,182 @@
+import argparse
+import random
+import string
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+_BINARY = ("+", "-", "*", "/", "<", "<=", ">", ">=", "==", "!=", "and", "or")
+_WORDS = ("lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing")
+
+
+@dataclass(frozen=True)
+class Args:
+    size: int
+    seed: int = 0
+    path: Path | None = None
+
+
+def parse_arguments(args: Sequence[str]) -> Args:
+    parser = argparse.ArgumentParser(description="generate_lox")
+    parser.add_argument("size", type=int, help="approximate size in bytes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "path", nargs="?", type=Path, help="output file, stdout by default"
+    )
+
+    return Args(**vars(parser.parse_args(args)))  # type: ignore[misc]
+
+
+def main() -> None:
+    args = parse_arguments(sys.argv[1:])
+    source = generate(args.size, args.seed)
+    if args.path is None:
+        sys.stdout.write(source)
+    else:
+        args.path.write_text(source, encoding="utf-8")
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """Returns a syntactically valid Lox program of at least `size` characters.
+
+    The same seed always gives the same program. Programs mix functions with
+    deep expressions, long string literals and comments, roughly in the
+    proportions of hand-written code.
+    """
+    return _Generator(seed).program(size)
+
+
+class _Generator:
+    def __init__(self, seed: int) -> None:
+        self._random = random.Random(seed)
+        self._functions = 0
+        self._names: list[str] = ["x"]
+
+    def program(self, size: int) -> str:
+        parts: list[str] = []
+        length = 0
+        while length < size:
+            match self._random.randrange(10):
+                case 0 | 1:
+                    part = self._comment("")
+                case 2 | 3 | 4 | 5:
+                    part = self._function()
+                case _:
+                    part = self._statement(0, "")
+            parts.append(part)
+            length += len(part)
+        return "".join(parts)
+
+    def _identifier(self) -> str:
+        return self._random.choice(self._names)
+
+    def _string(self) -> str:
+        count = self._random.choice((1, 3, 10, 40, 200))
+        words = self._random.choices(_WORDS, k=count)
+        return '"' + " ".join(words) + '"'
+
+    def _comment(self, indent: str) -> str:
+        words = " ".join(self._random.choices(_WORDS, k=self._random.randrange(3, 15)))
+        if self._random.random() < 0.8:
+            return f"{indent}// {words}\n"
+        return f"{indent}/* {words}\n{indent}   {words} */\n"
+
+    def _expression(self, depth: int) -> str:
+        if depth <= 0 or self._random.random() < 0.25:
+            # Deep expressions are rare, like in real code.
+            if depth > 2 and self._random.random() < 0.02:
+                return self._deep_expression(self._random.randrange(8, 32))
+            match self._random.randrange(6):
+                case 0 | 1:
+                    return self._identifier()
+                case 2:
+                    return str(self._random.randrange(1000))
+                case 3:
+                    return (
+                        f"{self._random.randrange(1000)}.{self._random.randrange(100)}"
+                    )
+                case 4:
+                    return self._string()
+                case _:
+                    return self._random.choice(("true", "false", "nil"))
+        match self._random.randrange(8):
+            case 0:
+                return f"({self._expression(depth - 1)})"
+            case 1:
+                return f"{self._random.choice('-!')}{self._expression(depth - 1)}"
+            case 2 if self._functions:
+                arguments = ", ".join(
+                    self._expression(depth - 2)
+                    for _ in range(self._random.randrange(4))
+                )
+                return f"f{self._random.randrange(self._functions)}({arguments})"
+            case _:
+                operator = self._random.choice(_BINARY)
+                return (
+                    f"{self._expression(depth - 1)} {operator} "
+                    f"{self._expression(depth - 1)}"
+                )
+
+    def _deep_expression(self, depth: int) -> str:
+        # Nests on one side only, so the size grows linearly with the depth.
+        if depth <= 0:
+            return self._expression(0)
+        operator = self._random.choice(_BINARY)
+        return f"{self._expression(1)} {operator} ({self._deep_expression(depth - 1)})"
+
+    def _statement(self, depth: int, indent: str, in_function: bool = False) -> str:
+        choice = self._random.randrange(10 if depth < 3 else 6)
+        match choice:
+            case 0 | 1:
+                name = "v" + "".join(self._random.choices(string.ascii_lowercase, k=4))
+                self._names.append(name)
+                return f"{indent}var {name} = {self._expression(4)};\n"
+            case 2:
+                return f"{indent}{self._identifier()} = {self._expression(4)};\n"
+            case 3:
+                return f"{indent}print {self._expression(4)};\n"
+            case 4:
+                return self._comment(indent)
+            case 5:
+                if in_function:
+                    return f"{indent}return {self._expression(4)};\n"
+                return f"{indent}{self._expression(4)};\n"
+            case 6 | 7:
+                then = self._block(depth + 1, indent, in_function)
+                if self._random.random() < 0.5:
+                    return f"{indent}if ({self._expression(3)}) {then}"
+                otherwise = self._block(depth + 1, indent, in_function)
+                return (
+                    f"{indent}if ({self._expression(3)}) {then[:-1]} else {otherwise}"
+                )
+            case 8:
+                body = self._block(depth + 1, indent, in_function)
+                return f"{indent}while ({self._expression(3)}) {body}"
+            case _:
+                body = self._block(depth + 1, indent, in_function)
+                return (
+                    f"{indent}for (var i = 0; i < {self._random.randrange(100)}; "
+                    f"i = i + 1) {body}"
+                )
+
+    def _block(self, depth: int, indent: str, in_function: bool) -> str:
+        inner = indent + "  "
+        statements = "".join(
+            self._statement(depth, inner, in_function)
+            for _ in range(self._random.randrange(1, 6))
+        )
+        return "{\n" + statements + indent + "}\n"
+
+    def _function(self) -> str:
+        params = [f"p{i}" for i in range(self._random.randrange(4))]
+        names = self._names
+        self._names = [*params, "x"]
+        body = "".join(
+            self._statement(1, "  ", in_function=True)
+            for _ in range(self._random.randrange(2, 10))
+        )
+        self._names = names
+        name = f"f{self._functions}"
+        self._functions += 1
+        return f"fun {name}({', '.join(params)}) {{\n{body}}}\n"
@@ -0,0 +1,45 @@
+from tests.lox.utils import run
+
+
+def test_array_get_set_len() -> None:
+    # Act
+    lines, reporter = run(
+        "var a = array(3); set(a, 1, 2.5); print get(a, 1); print len(a); print a;"
+    )
+    # Assert
+    assert not reporter.runtime_errors
+    assert lines == ["2.5", "3", "[0, 2.5, 0]"]
+
+
+def test_array_bulk_operations() -> None:
+    # Assemble
+    lox = """
+var a = array(3);
+set(a, 0, 3); set(a, 1, 1); set(a, 2, 2);
+var b = add(a, scale(a, 2));
+print b;
+print sum(b);
+print dot(a, a);
+print sort(a);
+"""
+    # Act
+    lines, reporter = run(lox)
+    # Assert
+    assert not reporter.runtime_errors
+    assert lines == ["[9, 3, 6]", "18", "14", "[1, 2, 3]"]
+
+
+def test_array_render_is_compact() -> None:
+    # Act
+    lines, _ = run("print array(1000);")
+    # Assert
+    assert lines == ["[0, 0, 0, 0, 0, 0, 0, 0, ... (1000 elements)]"]
+
+
+def test_array_index_out_of_range() -> None:
+    # Act
+    _, reporter = run("var a = array(2);\nget(a, 2);")
+    # Assert
+    [error] = reporter.runtime_errors
+    assert error.message == "Array index out of range."
+    assert error.token.line == 2
@@ -0,0 +1,131 @@
+import asyncio
+
+from lox.ffi import lox_native
+from lox.interpret import Interpreter
+from lox.output import CaptureOutput
+from tests.lox.utils import Reporter, parse
+
+
+@lox_native(arity=2)
+async def _sleep(seconds: float, value: object) -> object:
+    await asyncio.sleep(seconds)
+    return value
+
+
+@lox_native(arity=0)
+async def _fail() -> object:
+    raise ValueError("unreachable service")
+
+
+def _interpreter(output: CaptureOutput) -> Interpreter:
+    interpreter = Interpreter(output)
+    interpreter.define("sleep", _sleep)
+    interpreter.define("fail", _fail)
+    return interpreter
+
+
+def test_interpret_async_interleaves_scripts() -> None:
+    # Assemble
+    output = CaptureOutput()
+    slow = parse('print "slow " + sleep(0.02, "done");')
+    fast = parse('fun f(x) { return sleep(0, x); } print "fast " + f("done");')
+
+    async def run() -> None:
+        await asyncio.gather(
+            _interpreter(output).interpret_async(Reporter(), slow),
+            _interpreter(output).interpret_async(Reporter(), fast),
+        )
+
+    # Act
+    asyncio.run(run())
+    # Assert
+    assert list(output.lines) == ["fast done", "slow done"]
+
+
+def test_interpret_async_yields_every_n_statements() -> None:
+    # Assemble
+    output = CaptureOutput()
+    statements = parse("var i = 0; while (i < 1000) i = i + 1; print i;")
+    beats: list[int] = []
+
+    async def heartbeat() -> None:
+        while True:
+            beats.append(len(beats))
+            await asyncio.sleep(0)
+
+    async def run() -> None:
+        task = asyncio.create_task(heartbeat())
+        await _interpreter(output).interpret_async(Reporter(), statements, 100)
+        task.cancel()
+
+    # Act
+    asyncio.run(run())
+    # Assert
+    assert list(output.lines) == ["1000"]
+    assert len(beats) >= 10
+
+
+def test_interpret_async_yields_in_memoized_functions() -> None:
+    # Assemble
+    output = CaptureOutput()
+    source = """
+    fun count(n) { var i = 0; while (i < n) i = i + 1; return i; }
+    print count(1000);
+    print count(1000);
+    """
+    beats: list[int] = []
+
+    async def heartbeat() -> None:
+        while True:
+            beats.append(len(beats))
+            await asyncio.sleep(0)
+
+    async def run() -> None:
+        task = asyncio.create_task(heartbeat())
+        interpreter = Interpreter(output, memo_size=8)
+        await interpreter.interpret_async(Reporter(), parse(source), 100)
+        task.cancel()
+
+    # Act
+    asyncio.run(run())
+    # Assert
+    assert list(output.lines) == ["1000", "1000"]
+    # Only the first call runs, the second one is a cache hit.
+    assert 5 <= len(beats) < 15
+
+
+def test_interpret_async_matches_interpret() -> None:
+    # Assemble
+    source = """
+    fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+    var total = 0;
+    for (var i = 0; i < 10; i = i + 1) {
+      total = total + sleep(0, fib(i));
+      if (total > 20 and !(i == 9)) print "total " + "over";
+    }
+    print total or nil;
+    print -sleep(0, total);
+    """
+    expected = CaptureOutput()
+    output = CaptureOutput()
+    # Act
+    interpreter = _interpreter(expected)
+    interpreter.define("sleep", lox_native(arity=2, name="sleep")(lambda _, v: v))
+    interpreter.interpret(Reporter(), parse(source))
+    asyncio.run(_interpreter(output).interpret_async(Reporter(), parse(source)))
+    # Assert
+    assert list(output.lines) == list(expected.lines)
+
+
+def test_interpret_async_runtime_errors() -> None:
+    # Assemble
+    output = CaptureOutput()
+    reporter = Reporter()
+    statements = parse('print "before";\nprint sleep(0, 1) + nil;\nprint "after";')
+    # Act
+    asyncio.run(_interpreter(output).interpret_async(reporter, statements))
+    # Assert
+    assert list(output.lines) == ["before"]
+    assert [(err.token.line, err.message) for err in reporter.runtime_errors] == [
+        (2, "Operands must be be two numbers or two strings.")
+    ]
@@ -0,0 +1,126 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from lox import batch
+from lox.batch import Result, expand, main, run_many
+from lox.limits import Limits
+from lox.program import Program, compile
+
+
+def _scripts(tmp_path: Path, sources: dict[str, str]) -> list[str]:
+    for name, source in sources.items():
+        (tmp_path / name).write_text(source)
+    return [str(tmp_path / name) for name in sources]
+
+
+def test_run_many_statuses(tmp_path: Path) -> None:
+    # Assemble
+    paths = _scripts(
+        tmp_path,
+        {
+            "ok.lox": 'print "hi";',
+            "syntax.lox": "print 1 +;",
+            "runtime.lox": "print 1;\nprint nil - 1;",
+            "loop.lox": "while (true) {}",
+        },
+    )
+    paths.append(str(tmp_path / "missing.lox"))
+    # Act
+    results = list(run_many(paths, jobs=2, limits=Limits(timeout=0.1)))
+    # Assert
+    assert [result.path for result in results] == paths
+    assert [(result.status, result.stdout, result.stderr) for result in results] == [
+        (0, "hi\n", ""),
+        (65, "", "[line 1] Error at ';': Expected expression.\n"),
+        (70, "1\n", "[line 2] Error: Operands must be numbers.\n"),
+        (70, "", "[line 1] Error: Timeout exceeded.\n"),
+        (
+            66,
+            "",
+            f"Error: {paths[4]}: [Errno 2] No such file or directory: '{paths[4]}'\n",
+        ),
+    ]
+
+
+def test_expand(tmp_path: Path) -> None:
+    # Assemble
+    _scripts(tmp_path, {"b.lox": "", "a.lox": "", "c.txt": ""})
+    (tmp_path / "sub").mkdir()
+    _scripts(tmp_path / "sub", {"d.lox": ""})
+    # Act
+    paths = expand([f"{tmp_path}/**/*.lox", "missing.lox"])
+    # Assert
+    assert paths == [
+        f"{tmp_path}/a.lox",
+        f"{tmp_path}/b.lox",
+        f"{tmp_path}/sub/d.lox",
+        "missing.lox",
+    ]
+
+
+def test_main_writes_jsonl(tmp_path: Path) -> None:
+    # Assemble
+    paths = _scripts(tmp_path, {"ok.lox": "print 1 + 2;", "bad.lox": "print nil - 1;"})
+    listing = tmp_path / "list.txt"
+    listing.write_text("\n".join(paths) + "\n")
+    output = tmp_path / "results.jsonl"
+    # Act
+    with pytest.raises(SystemExit) as info:
+        main(["--files-from", str(listing), "--output", str(output), "--jobs", "1"])
+    # Assert
+    assert info.value.code == 1
+    results = [
+        Result(**json.loads(line))  # type: ignore[misc]
+        for line in output.read_text().splitlines()
+    ]
+    assert [(result.status, result.stdout) for result in results] == [
+        (0, "3\n"),
+        (70, ""),
+    ]
+
+
+def test_run_many_survives_python_errors(tmp_path: Path) -> None:
+    # Assemble
+    paths = _scripts(tmp_path, {"div.lox": "print 1/0;", "after.lox": "print 1;"})
+    (tmp_path / "latin1.lox").write_bytes(b'print "\xe9";')
+    paths.insert(1, str(tmp_path / "latin1.lox"))
+    # Act
+    results = list(run_many(paths, jobs=1))
+    # Assert
+    assert [(result.status, result.stdout) for result in results] == [
+        (70, ""),
+        (66, ""),
+        (0, "1\n"),
+    ]
+    assert results[0].stderr == "Error: ZeroDivisionError: float division by zero\n"
+
+
+def _crash_on_exit(source: str, opt_level: int) -> Program:
+    if "exit" in source:
+        os._exit(1)
+    return compile(source, opt_level)
+
+
+# The broken pool's threads may still run when the next pool forks.
+@pytest.mark.filterwarnings("ignore:This process .* is multi-threaded")
+def test_run_many_survives_crashed_workers(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Assemble
+    monkeypatch.setattr(batch, "compile", _crash_on_exit)
+    sources = {"a.lox": "print 1;", "exit.lox": "print 2; // exit", "b.lox": "print 3;"}
+    paths = _scripts(tmp_path, sources)
+    # Act
+    results = list(run_many(paths, jobs=2))
+    # Assert
+    assert [(result.status, result.stdout) for result in results] == [
+        (0, "1\n"),
+        (70, ""),
+        (0, "3\n"),
+    ]
+    assert (
+        results[1].stderr == "Error: The worker process running the script crashed.\n"
+    )
@@ -0,0 +1,45 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from lox.bench import Result, compare, dump, load, run, welch_p_value
+
+
+def test_welch_p_value() -> None:
+    # Example A1 from the Wikipedia article on Welch's t-test.
+    first = [27.5, 21.0, 19.0, 23.6, 17.0, 17.9, 16.9, 20.1, 21.9, 22.6]
+    first += [23.1, 19.6, 19.0, 21.7, 21.4]
+    second = [27.1, 22.0, 20.8, 23.4, 23.4, 23.5, 25.8, 22.0, 24.8, 20.2]
+    second += [21.9, 22.1, 22.9, 20.5, 24.4]
+    assert welch_p_value(first, second) == pytest.approx(0.021, abs=5e-4)
+    assert welch_p_value(first, first) == pytest.approx(1.0)
+
+
+def test_compare() -> None:
+    # Assemble
+    base = {
+        "same": Result([1.0, 1.1, 0.9, 1.0], 100),
+        "slower": Result([1.0, 1.1, 0.9, 1.0], 100),
+        "faster": Result([1.0, 1.1, 0.9, 1.0], 100),
+    }
+    new = {
+        "same": Result([1.05, 0.95, 1.0, 1.0], 100),
+        "slower": Result([2.0, 2.1, 1.9, 2.0], 100),
+        "faster": Result([0.5, 0.55, 0.45, 0.5], 100),
+    }
+    # Act
+    regressions = compare(base, new, alpha=0.05, threshold=0.02)
+    # Assert
+    assert regressions == ["slower"]
+
+
+def test_run(tmp_path: Path) -> None:
+    # Assemble
+    script = tmp_path / "hello.lox"
+    script.write_text('print "hello";', "utf-8")
+    # Act
+    results = load(dump(run(sys.executable, [script], repeat=2), sys.executable))
+    # Assert
+    assert len(results["hello"].times) == 2
+    assert results["hello"].max_rss_kib > 0
@@ -0,0 +1,135 @@
+from lox.ast import Function
+from lox.closure import free_variables
+from lox.interpret import Interpreter, LoxFunction
+from lox.output import CaptureOutput
+from tests.lox.utils import interpret, parse, run
+
+
+def test_free_variables() -> None:
+    # Assemble
+    (statement,) = parse("""
+    fun f(a) {
+      var b = a + c;
+      fun g() { return b + d + g(); }
+      e = b;
+      { var d = 1; print d; }
+      print d;
+    }
+    """)
+    assert isinstance(statement, Function)
+    # Act
+    free = free_variables(statement)
+    # Assert
+    assert free == {"c", "d", "e"}
+
+
+def test_counters_keep_their_own_cells() -> None:
+    # Assemble
+    source = """
+    fun counter() {
+      var n = 0;
+      fun inc() { n = n + 1; return n; }
+      return inc;
+    }
+    var a = counter();
+    var b = counter();
+    a(); a();
+    print a();
+    print b();
+    """
+    # Act
+    lines, reporter = run(source)
+    # Assert
+    assert not reporter.runtime_errors
+    assert lines == ["3", "1"]
+
+
+def test_closures_share_captured_variables() -> None:
+    # Assemble
+    source = """
+    var get;
+    var set;
+    fun make() {
+      var value = "before";
+      fun getter() { return value; }
+      fun setter(v) { value = v; }
+      get = getter;
+      set = setter;
+      print value;
+      set("after");
+      print value;
+    }
+    make();
+    print get();
+    """
+    # Act
+    lines, reporter = run(source)
+    # Assert
+    assert not reporter.runtime_errors
+    assert lines == ["before", "after", "after"]
+
+
+def test_closures_capture_each_loop_iteration() -> None:
+    # Assemble
+    source = """
+    var first;
+    var second;
+    for (var i = 0; i < 2; i = i + 1) {
+      var j = i;
+      fun show() { print j; }
+      if (i == 0) first = show; else second = show;
+    }
+    first();
+    second();
+    """
+    # Act
+    lines, reporter = run(source)
+    # Assert
+    assert not reporter.runtime_errors
+    assert lines == ["0", "1"]
+
+
+def test_local_functions_can_recurse() -> None:
+    # Assemble
+    source = """
+    fun outer() {
+      fun fact(n) { if (n < 2) return 1; return n * fact(n - 1); }
+      return fact;
+    }
+    print outer()(5);
+    """
+    # Act
+    lines, reporter = run(source)
+    # Assert
+    assert not reporter.runtime_errors
+    assert lines == ["120"]
+
+
+def test_closures_hold_only_their_free_variables() -> None:
+    # Assemble
+    source = """
+    fun make() {
+      var big = "unused";
+      var used = "used";
+      fun inner() { return used + suffix; }
+      return inner;
+    }
+    var suffix = "!";
+    var inner = make();
+    fun top() { return suffix; }
+    print inner();
+    """
+    output = CaptureOutput()
+    interpreter = Interpreter(output)
+    # Act
+    reporter = interpret(interpreter, source)
+    # Assert
+    assert not reporter.runtime_errors
+    inner = interpreter.globals.variables["inner"]
+    top = interpreter.globals.variables["top"]
+    assert isinstance(inner, LoxFunction)
+    assert isinstance(top, LoxFunction)
+    assert output.lines == ["used!"]
+    assert inner.cells is not None
+    assert list(inner.cells) == ["used"]
+    assert top.cells is None
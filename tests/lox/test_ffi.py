@@ -0,0 +1,101 @@
+import importlib.metadata
+import types
+from importlib.metadata import EntryPoint
+
+import pytest
+
+from lox import ffi
+from lox.ffi import NativeRegistry, lox_native
+from tests.lox.utils import run
+
+
+@lox_native(arity=2, types=(str, float))
+def repeat(text: str, times: float) -> str:
+    return text * int(times)
+
+
+@lox_native(arity=1, name="double")
+def double_(value: object) -> object:
+    assert isinstance(value, float)
+    return value * 2
+
+
+def test_native_call() -> None:
+    # Act
+    lines, reporter = run(
+        'print repeat("ab" + "c", 2); print double(4);', natives=[repeat, double_]
+    )
+    # Assert
+    assert not reporter.runtime_errors
+    assert lines == ["abcabc", "8"]
+
+
+@lox_native(arity=1)
+def kind(value: object) -> str:
+    return type(value).__name__
+
+
+@lox_native(arity=3)
+def kinds(first: object, second: object, third: object) -> str:
+    return " ".join(type(value).__name__ for value in (first, second, third))
+
+
+def test_untyped_natives_get_str_for_long_strings() -> None:
+    # Assemble
+    source = """
+    var long = "";
+    for (var i = 0; i < 10; i = i + 1) long = long + "0123456789";
+    print kind(long);
+    print kinds(long, 1, long);
+    """
+    # Act
+    lines, reporter = run(source, natives=[kind, kinds])
+    # Assert
+    assert not reporter.runtime_errors
+    assert lines == ["str", "str float str"]
+
+
+def test_native_argument_types() -> None:
+    # Act
+    _, reporter = run("\nrepeat(1, 2);", natives=[repeat])
+    # Assert
+    [error] = reporter.runtime_errors
+    assert error.message == "Argument 1 of repeat must be a string."
+    assert error.token.line == 2
+
+
+def test_native_arity() -> None:
+    # Act
+    _, reporter = run('repeat("a");', natives=[repeat])
+    # Assert
+    [error] = reporter.runtime_errors
+    assert error.message == "Expected 2 arguments but got 1."
+
+
+def test_register_module() -> None:
+    # Assemble
+    module = types.ModuleType("plugin")
+    module.repeat = repeat  # type: ignore[attr-defined]
+    module.unrelated = 1  # type: ignore[attr-defined]
+    registry = NativeRegistry()
+    # Act
+    registry.register_module(module)
+    # Assert
+    assert dict(registry.natives) == {"repeat": repeat}
+
+
+def test_load_entry_points(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Assemble
+    entry_point = EntryPoint(
+        name="double", value="tests.lox.test_ffi:double_", group=ffi.ENTRY_POINT_GROUP
+    )
+
+    def entry_points(group: str) -> list[EntryPoint]:
+        return [entry_point] if group == ffi.ENTRY_POINT_GROUP else []
+
+    monkeypatch.setattr(importlib.metadata, "entry_points", entry_points)
+    registry = NativeRegistry()
+    # Act
+    registry.load_entry_points()
+    # Assert
+    assert list(registry.natives) == ["double"]
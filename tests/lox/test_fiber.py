@@ -0,0 +1,84 @@
+import pytest
+
+from tests.lox.utils import Reporter, run
+
+
+def _errors(reporter: Reporter) -> list[tuple[int, str]]:
+    return [(err.token.line, err.message) for err in reporter.runtime_errors]
+
+
+def test_fibers_round_robin() -> None:
+    # Assemble
+    source = """
+    fun a() { for (var i = 0; i < 3; i = i + 1) { print "a"; yield(); } }
+    fun b() { for (var i = 0; i < 2; i = i + 1) { print "b"; yield(); } }
+    spawn(a);
+    spawn(b);
+    print "main";
+    """
+    # Act
+    lines, reporter = run(source, fibers=True)
+    # Assert
+    assert lines == ["main", "a", "b", "a", "b", "a"]
+    assert not reporter.runtime_errors
+
+
+def test_join_returns_result() -> None:
+    # Assemble
+    source = """
+    fun work() { yield(); return "done"; }
+    var task = spawn(work);
+    print task;
+    print join(task);
+    print join(task);
+    """
+    # Act
+    lines, reporter = run(source, fibers=True)
+    # Assert
+    assert lines == ["<fiber 2>", "done", "done"]
+    assert not reporter.runtime_errors
+
+
+def test_fibers_keep_their_scopes() -> None:
+    # Assemble
+    source = """
+    var log = "";
+    fun count(name) {
+      fun run() {
+        var total = 0;
+        for (var i = 0; i < 3; i = i + 1) { total = total + 1; yield(); }
+        return total;
+      }
+      return spawn(run);
+    }
+    var first = count("a");
+    var second = count("b");
+    print join(first) + join(second);
+    """
+    # Act
+    lines, reporter = run(source, fibers=True)
+    # Assert
+    assert lines == ["6"]
+    assert not reporter.runtime_errors
+
+
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        ("spawn(1);", (1, "Operand must be a function without parameters.")),
+        ("join(clock);", (1, "Operand must be a fiber.")),
+        (
+            "fun wait() { return join(task); }\nvar task = spawn(wait);\njoin(task);",
+            (3, "Deadlock: every fiber is waiting in join()."),
+        ),
+        (
+            "fun fail() { yield(); return nil + 1; }\nspawn(fail);",
+            (1, "Operands must be be two numbers or two strings."),
+        ),
+    ],
+)
+def test_fiber_errors(source: str, expected: tuple[int, str]) -> None:
+    # Act
+    _, reporter = run(source, fibers=True)
+    # Assert
+    assert _errors(reporter) == [expected]
@@ -0,0 +1,79 @@
+import io
+import json
+
+from lox.heap import Snapshots, declaration_lines, walk
+from lox.interpret import Interpreter
+from lox.output import CaptureOutput
+from tests.lox.utils import interpret, parse
+
+SOURCE = """
+var cache = map();
+fun fill(n) {
+  for (var i = 0; i < n; i = i + 1) set(cache, i, "item");
+}
+fun counter() {
+  var count = 0;
+  fun increment() { count = count + 1; return count; }
+  return increment;
+}
+var next = counter();
+fill(10);
+"""
+
+
+def test_walk_groups_values_by_line() -> None:
+    # Assemble
+    interpreter = Interpreter(CaptureOutput())
+    assert not interpret(interpreter, SOURCE).runtime_errors
+    # Act
+    heap = walk(interpreter, declaration_lines(parse(SOURCE)))
+    # Assert
+    usage = {key: usage.count for key, usage in heap.usage.items()}
+    assert usage[(2, "map")] == 1
+    assert usage[(2, "number")] == 10
+    assert usage[(2, "string")] == 1
+    assert usage[(3, "function")] == 1
+    assert usage[(6, "function")] == 1
+    # The closure and the count it captured.
+    assert usage[(8, "function")] == 1
+    assert usage[(8, "number")] == 1
+    assert usage[(None, "environment")] == 1
+    assert heap.bytes > 0
+
+
+def test_heap_stats() -> None:
+    # Assemble
+    output = CaptureOutput()
+    interpreter = Interpreter(output)
+    source = (
+        SOURCE
+        + """
+    var stats = heapStats();
+    print get(get(stats, "map"), "count");
+    print get(get(stats, "function"), "count");
+    print get(get(stats, "map"), "bytes") > 0;
+    """
+    )
+    # Act
+    assert not interpret(interpreter, source).runtime_errors
+    # Assert
+    assert list(output.lines) == ["1", "3", "true"]
+
+
+def test_snapshots_write_changes() -> None:
+    # Assemble
+    interpreter = Interpreter(CaptureOutput())
+    file = io.StringIO()
+    snapshots = Snapshots(interpreter, file)
+    snapshots.declare(parse(SOURCE))
+    assert not interpret(interpreter, SOURCE).runtime_errors
+    snapshots.snapshot()
+    # Act
+    assert not interpret(interpreter, "fill(15);").runtime_errors
+    snapshots.snapshot()
+    # Assert
+    first, second = [json.loads(line) for line in file.getvalue().splitlines()]  # type: ignore[misc]
+    assert second["values"] == first["values"] + 5  # type: ignore[misc]
+    assert second["changes"][0]["line"] == 2  # type: ignore[misc]
+    numbers = {"line": 2, "kind": "number", "values": 5, "bytes": 120}
+    assert numbers in second["changes"]  # type: ignore[misc]
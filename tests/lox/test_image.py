@@ -0,0 +1,94 @@
+import io
+
+import pytest
+
+from lox.ffi import lox_native
+from lox.image import ImageError, load_image, save_image
+from lox.interpret import Interpreter, LoxFunction
+from lox.output import CaptureOutput
+from tests.lox.utils import interpret
+
+PRELUDE = """
+fun square(x) { return x * x; }
+var greeting = "hello" + " world";
+var numbers = array(2);
+set(numbers, 1, 3);
+var total = sum;
+"""
+
+
+@lox_native(arity=1)
+def negate(value: object) -> object:
+    assert isinstance(value, float)
+    return -value
+
+
+def _image(source: str, memo_size: int = 0) -> bytes:
+    interpreter = Interpreter(CaptureOutput(), memo_size)
+    interpreter.define("negate", negate)
+    assert not interpret(interpreter, source).runtime_errors
+    file = io.BytesIO()
+    save_image(interpreter, file)
+    return file.getvalue()
+
+
+def _run(image: bytes, source: str) -> list[str]:
+    output = CaptureOutput()
+    interpreter = Interpreter(output)
+    interpreter.define("negate", negate)
+    load_image(interpreter, io.BytesIO(image))
+    assert not interpret(interpreter, source).runtime_errors
+    return list(output.lines)
+
+
+def test_image_restores_globals() -> None:
+    # Assemble
+    image = _image(PRELUDE)
+    # Act
+    lines = _run(image, "print square(3); print greeting; print total(numbers);")
+    # Assert
+    assert lines == ["9", "hello world", "3"]
+
+
+def test_image_saves_natives_by_name() -> None:
+    # Assemble
+    image = _image("var flip = negate; var clock = 1;")
+    # Act
+    lines = _run(image, "print flip(2); print clock; print len(array(1));")
+    # Assert
+    assert lines == ["-2", "1", "1"]
+
+
+def test_image_keeps_aliases_of_reassigned_natives() -> None:
+    # Assemble
+    image = _image("var total = sum; var sum = 5; var flip = negate; var negate = 1;")
+    # Act
+    lines = _run(
+        image, "print total(array(2)); print sum; print flip(2); print negate;"
+    )
+    # Assert
+    assert lines == ["0", "5", "-2", "1"]
+
+
+def test_image_drops_memo_caches() -> None:
+    # Assemble
+    image = _image("fun id(x) { return x; } id(1);", memo_size=8)
+    interpreter = Interpreter(CaptureOutput(), memo_size=8)
+    # Act
+    load_image(interpreter, io.BytesIO(image))
+    # Assert
+    assert type(interpreter.globals.variables["id"]) is LoxFunction
+
+
+def test_image_missing_native() -> None:
+    # Assemble
+    image = _image("var flip = negate;")
+    # Act
+    with pytest.raises(ImageError, match="needs the native 'negate'"):
+        load_image(Interpreter(CaptureOutput()), io.BytesIO(image))
+
+
+def test_image_rejects_other_files() -> None:
+    # Act
+    with pytest.raises(ImageError, match="Not a Lox image"):
+        load_image(Interpreter(CaptureOutput()), io.BytesIO(b"print 1;"))
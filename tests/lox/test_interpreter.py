@@ -1,7 +1,8 @@
 from lox.interpret import Interpreter
+from lox.output import CaptureOutput
 from lox.parser import Parser
 from lox.scanner import Scanner
-from tests.lox.utils import Reporter
+from tests.lox.utils import Reporter, parse
 
 
 def test_parse_comma_expr() -> None:
@@ -19,3 +20,15 @@ def test_parse_comma_expr() -> None:
     value = expr.accept(interpreter)
     # Assert
     assert value == 3.0
+
+
+def test_function_return() -> None:
+    # Assemble
+    statements = parse("fun f(a, b) { if (a < b) return b; return a; } print f(1, 2);")
+    output = CaptureOutput()
+    reporter = Reporter()
+    # Act
+    Interpreter(output).interpret(reporter, statements)
+    # Assert
+    assert not reporter.runtime_errors
+    assert output.lines == ["2"]
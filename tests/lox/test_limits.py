@@ -0,0 +1,68 @@
+from lox.interpret import Interpreter
+from lox.limits import Limits
+from lox.output import CaptureOutput
+from lox.runtime_error import LoxLimitErr
+from tests.lox.utils import Reporter, parse, run
+
+LOOP = "var i = 0;\nwhile (i < {n}) {{\n  i = i + 1;\n}}\nprint i;"
+
+
+def test_fuel_is_exact() -> None:
+    # Act
+    lines, reporter = run(LOOP.format(n=3000), limits=Limits(fuel=3000))
+    # Assert
+    assert not reporter.runtime_errors
+    assert lines == ["3000"]
+
+
+def test_out_of_fuel() -> None:
+    # Act
+    lines, reporter = run(LOOP.format(n=3001), limits=Limits(fuel=3000))
+    # Assert
+    [error] = reporter.runtime_errors
+    assert isinstance(error, LoxLimitErr)
+    assert error.message == "Out of fuel."
+    assert error.token.line == 2
+    assert lines == []
+
+
+def test_fuel_stops_recursion() -> None:
+    # Act
+    _, reporter = run("fun f(n) { return f(n); }\nf(1);", limits=Limits(fuel=100))
+    # Assert
+    [error] = reporter.runtime_errors
+    assert isinstance(error, LoxLimitErr)
+
+
+def test_timeout() -> None:
+    # Act
+    _, reporter = run("while (true) {}", limits=Limits(timeout=0.01))
+    # Assert
+    [error] = reporter.runtime_errors
+    assert isinstance(error, LoxLimitErr)
+    assert error.message == "Timeout exceeded."
+
+
+def test_max_allocations() -> None:
+    # Act
+    _, reporter = run(
+        "var a = array(10);\nvar b = array(10);", limits=Limits(max_allocations=15)
+    )
+    # Assert
+    [error] = reporter.runtime_errors
+    assert isinstance(error, LoxLimitErr)
+    assert error.message == "Allocation limit exceeded."
+    assert error.token.line == 2
+
+
+def test_limits_are_per_interpreter() -> None:
+    # Assemble
+    limited = Interpreter(CaptureOutput(), limits=Limits(fuel=10))
+    unlimited = Interpreter(CaptureOutput())
+    reporter = Reporter()
+    statements = parse(LOOP.format(n=100))
+    # Act
+    limited.interpret(reporter, statements)
+    unlimited.interpret(reporter, statements)
+    # Assert
+    assert len(reporter.runtime_errors) == 1
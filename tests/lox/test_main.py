@@ -1,3 +1,5 @@
+from pathlib import Path
+
 import pytest
 
 from lox.main import parse_arguments
@@ -14,3 +16,59 @@ def test_parse_arguments_prompt() -> None:
 def test_parse_arguments_reject() -> None:
     with pytest.raises(SystemExit):
         parse_arguments(["/tmp/script.lox", "/tmp/script.lox"])
+
+
+def test_parse_arguments_unbuffered() -> None:
+    assert parse_arguments(["--unbuffered", "/tmp/script.lox"]).unbuffered
+
+
+def test_parse_arguments_profile() -> None:
+    args = parse_arguments(["--profile", "sampling", "/tmp/script.lox"])
+    assert args.profile == "sampling"
+
+
+def test_parse_arguments_timings() -> None:
+    args = parse_arguments(["--timings", "/tmp/script.lox"])
+    assert (args.timings, args.timings_format, args.path) == (
+        True,
+        "table",
+        Path("/tmp/script.lox"),
+    )
+    args = parse_arguments(["--timings", "--timings-format", "json", "a.lox"])
+    assert (args.timings, args.timings_format) == (True, "json")
+    args = parse_arguments(["--timings=json", "a.lox"])
+    assert (args.timings, args.timings_format, args.path) == (
+        True,
+        "json",
+        Path("a.lox"),
+    )
+    assert not parse_arguments(["/tmp/script.lox"]).timings
+    with pytest.raises(SystemExit):
+        parse_arguments(["--timings-format", "csv", "a.lox"])
+    with pytest.raises(SystemExit):
+        parse_arguments(["--timings=csv", "a.lox"])
+
+
+def test_parse_arguments_image() -> None:
+    args = parse_arguments(["--image", "a.img", "--save-image", "b.img", "c.lox"])
+    assert (args.image, args.save_image, args.path) == (
+        Path("a.img"),
+        Path("b.img"),
+        Path("c.lox"),
+    )
+
+
+def test_parse_arguments_fibers() -> None:
+    assert parse_arguments(["--fibers", "a.lox"]).fibers
+    assert not parse_arguments(["a.lox"]).fibers
+
+
+def test_parse_arguments_heap() -> None:
+    args = parse_arguments(["--heap-report", "--heap-snapshots", "h.jsonl", "a.lox"])
+    assert (args.heap_report, args.heap_snapshots, args.heap_interval) == (
+        True,
+        Path("h.jsonl"),
+        1.0,
+    )
+    with pytest.raises(SystemExit):
+        parse_arguments(["--heap-snapshots", "h.jsonl", "--timings", "a.lox"])
@@ -0,0 +1,60 @@
+from lox.equality import from_key, is_equal, lox_key
+from lox.rope import concat
+from tests.lox.utils import run
+
+
+def test_lox_equality() -> None:
+    assert is_equal(None, None)
+    assert is_equal("a" * 70, concat("a" * 35, "a" * 35))
+    assert not is_equal(True, 1.0)
+    assert not is_equal(None, False)
+    assert not is_equal("1", 1.0)
+
+
+def test_lox_key_round_trip() -> None:
+    for value in (None, True, 1.0, "a"):
+        assert from_key(lox_key(value)) == value
+    assert lox_key(True) != lox_key(1.0)
+
+
+def test_map_word_count() -> None:
+    # Assemble
+    lox = """
+var counts = map();
+fun count(word) {
+  var n = get(counts, word);
+  if (n == nil) n = 0;
+  set(counts, word, n + 1);
+}
+count("a"); count("b"); count("a"); count(true); count(1);
+print get(counts, "a");
+print get(counts, true);
+print get(counts, 1);
+print size(counts);
+print has(counts, "c");
+var k = keys(counts);
+print get(k, 0);
+print get(k, 2);
+"""
+    # Act
+    lines, reporter = run(lox)
+    # Assert
+    assert not reporter.runtime_errors
+    assert lines == ["2", "1", "1", "4", "false", "a", "true"]
+
+
+def test_map_merge() -> None:
+    # Assemble
+    lox = """
+var a = map(); set(a, "x", 1); set(a, "y", 2);
+var b = map(); set(b, "y", 3);
+var c = merge(a, b);
+print get(c, "y");
+print size(c);
+print size(a);
+"""
+    # Act
+    lines, reporter = run(lox)
+    # Assert
+    assert not reporter.runtime_errors
+    assert lines == ["3", "2", "2"]
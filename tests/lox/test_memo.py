@@ -0,0 +1,102 @@
+from lox.ast import Function
+from lox.interpret import Interpreter
+from lox.memo import MemoCache, memo_key
+from lox.output import CaptureOutput
+from lox.purity import pure_functions
+from tests.lox.utils import Reporter, parse
+
+FUNCTIONS = """
+fun fib(n) {
+  if (n < 2) return n;
+  return fib(n - 1) + fib(n - 2);
+}
+fun square(x) { var y = x * x; return y; }
+fun sumSquares(a, b) { return square(a) + square(b); }
+fun loud(x) { print x; return x; }
+fun callsLoud(x) { return loud(x); }
+fun now() { return clock(); }
+var counter = 0;
+fun count() { counter = counter + 1; return counter; }
+fun readsGlobal() { return counter; }
+"""
+
+
+def test_pure_functions() -> None:
+    # Assemble
+    statements = parse(FUNCTIONS)
+    names = {
+        id(statement): statement.name.lexeme
+        for statement in statements
+        if isinstance(statement, Function)
+    }
+    # Act
+    pure = pure_functions(statements)
+    # Assert
+    assert sorted(names[id_] for id_ in pure) == ["fib", "square", "sumSquares"]
+
+
+def test_memo_cache_evicts_least_recently_used() -> None:
+    # Assemble
+    cache = MemoCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    # Act
+    assert cache.get("a") == (True, 1)
+    cache.put("c", 3)
+    # Assert
+    assert cache.get("b") == (False, None)
+    assert cache.get("c") == (True, 3)
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.evictions) == (2, 1, 1)
+
+
+def test_memo_key_distinguishes_booleans_from_numbers() -> None:
+    assert memo_key([True]) != memo_key([1.0])
+    assert memo_key([1.0, "a"]) == memo_key([1.0, "a"])
+
+
+def test_memoized_negative_zero() -> None:
+    # Assemble
+    output = CaptureOutput()
+    interpreter = Interpreter(output, memo_size=100)
+    statements = parse("fun f(x) { return x; } print f(0); print f(-0);")
+    reporter = Reporter()
+    # Act
+    interpreter.interpret(reporter, statements)
+    # Assert
+    assert not reporter.runtime_errors
+    assert output.lines == ["0", "-0"]
+
+
+def test_memoized_fib() -> None:
+    # Assemble
+    statements = parse(FUNCTIONS + "print fib(30); print sumSquares(3, 4);")
+    output = CaptureOutput()
+    interpreter = Interpreter(output, memo_size=100)
+    reporter = Reporter()
+    # Act
+    interpreter.interpret(reporter, statements)
+    # Assert
+    assert not reporter.runtime_errors
+    assert output.lines == ["832040", "25"]
+    caches = dict(interpreter.memo_caches)
+    assert caches["fib"].stats.misses == 31
+    assert caches["fib"].stats.hits == 28
+
+
+def test_redefining_what_a_memoized_function_reads() -> None:
+    # Assemble
+    output = CaptureOutput()
+    interpreter = Interpreter(output, memo_size=100)
+    reporter = Reporter()
+    interpreter.interpret(
+        reporter,
+        parse("fun g(x) { return x + 1; } fun f(x) { return g(x) * 2; } print f(1);"),
+    )
+    # Act
+    interpreter.interpret(
+        reporter, parse('fun g(x) { print "g"; return x; } print f(1); print f(1);')
+    )
+    # Assert
+    assert not reporter.runtime_errors
+    assert output.lines == ["4", "g", "2", "g", "2"]
+    assert not dict(interpreter.memo_caches)["f"].enabled
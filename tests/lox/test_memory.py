@@ -0,0 +1,76 @@
+"""Pins the memory held by runtime objects, see benchmarks/bench_memory.py.
+
+The bounds leave some room above the sizes on CPython 3.12, but fail when a
+class loses its slots or an empty environment allocates its own dict again.
+"""
+
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from lox.ast import Function
+from lox.environment import Environment
+from lox.interpret import Clock, LoxFunction
+from lox.runtime_error import LoxRuntimeErr
+from lox.scanner import Scanner, Token, TokenType
+from tests.lox.utils import Reporter
+
+ROOT = Path(__file__).parent.parent.parent
+TOKEN = Token(TokenType.IDENTIFIER, "name", None, 1)
+
+
+def _bytes_per(make: Callable[[], object], count: int = 1000) -> float:
+    kept: list[object] = [None] * count
+    tracemalloc.start()
+    try:
+        for index in range(count):
+            kept[index] = make()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current / count
+
+
+def test_runtime_objects_are_small() -> None:
+    # Assemble
+    globals_ = Environment()
+    declaration = Function(TOKEN, [], [])
+    # Act
+    sizes = {
+        "token": _bytes_per(lambda: Token(TokenType.IDENTIFIER, "name", None, 1)),
+        "environment": _bytes_per(lambda: Environment(globals_)),
+        "function": _bytes_per(lambda: LoxFunction(declaration)),
+        "clock": _bytes_per(Clock),
+        "error": _bytes_per(lambda: LoxRuntimeErr(TOKEN, "message")),
+    }
+    # Assert
+    assert sizes["token"] < 80
+    assert sizes["environment"] < 72
+    assert sizes["function"] < 64
+    assert sizes["clock"] < 48
+    assert sizes["error"] < 200
+
+
+def test_tokens_of_benchmark_programs() -> None:
+    # Assemble
+    paths = sorted((ROOT / "benchmarks").glob("*.lox"))
+    sources = [path.read_text("utf-8") for path in paths]
+    count = sum(len(Scanner(Reporter(), source).scan_tokens()) for source in sources)
+    # Act
+    size = _bytes_per(
+        lambda: [Scanner(Reporter(), source).scan_tokens() for source in sources], 10
+    )
+    # Assert
+    assert size / count < 120
+
+
+def test_empty_environments_share_their_variables() -> None:
+    # Assemble
+    globals_ = Environment()
+    first, second = Environment(globals_), Environment(globals_)
+    # Act
+    first.define("x", 1.0)
+    # Assert
+    assert first.variables == {"x": 1.0}
+    assert second.variables == {}
+    assert Environment(globals_).variables is second.variables
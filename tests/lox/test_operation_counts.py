@@ -0,0 +1,83 @@
+"""Pins the work the interpreter does per program, see `OperationCounter`.
+
+A change to the counts means the hot path does more or less work. If that is
+intended, regenerate the pinned counts with
+`LOX_UPDATE_COUNTS=1 pytest tests/lox/test_operation_counts.py`.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from lox.counting import OperationCounter
+from lox.interpret import Interpreter
+from lox.output import CaptureOutput
+from lox.parser import Parser
+from lox.scanner import Scanner
+from tests.lox.utils import Reporter
+
+ROOT = Path(__file__).parent.parent.parent
+PINNED = Path(__file__).parent / "operation_counts.json"
+
+# Benchmarks are scaled down to keep the suite fast.
+BENCHMARKS = {
+    "fib.lox": ("fib(22)", "fib(12)"),
+    "binary_trees.lox": ("make(12)", "make(4)"),
+    "nested_loops.lox": ("var n = 300;", "var n = 10;"),
+    "string_building.lox": ("i < 100000", "i < 100"),
+    "array_sum.lox": ("var n = 100000;", "var n = 100;"),
+    "closures.lox": ("var n = 30000;", "var n = 100;"),
+}
+
+
+def _programs() -> dict[str, str]:
+    programs: dict[str, str] = {}
+    for path in sorted((ROOT / "assets").glob("*.lox")):
+        programs[f"assets/{path.name}"] = path.read_text("utf-8")
+    for name, (old, new) in BENCHMARKS.items():
+        source = (ROOT / "benchmarks" / name).read_text("utf-8")
+        assert old in source
+        programs[f"benchmarks/{name}"] = source.replace(old, new)
+    return programs
+
+
+def _count(source: str) -> dict[str, object] | None:
+    reporter = Reporter()
+    tokens = Scanner(reporter, source).scan_tokens()
+    statements = Parser(reporter, tokens).parse()
+    if statements is None or reporter.errors or reporter.parser_errors:
+        return None
+    interpreter = Interpreter(CaptureOutput())
+    counter = OperationCounter(interpreter)
+    interpreter.attach(counter)
+    interpreter.interpret(reporter, statements)
+    return counter.as_dict()
+
+
+PROGRAMS = _programs()
+
+
+@pytest.fixture(scope="module")
+def counts() -> dict[str, dict[str, object] | None]:
+    return {name: _count(source) for name, source in PROGRAMS.items()}
+
+
+@pytest.mark.skipif(
+    not os.environ.get("LOX_UPDATE_COUNTS"), reason="LOX_UPDATE_COUNTS is not set"
+)
+def test_update_operation_counts(counts: dict[str, dict[str, object] | None]) -> None:
+    # Act
+    pinned = {name: count for name, count in counts.items() if count is not None}
+    PINNED.write_text(json.dumps(pinned, indent=2) + "\n", "utf-8")
+
+
+@pytest.mark.parametrize("name", sorted(PROGRAMS))
+def test_operation_counts(
+    counts: dict[str, dict[str, object] | None], name: str
+) -> None:
+    # Assemble
+    pinned: dict[str, dict[str, object]] = json.loads(PINNED.read_text("utf-8"))
+    # Assert
+    assert counts[name] == pinned.get(name)
@@ -0,0 +1,72 @@
+from lox.ast import Block, Var
+from lox.optimize import optimize
+from tests.lox.utils import parse, run
+
+NESTED_LOOPS = """
+var n = 4;
+var scale = 3;
+var total = 0;
+for (var i = 0; i < n; i = i + 1) {
+  for (var j = 0; j < n * scale - 1; j = j + 1) {
+    total = total + (scale * scale + n / 2) * i;
+  }
+}
+print total;
+"""
+
+
+def _temporaries(statements: object) -> list[str]:
+    names: list[str] = []
+    if isinstance(statements, list):
+        for statement in statements:
+            names.extend(_temporaries(statement))
+    if isinstance(statements, Block):
+        names.extend(_temporaries(list(statements.statements)))
+    if isinstance(statements, Var) and statements.name.lexeme.startswith("$"):
+        names.append(statements.name.lexeme)
+    return names
+
+
+def test_hoist_preserves_output() -> None:
+    # Act
+    optimized, optimized_reporter = run(NESTED_LOOPS, opt_level=1)
+    plain, plain_reporter = run(NESTED_LOOPS, opt_level=0)
+    # Assert
+    assert optimized == plain == ["726"]
+    assert not optimized_reporter.runtime_errors
+    assert not plain_reporter.runtime_errors
+
+
+def test_hoist_invariant_expressions() -> None:
+    # Act
+    statements = optimize(parse(NESTED_LOOPS), 1)
+    # Assert
+    assert _temporaries(list(statements)) == ["$licm0", "$licm1"]
+
+
+def test_no_hoist_of_assigned_variables() -> None:
+    # Assemble
+    lox = "var a = 1; while (a < 10) { print a * 2; a = a + 1; }"
+    # Act
+    statements = optimize(parse(lox), 1)
+    # Assert
+    assert _temporaries(list(statements)) == []
+
+
+def test_no_hoist_across_calls() -> None:
+    # Assemble
+    lox = "var a = 1; var i = 0; while (i < 3) { print a * 2; i = i + clock(); }"
+    # Act
+    statements = optimize(parse(lox), 1)
+    # Assert
+    assert _temporaries(list(statements)) == []
+
+
+def test_hoisted_expression_is_evaluated_lazily() -> None:
+    # Assemble
+    lox = 'var s = "a"; var i = 0; while (i < 0) { i = i + -s; } print i;'
+    # Act
+    lines, reporter = run(lox, opt_level=1)
+    # Assert
+    assert lines == ["0"]
+    assert not reporter.runtime_errors
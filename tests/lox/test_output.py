@@ -0,0 +1,97 @@
+import io
+import time
+from typing import override
+
+from lox.ffi import lox_native
+from lox.interpret import Interpreter
+from lox.output import BufferedOutput, CaptureOutput
+from lox.parser import Parser
+from lox.scanner import Scanner
+from tests.lox.utils import Reporter, parse
+
+
+def test_capture_print_statements() -> None:
+    # Assemble
+    lox = 'print 1; print "two"; print nil;'
+    reporter = Reporter()
+    tokens = Scanner(reporter, lox).scan_tokens()
+    statements = Parser(reporter, tokens).parse()
+    assert statements is not None
+    output = CaptureOutput()
+    # Act
+    Interpreter(output).interpret(reporter, statements)
+    # Assert
+    assert output.lines == ["1", "two", "nil"]
+
+
+def test_buffered_output_holds_writes_until_flush() -> None:
+    # Assemble
+    stream = io.StringIO()
+    output = BufferedOutput(stream, max_chars=1 << 10, max_delay=3600)
+    # Act
+    output.write("a\n")
+    output.write("b\n")
+    # Assert
+    assert stream.getvalue() == ""
+    output.flush()
+    assert stream.getvalue() == "a\nb\n"
+
+
+def test_buffered_output_flushes_when_full() -> None:
+    # Assemble
+    stream = io.StringIO()
+    output = BufferedOutput(stream, max_chars=4, max_delay=3600)
+    # Act
+    output.write("ab\n")
+    output.write("cd\n")
+    # Assert
+    assert stream.getvalue() == "ab\ncd\n"
+
+
+def test_flush_before_runtime_error() -> None:
+    # Assemble
+    lox = 'print 1; print -"a";'
+    reporter = Reporter()
+    tokens = Scanner(reporter, lox).scan_tokens()
+    statements = Parser(reporter, tokens).parse()
+    assert statements is not None
+    stream = io.StringIO()
+    # Act
+    Interpreter(BufferedOutput(stream, max_delay=3600)).interpret(reporter, statements)
+    # Assert
+    assert stream.getvalue() == "1\n"
+    assert len(reporter.runtime_errors) == 1
+
+
+def test_buffered_output_flushes_during_long_computations() -> None:
+    # Assemble
+    events: list[str] = []
+
+    class Stream(io.StringIO):
+        @override
+        def write(self, text: str) -> int:
+            events.append(text)
+            return len(text)
+
+    @lox_native(arity=0)
+    def nap() -> None:
+        time.sleep(0.05)
+
+    @lox_native(arity=0)
+    def mark() -> None:
+        events.append("mark")
+
+    source = """
+    print "a";
+    nap();
+    for (var i = 0; i < 2000; i = i + 1) {}
+    mark();
+    print "b";
+    """
+    interpreter = Interpreter(BufferedOutput(Stream(), max_delay=0.01))
+    interpreter.define("nap", nap)
+    interpreter.define("mark", mark)
+    # Act
+    interpreter.interpret(Reporter(), parse(source))
+    # Assert
+    assert events == ["a\n", "mark", "b\n"]
@@ -171,3 +171,16 @@ def test_parse_comma_expr() -> None:
             right=Literal(value=3.0),
         ),
     )
+
+
+def test_parse_return_at_top_level() -> None:
+    # Assemble
+    lox = "return 1;"
+    reporter = Reporter()
+    tokens = Scanner(reporter, lox).scan_tokens()
+    # Act
+    Parser(reporter, tokens).parse()
+    # Assert
+    assert [message for _, message in reporter.parser_errors] == [
+        "Can't return from top-level code."
+    ]
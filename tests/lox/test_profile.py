@@ -0,0 +1,84 @@
+import io
+
+from lox.interpret import Interpreter
+from lox.output import CaptureOutput
+from lox.profile import ROOT, DeterministicProfiler, SamplingProfiler
+from tests.lox.utils import Reporter, parse
+
+SOURCE = """fun square(x) {
+  return x * x;
+}
+fun sum(n) {
+  var total = 0;
+  var i = 0;
+  while (i < n) {
+    total = total + square(i);
+    i = i + 1;
+  }
+  return total;
+}
+print sum(20);
+"""
+
+
+def _profile(profiler: DeterministicProfiler | SamplingProfiler, source: str) -> None:
+    statements = parse(source)
+    with profiler:
+        Interpreter(CaptureOutput()).interpret(Reporter(), statements)
+
+
+def test_deterministic_profile() -> None:
+    # Assemble
+    profiler = DeterministicProfiler()
+    # Act
+    _profile(profiler, SOURCE)
+    # Assert
+    profile = profiler.profile
+    assert profile.functions["square:1"].calls == 20
+    assert profile.functions["sum:4"].calls == 1
+    assert profile.functions[ROOT].total_ns == profile.total_ns
+    assert profile.functions["sum:4"].total_ns >= profile.functions["square:1"].self_ns
+    assert set(profile.stacks) == {
+        (ROOT,),
+        (ROOT, "sum:4"),
+        (ROOT, "sum:4", "square:1"),
+    }
+    assert {2, 8, 9} <= profile.lines.keys()
+
+
+def test_deterministic_profile_recursion() -> None:
+    # Assemble
+    profiler = DeterministicProfiler()
+    # Act
+    _profile(profiler, "fun f(n) { if (n > 0) f(n - 1); }\nf(10);")
+    # Assert
+    stats = profiler.profile.functions["f:1"]
+    assert stats.calls == 11
+    assert stats.total_ns <= profiler.profile.total_ns
+
+
+def test_collapsed_stacks() -> None:
+    # Assemble
+    profiler = DeterministicProfiler()
+    _profile(profiler, SOURCE)
+    file = io.StringIO()
+    # Act
+    profiler.profile.write_collapsed(file)
+    # Assert
+    for line in file.getvalue().splitlines():
+        stack, weight = line.rsplit(" ", 1)
+        assert stack.startswith(ROOT)
+        assert int(weight) > 0
+
+
+def test_sampling_profile() -> None:
+    # Assemble
+    profiler = SamplingProfiler(interval=0.001)
+    # Act
+    _profile(profiler, SOURCE.replace("sum(20)", "sum(20000)"))
+    # Assert
+    profile = profiler.profile
+    assert profile.total_ns > 0
+    assert all(stack[0] == ROOT for stack in profile.stacks)
+    assert profile.functions["sum:4"].total_ns > 0
+    assert profile.functions["sum:4"].calls == 0
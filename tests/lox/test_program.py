@@ -0,0 +1,94 @@
+import pytest
+
+import lox
+from lox.limits import Limits
+from lox.output import CaptureOutput
+
+
+def test_program_runs_many_times() -> None:
+    # Assemble
+    program = lox.compile("print greeting + name;")
+    output = CaptureOutput()
+    # Act
+    for name in ("Ada", "Bob"):
+        program.run({"greeting": "hi ", "name": name}, output)
+    # Assert
+    assert list(output.lines) == ["hi Ada", "hi Bob"]
+
+
+def test_program_writes_back_globals() -> None:
+    # Assemble
+    program = lox.compile('var allowed = age >= 18; var label = "age " + "ok";')
+    variables: dict[str, object] = {"age": 21}
+    # Act
+    program.run(variables)
+    # Assert
+    assert variables == {"age": 21.0, "allowed": True, "label": "age ok"}
+
+
+def test_optimized_program_writes_back_only_its_globals() -> None:
+    # Assemble
+    source = (
+        "var k = 4; var t = 0; var i = 0; while (i < 3) { t = t + k * 2; i = i + 1; }"
+    )
+    program = lox.compile(source, opt_level=1)
+    variables: dict[str, object] = {}
+    # Act
+    program.run(variables)
+    # Assert
+    assert variables == {"k": 4.0, "t": 24.0, "i": 3.0}
+
+
+def test_program_keeps_host_ints() -> None:
+    # Assemble
+    program = lox.compile("count = count + 1; half = half / 2;")
+    variables: dict[str, object] = {"n": 3, "count": 1, "half": 3, "flag": True}
+    # Act
+    program.run(variables)
+    # Assert
+    assert variables == {"n": 3, "count": 2, "half": 1.5, "flag": True}
+    assert [type(value) for value in variables.values()] == [int, int, float, bool]
+
+
+def test_program_shared_globals() -> None:
+    # Assemble
+    define = lox.compile("var count = 0; fun bump() { count = count + 1; }")
+    use = lox.compile("bump(); bump();")
+    variables: dict[str, object] = {}
+    # Act
+    define.run(variables)
+    use.run(variables)
+    use.run(variables)
+    # Assert
+    assert variables["count"] == 4.0
+
+
+def test_compile_error() -> None:
+    # Act
+    with pytest.raises(lox.CompileError) as info:
+        lox.compile("print 1 @;\nprint (1;")
+    # Assert
+    assert [str(diagnostic) for diagnostic in info.value.diagnostics] == [
+        "[line 1] Error: Unexpected character.",
+        "[line 2] Error at ';': Expect ')' after expression.",
+    ]
+
+
+def test_run_error() -> None:
+    # Assemble
+    program = lox.compile("\nprint 1 + nil;")
+    # Act
+    with pytest.raises(lox.RunError) as info:
+        program.run(output=CaptureOutput())
+    # Assert
+    assert info.value.diagnostics == [
+        lox.Diagnostic(2, "Operands must be be two numbers or two strings.")
+    ]
+
+
+def test_run_limits() -> None:
+    # Assemble
+    program = lox.compile("while (true) {}")
+    # Act
+    with pytest.raises(lox.RunError, match="fuel"):
+        program.run(limits=Limits(fuel=100))
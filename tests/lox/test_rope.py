@@ -0,0 +1,51 @@
+from lox.interpret import Interpreter
+from lox.parser import Parser
+from lox.render import render
+from lox.rope import Rope, concat
+from lox.scanner import Scanner
+from tests.lox.utils import Reporter
+
+
+def test_concat_short_strings_stay_str() -> None:
+    assert concat("a", "b") == "ab"
+    assert isinstance(concat("a", "b"), str)
+
+
+def test_concat_appends_to_shared_buffer() -> None:
+    # Assemble
+    line = "x" * 100
+    value = concat("", line)
+    # Act
+    for _ in range(9):
+        value = concat(value, line)
+    # Assert
+    assert isinstance(value, Rope)
+    assert len(value) == 1000
+    assert value == line * 10
+    assert render(value) == line * 10
+
+
+def test_concat_keeps_earlier_ropes_unchanged() -> None:
+    # Assemble
+    base = concat("a" * 64, "b")
+    # Act
+    first = concat(base, "c")
+    second = concat(base, "d")
+    # Assert
+    assert base == "a" * 64 + "b"
+    assert first == "a" * 64 + "bc"
+    assert second == "a" * 64 + "bd"
+    assert hash(second) == hash("a" * 64 + "bd")
+
+
+def test_interpret_rope_plus_string() -> None:
+    # Assemble
+    lox = '"' + "a" * 70 + '" + "b" + "c"'
+    reporter = Reporter()
+    tokens = Scanner(reporter, lox).scan_tokens()
+    expr = Parser(reporter, tokens).expression()
+    # Act
+    value = expr.accept(Interpreter())
+    # Assert
+    assert not reporter.parser_errors
+    assert render(value) == "a" * 70 + "bc"
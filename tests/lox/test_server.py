@@ -0,0 +1,106 @@
+import io
+import os
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import override
+
+import pytest
+
+from lox.client import request
+
+SOURCE = Path(__file__).parent.parent.parent / "src"
+
+
+@contextmanager
+def _server(tmp_path: Path) -> Iterator[Path]:
+    path = tmp_path / "lox.sock"
+    process = subprocess.Popen(
+        [sys.executable, "-m", "lox.main", "serve", "--socket", str(path)]
+        + ["--workers", "2"],
+        env={"PYTHONPATH": str(SOURCE)},
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    try:
+        yield path
+    finally:
+        process.terminate()
+        process.wait(10)
+
+
+def _request(socket: Path, script: Path) -> tuple[int, str, str]:
+    stdout, stderr = io.StringIO(), io.StringIO()
+    code = request(socket, script, stdout, stderr)
+    return code, stdout.getvalue(), stderr.getvalue()
+
+
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        ('print "hi";', (0, "hi\n", "")),
+        ("print 1 +;", (65, "", "[line 1] Error at ';': Expected expression.\n")),
+        (
+            "print 1;\nprint nil - 1;",
+            (70, "1\n", "[line 2] Error: Operands must be numbers.\n"),
+        ),
+        (
+            "fun f(n) { return f(n + 1); }\nprint 1;\nf(0);",
+            (70, "1\n", "Error: RecursionError: maximum recursion depth exceeded\n"),
+        ),
+    ],
+)
+def test_server_runs(
+    tmp_path: Path, source: str, expected: tuple[int, str, str]
+) -> None:
+    # Assemble
+    script = tmp_path / "script.lox"
+    script.write_text(source)
+    # Act
+    with _server(tmp_path) as server:
+        result = _request(server, script)
+    # Assert
+    assert result == expected
+
+
+def test_server_recompiles_changed_scripts(tmp_path: Path) -> None:
+    # Assemble
+    script = tmp_path / "script.lox"
+    script.write_text("print 1;")
+    with _server(tmp_path) as server:
+        _request(server, script)
+        script.write_text("print 2;")
+        os.utime(script, ns=(0, script.stat().st_mtime_ns + 1))
+        # Act
+        result = _request(server, script)
+    # Assert
+    assert result == (0, "2\n", "")
+
+
+def test_server_streams_output(tmp_path: Path) -> None:
+    # Assemble
+    script = tmp_path / "script.lox"
+    script.write_text(
+        'print "a";\nfor (var i = 0; i < 300000; i = i + 1) {}\nprint "b";'
+    )
+    writes: list[tuple[float, str]] = []
+
+    class Stream(io.StringIO):
+        @override
+        def write(self, text: str) -> int:
+            writes.append((time.monotonic(), text))
+            return len(text)
+
+    with _server(tmp_path) as server:
+        # Act
+        code = request(server, script, Stream(), io.StringIO())
+        end = time.monotonic()
+    # Assert
+    assert code == 0
+    assert [text for _, text in writes] == ["a\n", "b\n"]
+    assert end - writes[0][0] > 0.1
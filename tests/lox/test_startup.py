@@ -0,0 +1,42 @@
+import subprocess
+import sys
+from pathlib import Path
+
+SOURCE = Path(__file__).parent.parent.parent / "src"
+
+# Modules that only optional features need, see benchmarks/bench_startup.py.
+LAZY = [
+    "pydantic",
+    "importlib.metadata",
+    "tracemalloc",
+    "lox.batch",
+    "lox.client",
+    "lox.closure",
+    "lox.fiber",
+    "lox.heap",
+    "lox.image",
+    "lox.profile",
+    "lox.purity",
+    "lox.server",
+    "lox.timings",
+    "lox.trace",
+]
+
+
+def test_startup_imports() -> None:
+    # Act
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from lox.main import Lox; Lox()._run('print 1;'); "
+            "print(' '.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": str(SOURCE)},
+    )
+    # Assert
+    modules = result.stdout.split()
+    assert [module for module in LAZY if module in modules] == []
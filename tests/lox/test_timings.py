@@ -0,0 +1,44 @@
+import json
+import tracemalloc
+
+from lox.main import Lox
+from lox.output import CaptureOutput
+
+
+def test_timings() -> None:
+    # Assemble
+    lox = Lox(CaptureOutput(), timings=True)
+    # Act
+    lox._run("fun f(x) { return x; }\n{ print f(1) + f(2); }")
+    # Assert
+    timings = lox.timings
+    assert timings is not None
+    assert list(timings.phases) == ["scan", "parse", "optimize", "interpret"]
+    assert all(phase.wall_ns > 0 for phase in timings.phases.values())
+    assert timings.tokens == 24
+    assert timings.nodes == {
+        "Function": 1,
+        "Return": 1,
+        "Variable": 3,
+        "Block": 1,
+        "Print": 1,
+        "Binary": 1,
+        "Call": 2,
+        "Literal": 2,
+    }
+    assert timings.counters.statements == 5
+    assert timings.counters.calls == 2
+    assert timings.counters.environments == 2
+    assert not tracemalloc.is_tracing()
+
+
+def test_timings_json() -> None:
+    # Assemble
+    lox = Lox(CaptureOutput(), timings=True)
+    lox._run("print 1;")
+    assert lox.timings is not None
+    # Act
+    data: dict[str, object] = json.loads(lox.timings.to_json())
+    # Assert
+    assert data["tokens"] == 4
+    assert data["nodes"] == {"Print": 1, "Literal": 1}
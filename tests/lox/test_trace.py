@@ -0,0 +1,77 @@
+from typing import override
+
+from lox.ast import Call, Stmt, Variable
+from lox.environment import Environment
+from lox.interpret import Interpreter
+from lox.output import CaptureOutput
+from lox.runtime_error import LoxRuntimeErr
+from lox.trace import Tracer
+from tests.lox.utils import Reporter, parse
+
+
+class _Recorder(Tracer):
+    def __init__(self) -> None:
+        self.events: list[str] = []
+
+    @override
+    def statement(self, stmt: Stmt) -> None:
+        self.events.append(type(stmt).__name__)
+
+    @override
+    def call(self, expr: Call) -> None:
+        assert isinstance(expr.callee, Variable)
+        self.events.append(f"call {expr.callee.name.lexeme}")
+
+    @override
+    def return_(self, expr: Call, value: object) -> None:
+        self.events.append(f"return {value}")
+
+    @override
+    def environment(self, environment: Environment) -> None:
+        self.events.append("environment")
+
+    @override
+    def error(self, err: LoxRuntimeErr) -> None:
+        self.events.append(f"error {err.message}")
+
+
+def test_trace_events() -> None:
+    # Assemble
+    interpreter = Interpreter(CaptureOutput())
+    recorder = _Recorder()
+    interpreter.attach(recorder)
+    # Act
+    interpreter.interpret(Reporter(), parse("fun f(x) { return x; }\nprint f(1);"))
+    # Assert
+    assert recorder.events == [
+        "Function",
+        "Print",
+        "call f",
+        "environment",
+        "Return",
+        "return 1.0",
+    ]
+
+
+def test_trace_error() -> None:
+    # Assemble
+    interpreter = Interpreter(CaptureOutput())
+    recorder = _Recorder()
+    interpreter.attach(recorder)
+    # Act
+    interpreter.interpret(Reporter(), parse("print -nil;"))
+    # Assert
+    assert recorder.events == ["Print", "error Operands must be numbers."]
+
+
+def test_detach() -> None:
+    # Assemble
+    interpreter = Interpreter(CaptureOutput())
+    recorder = _Recorder()
+    interpreter.attach(recorder)
+    # Act
+    interpreter.detach()
+    interpreter.interpret(Reporter(), parse("{ print 1; }"))
+    # Assert
+    assert recorder.events == []
+    assert "visit_print_stmt" not in vars(interpreter)  # type: ignore[misc]
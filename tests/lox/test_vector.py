@@ -0,0 +1,100 @@
+from array import array
+from collections.abc import Sequence
+
+import pytest
+
+import lox
+from lox.interpret import Interpreter
+from lox.output import CaptureOutput
+from lox.program import parse_expression
+
+COLUMNS: dict[str, list[object]] = {
+    "price": [10.0, 20.0, 30.0, 0.5],
+    "qty": [5, 10, 1, 3],
+    "region": ["eu", "eu", "us", "eu"],
+    "maybe": [None, 2.0, "two", True],
+}
+
+
+def _per_row(source: str) -> list[object]:
+    expr = parse_expression(source)
+    interpreter = Interpreter(CaptureOutput())
+    values: list[object] = []
+    for row in range(4):
+        for name, column in COLUMNS.items():
+            value = column[row]
+            interpreter.define(name, float(value) if type(value) is int else value)
+        values.append(expr.accept(interpreter))
+    return values
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        'price * qty > 100 and region == "eu"',
+        "-price / qty",
+        'region + "!"',
+        "maybe == 2 or !maybe",
+        "maybe and price",
+        "price > 15 or region",
+        "(price, region) == region",
+        "clock() > 0 and qty",
+    ],
+)
+def test_vector_matches_interpreter(source: str) -> None:
+    # Act
+    values = lox.compile_expression(source).evaluate(COLUMNS)
+    # Assert
+    assert list(values) == _per_row(source)
+
+
+def test_vector_numbers_are_arrays() -> None:
+    # Act
+    values = lox.compile_expression("price * 2").evaluate({"price": array("d", [1, 2])})
+    # Assert
+    assert values == array("d", [2, 4])
+
+
+def test_vector_numpy_columns() -> None:
+    # Assemble
+    np = pytest.importorskip("numpy")  # type: ignore[misc]
+    columns: dict[str, Sequence[object]] = {
+        "price": np.array([1.5, 2.0, 3.0]),  # type: ignore[misc]
+        "qty": np.array([2, 3, 4], dtype=np.int64),  # type: ignore[misc]
+        "count": np.array([1, 2, 3], dtype=np.uint8),  # type: ignore[misc]
+        "flag": np.array([True, False, True]),  # type: ignore[misc]
+    }
+    expression = lox.compile_expression("flag and price * qty + count > 5")
+    # Act
+    values = expression.evaluate(columns)
+    # Assert
+    assert values == [False, False, True]
+
+
+def test_vector_numpy_booleans_are_lox_booleans() -> None:
+    # Assemble
+    np = pytest.importorskip("numpy")  # type: ignore[misc]
+    flags: Sequence[object] = np.array([False, True])  # type: ignore[misc]
+    # Act
+    values = lox.compile_expression("!flag or 1 + qty").evaluate(
+        {"flag": flags, "qty": np.array([1, 2])}  # type: ignore[misc]
+    )
+    # Assert
+    assert list(values) == [True, 3.0]
+
+
+def test_vector_short_circuit() -> None:
+    # Act
+    values = lox.compile_expression("maybe != nil and maybe > 1").evaluate(
+        {"maybe": [None, 2, None]}
+    )
+    # Assert
+    assert values == [False, True, False]
+
+
+def test_vector_error_row() -> None:
+    # Act
+    with pytest.raises(lox.RunError) as info:
+        lox.compile_expression("price > 1").evaluate({"price": [1, "a", None]})
+    # Assert
+    assert str(info.value) == "[line 1] Error in row 1: Operands must be numbers."
@@ -1,7 +1,14 @@
 from collections.abc import Sequence
 
+from lox.ast import Expr, Stmt
+from lox.ffi import NativeFunction
+from lox.interpret import Interpreter
+from lox.limits import Limits
+from lox.optimize import optimize
+from lox.output import CaptureOutput
+from lox.parser import Parser
 from lox.runtime_error import LoxRuntimeErr
-from lox.scanner import Token
+from lox.scanner import Scanner, Token
 
 
 class Reporter:
@@ -30,3 +37,42 @@ class Reporter:
     @property
     def runtime_errors(self) -> Sequence[LoxRuntimeErr]:
         return self._runtime_errors
+
+
+def parse(source: str) -> Sequence[Expr | Stmt]:
+    reporter = Reporter()
+    tokens = Scanner(reporter, source).scan_tokens()
+    statements = Parser(reporter, tokens).parse()
+    assert not reporter.errors
+    assert not reporter.parser_errors
+    assert statements is not None
+    return statements
+
+
+def interpret(
+    interpreter: Interpreter, source: str, *, opt_level: int = 0, fibers: bool = False
+) -> Reporter:
+    reporter = Reporter()
+    statements = optimize(parse(source), opt_level)
+    if fibers:
+        interpreter.interpret_fibers(reporter, statements)
+    else:
+        interpreter.interpret(reporter, statements)
+    return reporter
+
+
+def run(
+    source: str,
+    *,
+    limits: Limits | None = None,
+    opt_level: int = 0,
+    natives: Sequence[NativeFunction] = (),
+    fibers: bool = False,
+) -> tuple[list[str], Reporter]:
+    """Runs `source` in a new interpreter, returning the lines it printed."""
+    output = CaptureOutput()
+    interpreter = Interpreter(output, limits=limits)
+    for native in natives:
+        interpreter.define(native.name, native)
+    reporter = interpret(interpreter, source, opt_level=opt_level, fibers=fibers)
+    return list(output.lines), reporter
@@ -0,0 +1,16 @@
+from tests.lox.utils import parse
+from tool.generate_lox import generate
+
+
+def test_generate_parses() -> None:
+    for seed in range(10):
+        # Act
+        source = generate(10_000, seed)
+        # Assert
+        assert len(source) >= 10_000
+        assert parse(source)
+
+
+def test_generate_is_seeded() -> None:
+    assert generate(5_000, 1) == generate(5_000, 1)
+    assert generate(5_000, 1) != generate(5_000, 2)